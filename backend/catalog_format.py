@@ -0,0 +1,255 @@
+"""
+İkili Sütunsal Katalog Formatı - np.memmap ile paylaşımlı, ayrıştırmasız yükleme
+
+Dosya düzeni:
+    [0:8]    sihirli bayt dizisi (MAGIC)
+    [8:16]   başlık uzunluğu (uint64, little-endian)
+    [16:...] JSON başlık: satır sayısı, her bölümün (offset, dtype, shape) bilgisi ve ek metadata
+    64 bayta hizalı veri bölümleri:
+        - float32 özellik sütunları
+        - title / artist / emotion kod sütunları (sözlük kodlu)
+        - her sözlük için UTF-8 blob ve offset tablosu
+        - duygu koduna göre sıralı satır indeksleri ve grup sınırları
+        - duygu başına özellik istatistikleri (catalog_stats; ayarları metadata'da)
+"""
+
+import os
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from catalog_store import FEATURE_COLUMNS, FEATURE_DTYPE, CODE_DTYPES
+from catalog_stats import CatalogStats
+
+MAGIC = b'MECAT01\n'
+ALIGNMENT = 64
+BINARY_SUFFIX = '.bin'
+
+
+def binary_path_for(csv_path):
+    """CSV kataloğunun ikili karşılığının yolu"""
+    return str(Path(csv_path).with_suffix(BINARY_SUFFIX))
+
+
+def resolve_catalog_path(csv_path):
+    """Güncel ikili katalog varsa onu, yoksa CSV yolunu döndür"""
+    binary = binary_path_for(csv_path)
+    if os.path.exists(binary) and (
+        not os.path.exists(csv_path) or os.path.getmtime(binary) >= os.path.getmtime(csv_path)
+    ):
+        return binary
+    return csv_path
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class StringDictionary:
+    """UTF-8 blob + offset tablosu üzerinde tembel çözülen sözlük"""
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+        self._cache = {}
+
+    def __getitem__(self, code):
+        code = int(code)
+        value = self._cache.get(code)
+        if value is None:
+            start, end = self.offsets[code], self.offsets[code + 1]
+            value = self.blob[start:end].tobytes().decode('utf-8')
+            self._cache[code] = value
+        return value
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def to_array(self):
+        """Tüm sözlüğü Python dizesi dizisine çöz"""
+        return np.array([self[i] for i in range(len(self))], dtype=object)
+
+
+class CatalogWriter:
+    """Parça parça (streaming) ikili katalog yazıcı; bellek kullanımı parça boyutuyla sınırlı"""
+
+    def __init__(self, path, metadata=None):
+        self.path = str(path)
+        self.metadata = dict(metadata or {})
+        self.n_rows = 0
+        self.dictionaries = {name: {} for name in CODE_DTYPES}
+        self.stats = CatalogStats(FEATURE_COLUMNS)
+        self._tmpdir = tempfile.mkdtemp(prefix='catalog-', dir=os.path.dirname(os.path.abspath(self.path)))
+        self._columns = {}
+        for col in FEATURE_COLUMNS:
+            self._columns[col] = (FEATURE_DTYPE, open(os.path.join(self._tmpdir, col), 'wb'))
+        for name, dtype in CODE_DTYPES.items():
+            self._columns[f'{name}_codes'] = (dtype, open(os.path.join(self._tmpdir, name), 'wb'))
+
+    def _encode(self, name, values):
+        """Dizeleri sözlük kodlarına dönüştür (yeni değerler sözlüğe eklenir)"""
+        mapping = self.dictionaries[name]
+        uniques, inverse = np.unique(np.asarray(values, dtype=object).astype(str), return_inverse=True)
+        codes = np.empty(len(uniques), dtype=np.int64)
+        for i, value in enumerate(uniques):
+            codes[i] = mapping.setdefault(value, len(mapping))
+        if len(mapping) > np.iinfo(CODE_DTYPES[name]).max:
+            raise ValueError(f"'{name}' sözlüğü kod tipine sığmıyor")
+        return codes[inverse]
+
+    def append(self, chunk):
+        """DataFrame veya sütun sözlüğü parçasını ekle"""
+        n = len(chunk['title'])
+        features = {}
+        for col in FEATURE_COLUMNS:
+            dtype, handle = self._columns[col]
+            features[col] = np.asarray(chunk[col], dtype=dtype)
+            handle.write(features[col].tobytes())
+        encoded = {}
+        for name, dtype in CODE_DTYPES.items():
+            encoded[name] = self._encode(name, chunk[name])
+            handle = self._columns[f'{name}_codes'][1]
+            handle.write(encoded[name].astype(dtype).tobytes())
+        # İstatistikler dosyadaki (float32) değerlerden hesaplanır
+        self.stats.add(encoded['emotion'], list(self.dictionaries['emotion']), features)
+        self.n_rows += n
+
+    def close(self):
+        """Geçici sütunları tek dosyada birleştir"""
+        for _, handle in self._columns.values():
+            handle.close()
+        try:
+            self._assemble()
+        finally:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+
+    def _assemble(self):
+        sections = {}
+        payloads = []
+        offset = 0
+
+        def add(name, dtype, shape, source):
+            nonlocal offset
+            offset = _align(offset)
+            sections[name] = {'offset': offset, 'dtype': np.dtype(dtype).str, 'shape': list(shape)}
+            payloads.append((offset, source))
+            offset += int(np.prod(shape)) * np.dtype(dtype).itemsize
+
+        for col, (dtype, _) in self._columns.items():
+            add(col, dtype, (self.n_rows,), os.path.join(self._tmpdir, col.replace('_codes', '')))
+
+        for name, mapping in self.dictionaries.items():
+            encoded = [value.encode('utf-8') for value in mapping]
+            offsets = np.zeros(len(encoded) + 1, dtype='<u8')
+            np.cumsum([len(b) for b in encoded], out=offsets[1:])
+            add(f'{name}_offsets', offsets.dtype, offsets.shape, offsets)
+            add(f'{name}_blob', np.uint8, (int(offsets[-1]),), b''.join(encoded))
+
+        # Duygu indeksi: duygu koduna göre sıralı satırlar + grup sınırları
+        emotion_codes = np.fromfile(os.path.join(self._tmpdir, 'emotion'), dtype=CODE_DTYPES['emotion'])
+        order = np.argsort(emotion_codes, kind='stable').astype('<u8')
+        bounds = np.searchsorted(emotion_codes[order], np.arange(len(self.dictionaries['emotion']) + 1)).astype('<u8')
+        add('emotion_order', order.dtype, order.shape, order)
+        add('emotion_bounds', bounds.dtype, bounds.shape, bounds)
+
+        # Duygu başına istatistikler: diziler bölüm olarak, ayarlar metadata'da
+        stats_meta, stats_arrays = self.stats.to_state()
+        for name, array in stats_arrays.items():
+            add(f'stats_{name}', array.dtype, array.shape, array)
+        metadata = {**self.metadata, 'stats': stats_meta}
+        header = json.dumps({'n_rows': self.n_rows, 'sections': sections, 'metadata': metadata}).encode('utf-8')
+        data_start = _align(16 + len(header))
+
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as out:
+            out.write(MAGIC)
+            out.write(np.uint64(len(header)).tobytes())
+            out.write(header)
+            for rel_offset, source in payloads:
+                out.seek(data_start + rel_offset)
+                if isinstance(source, str):
+                    with open(source, 'rb') as f:
+                        shutil.copyfileobj(f, out, 1 << 24)
+                elif isinstance(source, bytes):
+                    out.write(source)
+                else:
+                    out.write(source.tobytes())
+            out.truncate(data_start + _align(offset))
+        os.replace(tmp_path, self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            for _, handle in self._columns.values():
+                handle.close()
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+
+
+def write_catalog(df, path, chunk_size=1_000_000, metadata=None):
+    """DataFrame'i ikili katalog dosyasına yaz"""
+    with CatalogWriter(path, metadata) as writer:
+        for start in range(0, len(df), chunk_size):
+            writer.append(df.iloc[start:start + chunk_size])
+    return path
+
+
+class MappedCatalog:
+    """İkili katalog dosyasının bellek eşlemeli (np.memmap) görünümü"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._mm = np.memmap(self.path, dtype=np.uint8, mode='r')
+        if self._mm[:8].tobytes() != MAGIC:
+            raise ValueError(f"Geçersiz katalog dosyası: {self.path}")
+        header_len = int(self._mm[8:16].view('<u8')[0])
+        header = json.loads(self._mm[16:16 + header_len].tobytes())
+        self._data_start = _align(16 + header_len)
+        self._sections = header['sections']
+        self.n_rows = header['n_rows']
+        self.metadata = header.get('metadata', {})
+
+        self.features = {col: self.section(col) for col in FEATURE_COLUMNS}
+        self.codes = {name: self.section(f'{name}_codes') for name in CODE_DTYPES}
+        self.dictionaries = {
+            name: StringDictionary(self.section(f'{name}_blob'), self.section(f'{name}_offsets'))
+            for name in CODE_DTYPES
+        }
+        self.emotion_order = self.section('emotion_order')
+        self.emotion_bounds = self.section('emotion_bounds')
+
+    def section(self, name):
+        """Bölümü kopyalamadan NumPy dizisi olarak döndür"""
+        info = self._sections[name]
+        dtype = np.dtype(info['dtype'])
+        start = self._data_start + info['offset']
+        nbytes = int(np.prod(info['shape'])) * dtype.itemsize
+        return self._mm[start:start + nbytes].view(dtype).reshape(info['shape'])
+
+    def stats_state(self):
+        """Yazıcının kaydettiği istatistik durumu (metadata, diziler); eski dosyalarda None"""
+        meta = self.metadata.get('stats')
+        names = ('count', 'mean', 'm2', 'min', 'max', 'hist')
+        if meta is None or any(f'stats_{name}' not in self._sections for name in names):
+            return None
+        return meta, {name: self.section(f'stats_{name}') for name in names}
+
+    def to_dataframe(self):
+        """Eğitim gibi pandas gerektiren yollar için DataFrame'e dönüştür"""
+        import pandas as pd
+
+        data = {}
+        for name in ['title', 'artist', 'emotion']:
+            data[name] = self.dictionaries[name].to_array()[self.codes[name]]
+        for col in FEATURE_COLUMNS:
+            data[col] = np.asarray(self.features[col])
+        return pd.DataFrame(data)
+
+    def __len__(self):
+        return self.n_rows
@@ -0,0 +1,156 @@
+"""
+Katalog Günlüğü - Artımlı şarkı ekleme/güncellemeleri için yalnızca-ekleme (append-only) NDJSON günlüğü
+
+Her satır bir partidir: {"seq": n, "op": "append" | "upsert", "tracks": [...]}
+Sıkıştırma sonrası ilk satır {"base_seq": n}: n'e kadar olan partiler ikili katalogda.
+Birden çok işçi süreci aynı dosyaya ayrı bir kilit dosyası (flock) ile sırayla yazar;
+her süreç kendi okuma konumundan yeni satırları okuyarak bellek içi kataloğunu eşitler.
+"""
+
+import os
+import json
+import fcntl
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+
+LOG_SUFFIX = '.log'
+OPERATIONS = ('append', 'upsert')
+
+
+def log_path_for(csv_path):
+    """CSV kataloğunun günlük dosyasının yolu"""
+    return str(Path(csv_path).with_suffix(LOG_SUFFIX))
+
+
+def apply_entry(store, entry):
+    """Günlük partisini CatalogStore'a uygula; (eklenen, güncellenen) satır indeksleri"""
+    if entry['op'] == 'append':
+        appended = store.append(entry['tracks'])
+        return appended, appended[:0]
+    return store.upsert(entry['tracks'])
+
+
+class CatalogLog:
+    """Süreçler arası paylaşılan, fsync'li, periyodik sıkıştırılan katalog günlüğü"""
+
+    def __init__(self, path, applied_seq=0, fsync=True):
+        self.path = str(path)
+        self.lock_path = self.path + '.lock'
+        self.seq = applied_seq
+        self.fsync = fsync
+        self.pending_tracks = 0
+        self.behind = False
+        self._offset = 0
+        self._inode = None
+        self._lock = threading.RLock()
+
+    @contextmanager
+    def _locked(self):
+        """İş parçacığı kilidi + süreçler arası dosya kilidi (günlük dosyası değişse de kilit dosyası sabit)"""
+        with self._lock:
+            with open(self.lock_path, 'a') as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _read_new(self):
+        """Okuma konumundan sonraki tam satırları oku; uygulanmamış partileri döndür"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+        if stat.st_ino != self._inode:
+            # Sıkıştırma dosyayı değiştirdi: baştan oku
+            self._inode = stat.st_ino
+            self._offset = 0
+            self.pending_tracks = 0
+        if stat.st_size <= self._offset:
+            return []
+
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read()
+
+        entries = []
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b'\n'):
+                break  # yazımı süren veya çökmede yarım kalan satır
+            self._offset += len(line)
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                print(f"⚠️ Bozuk günlük satırı atlandı: {self.path}")
+                continue
+            if 'base_seq' in entry:
+                # Bu süreç, sıkıştırılıp günlükten silinen partileri hiç görmedi
+                if entry['base_seq'] > self.seq:
+                    self.behind = True
+                    self.seq = entry['base_seq']
+                continue
+            self.pending_tracks += len(entry['tracks'])
+            if entry['seq'] > self.seq:
+                self.seq = entry['seq']
+                entries.append(entry)
+        return entries
+
+    def _apply(self, entries, apply):
+        for entry in entries:
+            try:
+                apply(entry)
+            except Exception as e:
+                print(f"❌ Günlük partisi uygulanamadı (seq={entry['seq']}): {e}")
+
+    def sync(self, apply=None):
+        """Diğer süreçlerin yazdığı yeni partileri sırayla uygula ve döndür"""
+        with self._lock:
+            entries = self._read_new()
+            if apply is not None:
+                self._apply(entries, apply)
+            return entries
+
+    def append(self, op, tracks, apply):
+        """Partiyi önce diske (fsync) sonra belleğe yaz; apply sonucunu döndür"""
+        if op not in OPERATIONS:
+            raise ValueError(f"Geçersiz işlem: {op}")
+        with self._locked():
+            # Sıra tutarlılığı: önce diğer süreçlerin partileri
+            self._apply(self._read_new(), apply)
+
+            entry = {'seq': self.seq + 1, 'op': op, 'tracks': tracks}
+            line = (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+            with open(self.path, 'ab') as f:
+                if f.tell() > self._offset:
+                    # Çökmeden kalan yarım satırı kapat, yeni parti ayrı satırda kalsın
+                    f.write(b'\n')
+                f.write(line)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+                self._offset = f.tell()
+            self._inode = os.stat(self.path).st_ino
+            self.seq = entry['seq']
+            self.pending_tracks += len(tracks)
+            return entry['seq'], apply(entry)
+
+    def compact(self, apply, write_snapshot, min_tracks=0):
+        """Anlık görüntüyü yaz ve kapsanan partileri günlükten at; sıkıştırıldıysa True"""
+        with self._locked():
+            self._apply(self._read_new(), apply)
+            if self.pending_tracks < max(min_tracks, 1):
+                return False
+            write_snapshot(self.seq)
+
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write((json.dumps({'base_seq': self.seq}) + '\n').encode('utf-8'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            stat = os.stat(self.path)
+            self._inode = stat.st_ino
+            self._offset = stat.st_size
+            self.pending_tracks = 0
+            return True
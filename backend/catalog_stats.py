@@ -0,0 +1,251 @@
+"""
+Katalog İstatistikleri - Duygu başına sayı, özellik ortalaması/varyansı ve kantil taslakları
+
+Yüklemede bir kez hesaplanır, ekleme/güncellemelerde artımlı güncellenir (Chan birleştirme
+formülü; çıkarma da aynı formülün tersi). Kantiller sabit aralıklı histogram taslağından
+okunur: birleştirilebilir ve satır çıkarmayı destekler, hata bir kutu genişliğiyle sınırlıdır.
+"""
+
+import threading
+
+import numpy as np
+
+# Taslaktaki kutu sayısı ve özellik aralıkları (aralık dışı değerler uç kutulara düşer)
+SKETCH_BINS = 256
+FEATURE_RANGES = {'tempo': (0.0, 250.0)}
+DEFAULT_RANGE = (0.0, 1.0)
+
+# /api/stats yanıtında verilen kantiller
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+# Toplu eklemeler bu boyutta parçalarla birleştirilir: geçici (satır x özellik) diziler
+# önbellekte kalır ve tepe bellek katalog boyutundan bağımsızdır
+CHUNK_ROWS = 65_536
+
+
+class CatalogStats:
+    """Duygu başına artımlı özellik istatistikleri; snapshot() değişiklik yoksa önbellekten döner"""
+
+    def __init__(self, features):
+        self.features = list(features)
+        n_features = len(self.features)
+        self.lo = np.array([FEATURE_RANGES.get(col, DEFAULT_RANGE)[0] for col in self.features])
+        hi = np.array([FEATURE_RANGES.get(col, DEFAULT_RANGE)[1] for col in self.features])
+        self.scale = SKETCH_BINS / (hi - self.lo)
+        self.labels = []
+        self._label_index = {}
+        self.count = np.zeros(0, dtype=np.int64)
+        self.mean = np.zeros((0, n_features))
+        self.m2 = np.zeros((0, n_features))
+        self.minimum = np.zeros((0, n_features))
+        self.maximum = np.zeros((0, n_features))
+        self.hist = np.zeros((0, n_features, SKETCH_BINS), dtype=np.int64)
+        self.version = 0
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_columns(cls, features, codes, names, columns):
+        """Kodlanmış duygu sütunu + özellik sütunlarından oluştur"""
+        stats = cls(features)
+        stats.add(codes, names, columns)
+        return stats
+
+    def _lookup(self, names):
+        """Sözlük kodu -> istatistik satırı tablosu (yeni duygular için satır açılır)"""
+        lookup = np.empty(len(names), dtype=np.int64)
+        for code, name in enumerate(names):
+            label = str(name).lower()
+            if label not in self._label_index:
+                self._label_index[label] = len(self.labels)
+                self.labels.append(label)
+            lookup[code] = self._label_index[label]
+        grow = len(self.labels) - len(self.count)
+        if grow:
+            n_features = len(self.features)
+            self.count = np.concatenate([self.count, np.zeros(grow, dtype=np.int64)])
+            self.mean = np.vstack([self.mean, np.zeros((grow, n_features))])
+            self.m2 = np.vstack([self.m2, np.zeros((grow, n_features))])
+            self.minimum = np.vstack([self.minimum, np.full((grow, n_features), np.inf)])
+            self.maximum = np.vstack([self.maximum, np.full((grow, n_features), -np.inf)])
+            self.hist = np.concatenate([self.hist, np.zeros((grow, n_features, SKETCH_BINS), dtype=np.int64)])
+        return lookup
+
+    def _batch(self, rows, X):
+        """Partinin duygu başına (sayı, ortalama, M2, en küçük, en büyük, histogram) özetleri"""
+        n_labels, n_features = len(self.labels), len(self.features)
+        n = np.bincount(rows, minlength=n_labels)
+        safe = np.maximum(n, 1)[:, None]
+        mean = np.column_stack([np.bincount(rows, weights=X[:, f], minlength=n_labels) for f in range(n_features)]) / safe
+        centered = X - mean[rows]
+        m2 = np.column_stack([np.bincount(rows, weights=centered[:, f] ** 2, minlength=n_labels)
+                              for f in range(n_features)])
+        scaled = (X - self.lo) * self.scale
+        np.clip(scaled, 0, SKETCH_BINS - 1, out=scaled)
+        bins = scaled.astype(np.int64)
+        flat = (rows[:, None] * n_features + np.arange(n_features)) * SKETCH_BINS + bins
+        hist = np.bincount(flat.ravel(), minlength=n_labels * n_features * SKETCH_BINS)
+        hist = hist.reshape(n_labels, n_features, SKETCH_BINS)
+
+        # Kutular değere göre sıralı: en küçük/büyük değer grubun ilk/son dolu kutusundadır,
+        # kesin indirgeme yalnızca o kutulardaki satırlarda yapılır
+        first = np.argmax(hist > 0, axis=-1)
+        last = SKETCH_BINS - 1 - np.argmax(hist[..., ::-1] > 0, axis=-1)
+        minimum = np.full((n_labels, n_features), np.inf)
+        maximum = np.full((n_labels, n_features), -np.inf)
+        for f in range(n_features):
+            edge = bins[:, f] == first[rows, f]
+            np.minimum.at(minimum[:, f], rows[edge], X[edge, f])
+            edge = bins[:, f] == last[rows, f]
+            np.maximum.at(maximum[:, f], rows[edge], X[edge, f])
+        return n, mean, m2, minimum, maximum, hist
+
+    def add(self, codes, names, columns):
+        """Satırları ekle: codes duygu sözlük kodları, names sözlük, columns özellik sütunları"""
+        self._merge(codes, names, columns, remove=False)
+
+    def remove(self, codes, names, columns):
+        """Daha önce eklenmiş satırları çıkar (güncellemelerde eski değerler)"""
+        self._merge(codes, names, columns, remove=True)
+
+    def _merge(self, codes, names, columns, remove):
+        for start in range(0, len(codes), CHUNK_ROWS):
+            end = start + CHUNK_ROWS
+            chunk = {col: columns[col][start:end] for col in self.features}
+            self._merge_chunk(codes[start:end], names, chunk, remove)
+
+    def _merge_chunk(self, codes, names, columns, remove):
+        X = np.column_stack([np.asarray(columns[col], dtype=np.float64) for col in self.features])
+        with self._lock:
+            rows = self._lookup(names)[np.asarray(codes, dtype=np.int64)]
+            n_b, mean_b, m2_b, min_b, max_b, hist_b = self._batch(rows, X)
+            n_a, mean_a, m2_a = self.count, self.mean, self.m2
+            if remove:
+                n = n_a - n_b
+                safe = np.maximum(n, 1)[:, None]
+                mean = np.where(n[:, None] > 0, (n_a[:, None] * mean_a - n_b[:, None] * mean_b) / safe, 0.0)
+                delta = mean_b - mean
+                m2 = m2_a - m2_b - delta ** 2 * (n * n_b)[:, None] / np.maximum(n_a, 1)[:, None]
+                self.m2 = np.where(n[:, None] > 0, np.maximum(m2, 0.0), 0.0)
+                self.hist = self.hist - hist_b
+                # En küçük/büyük değerler geri alınamaz; gözlenen sınırlar olarak kalır
+            else:
+                n = n_a + n_b
+                safe = np.maximum(n, 1)[:, None]
+                delta = mean_b - mean_a
+                mean = mean_a + delta * n_b[:, None] / safe
+                self.m2 = m2_a + m2_b + delta ** 2 * (n_a * n_b)[:, None] / safe
+                self.hist = self.hist + hist_b
+                self.minimum = np.minimum(self.minimum, min_b)
+                self.maximum = np.maximum(self.maximum, max_b)
+            self.count, self.mean = n, mean
+            self.version += 1
+            self._snapshot = None
+
+    def _quantiles(self, hist, count, minimum, maximum):
+        """Histogram taslağından kantiller (kutu içinde doğrusal ara değer)"""
+        cumulative = np.cumsum(hist, axis=-1)
+        result = []
+        for q in QUANTILES:
+            target = q * count[:, None]
+            pos = np.minimum((cumulative < target[..., None]).sum(axis=-1), SKETCH_BINS - 1)
+            inside = np.take_along_axis(hist, pos[..., None], -1)[..., 0]
+            before = np.take_along_axis(cumulative, pos[..., None], -1)[..., 0] - inside
+            fraction = np.clip((target - before) / np.maximum(inside, 1), 0, 1)
+            value = self.lo + (pos + fraction) / self.scale
+            result.append(np.clip(value, minimum, maximum))
+        return np.stack(result, axis=-1)
+
+    def _summaries(self, count, mean, m2, minimum, maximum, hist):
+        """Satır başına (duygu veya genel) özellik özetleri"""
+        variance = m2 / np.maximum(count, 1)[:, None]
+        quantiles = self._quantiles(hist, count, minimum, maximum)
+        names = [f'p{int(q * 100):02d}' for q in QUANTILES]
+        summaries = []
+        for i in range(len(count)):
+            summaries.append({
+                col: {
+                    'mean': round(float(mean[i, f]), 4),
+                    'variance': round(float(variance[i, f]), 6),
+                    'std': round(float(np.sqrt(variance[i, f])), 4),
+                    'min': round(float(minimum[i, f]), 4),
+                    'max': round(float(maximum[i, f]), 4),
+                    'quantiles': dict(zip(names, np.round(quantiles[i, f], 4).tolist()))
+                }
+                for f, col in enumerate(self.features)
+            })
+        return summaries
+
+    def snapshot(self):
+        """JSON'a hazır özet; katalog boyutundan bağımsız, değişiklik olmadıkça önbellekten"""
+        with self._lock:
+            if self._snapshot is not None:
+                return self._snapshot
+            present = np.flatnonzero(self.count > 0)
+            count = self.count[present]
+            total = int(count.sum())
+            emotions = {}
+            if total:
+                summaries = self._summaries(count, self.mean[present], self.m2[present], self.minimum[present],
+                                            self.maximum[present], self.hist[present])
+                for i, row in enumerate(present):
+                    emotions[self.labels[row]] = {
+                        'count': int(count[i]),
+                        'share': round(int(count[i]) / total, 4),
+                        'features': summaries[i]
+                    }
+                # Genel özet: duygu özetlerinin birleşimi
+                mean = (count[:, None] * self.mean[present]).sum(axis=0) / total
+                m2 = (self.m2[present] + count[:, None] * (self.mean[present] - mean) ** 2).sum(axis=0)
+                overall = self._summaries(np.array([total]), mean[None], m2[None],
+                                          self.minimum[present].min(axis=0)[None],
+                                          self.maximum[present].max(axis=0)[None],
+                                          self.hist[present].sum(axis=0)[None])[0]
+            else:
+                overall = {}
+            self._snapshot = {
+                'total_songs': total,
+                'version': self.version,
+                'emotions': emotions,
+                'overall': overall,
+                'sketch_bins': SKETCH_BINS
+            }
+            return self._snapshot
+
+    def counts(self):
+        """Duygu -> şarkı sayısı"""
+        with self._lock:
+            return {label: int(n) for label, n in zip(self.labels, self.count.tolist()) if n}
+
+    def to_state(self):
+        """İkili kataloğa yazılacak durum: (JSON metadata, ad -> dizi)"""
+        with self._lock:
+            meta = {
+                'features': self.features,
+                'bins': SKETCH_BINS,
+                'lo': self.lo.tolist(),
+                'scale': self.scale.tolist(),
+                'labels': list(self.labels)
+            }
+            arrays = {
+                'count': self.count, 'mean': self.mean, 'm2': self.m2,
+                'min': self.minimum, 'max': self.maximum, 'hist': self.hist
+            }
+            return meta, {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+
+    @classmethod
+    def from_state(cls, features, meta, arrays):
+        """Kaydedilmiş durumu yükle; taslak ayarları farklıysa None (yeniden hesaplanmalı)"""
+        stats = cls(features)
+        if (not meta or meta.get('features') != stats.features or meta.get('bins') != SKETCH_BINS
+                or meta.get('lo') != stats.lo.tolist() or meta.get('scale') != stats.scale.tolist()):
+            return None
+        stats._lookup(meta['labels'])
+        # Bellek eşlemeli bölümler salt okunur; artımlı güncellemeler için kopyalanır
+        stats.count = np.array(arrays['count'], dtype=np.int64)
+        stats.mean = np.array(arrays['mean'], dtype=np.float64)
+        stats.m2 = np.array(arrays['m2'], dtype=np.float64)
+        stats.minimum = np.array(arrays['min'], dtype=np.float64)
+        stats.maximum = np.array(arrays['max'], dtype=np.float64)
+        stats.hist = np.array(arrays['hist'], dtype=np.int64)
+        return stats
@@ -0,0 +1,456 @@
+"""
+Bellek İçi Katalog Deposu - Duygu indeksli sütunsal şarkı kataloğu
+"""
+
+import threading
+
+import numpy as np
+
+from catalog_stats import CatalogStats
+
+FEATURE_COLUMNS = [
+    'danceability', 'energy', 'valence', 'tempo', 'acousticness',
+    'instrumentalness', 'liveness', 'speechiness'
+]
+
+# Eşleşme bulunamazsa kullanılacak benzer duygular
+EMOTION_MAPPING = {
+    'happy': ['happy', 'energetic'],
+    'sad': ['sad', 'calm'],
+    'angry': ['angry', 'energetic'],
+    'calm': ['calm', 'sad'],
+    'energetic': ['energetic', 'happy'],
+    'romantic': ['romantic', 'calm'],
+    'neutral': ['neutral', 'calm']
+}
+
+# Öneri yanıtında gösterilen özellikler ve yuvarlama basamakları
+RESPONSE_FEATURES = {'danceability': 3, 'energy': 3, 'valence': 3, 'tempo': 1}
+
+# Yanıt istatistiklerinde ortalaması verilen özellikler
+STATS_FEATURES = ('danceability', 'energy')
+
+# Artımlı eklemelerde tamponların en küçük kapasitesi
+MIN_CAPACITY = 1024
+
+# Bellekteki sütun tipleri (ikili katalog formatıyla aynı): float32 özellikler, dar sözlük kodları
+FEATURE_DTYPE = np.dtype('<f4')
+CODE_DTYPES = {
+    'emotion': np.dtype('<u1'),
+    'artist': np.dtype('<u4'),
+    'title': np.dtype('<u4')
+}
+
+
+class EncodedColumn:
+    """Sözlük kodlu dize sütunu: satır i için dictionary[codes[i]]"""
+
+    def __init__(self, codes, dictionary):
+        self.codes = codes
+        self.dictionary = dictionary
+        self._lookup = None
+
+    def __getitem__(self, i):
+        return self.dictionary[self.codes[i]]
+
+    def __len__(self):
+        return len(self.codes)
+
+    def take(self, indices):
+        """Seçilen satırların dizelerini liste olarak döndür (satır başına sözlük erişimi yerine toplu)"""
+        codes = self.codes[indices]
+        if isinstance(self.dictionary, np.ndarray):
+            return self.dictionary[codes].tolist()
+        dictionary = self.dictionary
+        return [dictionary[code] for code in codes.tolist()]
+
+    def dictionary_array(self):
+        """Sözlüğü nesne dizisi olarak döndür"""
+        if hasattr(self.dictionary, 'to_array'):
+            return self.dictionary.to_array()
+        return np.asarray(self.dictionary, dtype=object)
+
+    def encode(self, values):
+        """Dizeleri kodlara çevir; sözlükte olmayanlar sona eklenir"""
+        if self._lookup is None:
+            # İlk değişiklikte sözlük (ndarray veya eşlemeli blob) büyüyebilen listeye dönüşür
+            self.dictionary = [self.dictionary[i] for i in range(len(self.dictionary))]
+            self._lookup = {value: code for code, value in enumerate(self.dictionary)}
+        codes = np.empty(len(values), dtype=np.int64)
+        for i, value in enumerate(values):
+            code = self._lookup.get(value)
+            if code is None:
+                code = len(self.dictionary)
+                self.dictionary.append(value)
+                self._lookup[value] = code
+            codes[i] = code
+        dtype = self.codes.dtype
+        if np.issubdtype(dtype, np.integer) and len(self.dictionary) > np.iinfo(dtype).max:
+            raise ValueError("Sözlük kod tipine sığmıyor")
+        return codes
+
+
+def _compact_codes(name, codes, n_values):
+    """factorize kodlarını sütunun dar kod tipine çevir (sığmazsa veya eksik değer varsa int64 kalır)"""
+    dtype = CODE_DTYPES[name]
+    if n_values > np.iinfo(dtype).max or (len(codes) and codes.min() < 0):
+        return codes.astype(np.int64, copy=False)
+    return codes.astype(dtype)
+
+
+def _grow(buffer, size, needed):
+    """Tamponu en az `needed` kapasiteye (katlanarak) büyüt; ilk `size` eleman korunur"""
+    if buffer is not None and len(buffer) >= needed and buffer.flags.writeable:
+        return buffer
+    capacity = max(needed, MIN_CAPACITY, 2 * (len(buffer) if buffer is not None else 0))
+    grown = np.empty(capacity, dtype=buffer.dtype)
+    grown[:size] = buffer[:size]
+    return grown
+
+
+def tracks_to_columns(tracks):
+    """Şarkı sözlüklerini sütunlara çevir; eksik alan veya geçersiz değer ValueError verir"""
+    try:
+        columns = {name: [str(t[name]) for t in tracks] for name in ('title', 'artist', 'emotion')}
+        for col in FEATURE_COLUMNS:
+            columns[col] = np.array([float(t[col]) for t in tracks], dtype=np.float64)
+    except KeyError as e:
+        raise ValueError(f"Eksik alan: {e.args[0]}") from None
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Geçersiz değer: {e}") from None
+    return columns
+
+
+def _group_rows(codes, n_groups):
+    """Kodlara göre satırları grupla: (sıralı satırlar, grup sınırları)"""
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(n_groups + 1))
+    return order, bounds
+
+
+class TrackView:
+    """Katalogdaki tek şarkının hafif görünümü: satır başına sözlük/Series yerine (katalog, satır) çifti"""
+
+    __slots__ = ('catalog', 'row')
+
+    def __init__(self, catalog, row):
+        self.catalog = catalog
+        self.row = int(row)
+
+    @property
+    def title(self):
+        return self.catalog.titles[self.row]
+
+    @property
+    def artist(self):
+        return self.catalog.artists[self.row]
+
+    @property
+    def emotion(self):
+        return self.catalog.emotions[self.row]
+
+    def feature(self, col):
+        return float(self.catalog.features[col][self.row])
+
+    def to_dict(self, **extra):
+        """API yanıtındaki şarkı sözlüğü (title, artist, emotion + ek alanlar)"""
+        return {'title': self.title, 'artist': self.artist, 'emotion': self.emotion, **extra}
+
+
+class CatalogStore:
+    """Katalogu sütunsal NumPy dizileri ve duygu -> satır indeksi haritası olarak tutar"""
+
+    def __init__(self, df):
+        self.size = 0
+        empty = np.empty(0, dtype=object)
+        self.titles = EncodedColumn(np.empty(0, dtype=CODE_DTYPES['title']), empty)
+        self.artists = EncodedColumn(np.empty(0, dtype=CODE_DTYPES['artist']), empty)
+        self.emotions = EncodedColumn(np.empty(0, dtype=CODE_DTYPES['emotion']), empty)
+        self.features = {}
+        self.all_indices = np.empty(0, dtype=np.int64)
+        self.emotion_index = {}
+        self._rng = np.random.default_rng()
+        self._exact = {}
+        self._buffers = {}
+        self._key_index = None
+        self._write_lock = threading.Lock()
+        self.stats = CatalogStats(FEATURE_COLUMNS)
+        self.build(df)
+
+    @classmethod
+    def from_mapped(cls, mapped):
+        """Bellek eşlemeli ikili katalogdan kopyasız depo oluştur"""
+        store = cls(None)
+        if len(mapped) == 0:
+            return store
+
+        store.size = len(mapped)
+        store.titles = EncodedColumn(mapped.codes['title'], mapped.dictionaries['title'])
+        store.artists = EncodedColumn(mapped.codes['artist'], mapped.dictionaries['artist'])
+        store.emotions = EncodedColumn(mapped.codes['emotion'], mapped.dictionaries['emotion'])
+        store.features = dict(mapped.features)
+        store.all_indices = np.arange(store.size, dtype=np.int64)
+
+        # Duygu grupları dosyada önceden sıralı tutulur
+        store._build_emotion_index(mapped.dictionaries['emotion'], mapped.emotion_order, mapped.emotion_bounds)
+
+        # İstatistikler yazıcıda hesaplanıp dosyada saklanır; eski dosyalarda bir geçişte hesaplanır
+        state = mapped.stats_state()
+        stats = CatalogStats.from_state(FEATURE_COLUMNS, *state) if state else None
+        if stats is None or int(stats.count.sum()) != store.size:
+            stats = CatalogStats.from_columns(FEATURE_COLUMNS, store.emotions.codes,
+                                              store.emotions.dictionary_array(), store.features)
+        store.stats = stats
+        return store
+
+    def build(self, df):
+        """DataFrame'den sütunları ve duygu indeksini oluştur
+
+        Sütunlar DataFrame'den bağımsız kopyalardır (float32 özellikler, dar kodlar);
+        çağıran DataFrame'i bırakabilir.
+        """
+        if df is None or len(df) == 0:
+            return
+
+        self.size = len(df)
+        columns = {}
+        for name in ['title', 'artist', 'emotion']:
+            codes, uniques = df[name].factorize()
+            columns[name] = EncodedColumn(_compact_codes(name, codes, len(uniques)), np.asarray(uniques, dtype=object))
+        self.titles = columns['title']
+        self.artists = columns['artist']
+        self.emotions = columns['emotion']
+        self.features = {
+            col: df[col].to_numpy(dtype=FEATURE_DTYPE, copy=True)
+            for col in FEATURE_COLUMNS if col in df.columns
+        }
+        self.all_indices = np.arange(self.size, dtype=np.int64)
+
+        # Duygu başına satır indeksleri (tek geçişte gruplama)
+        order, bounds = _group_rows(self.emotions.codes, len(self.emotions.dictionary))
+        self._build_emotion_index(self.emotions.dictionary, order, bounds)
+        self.stats = CatalogStats.from_columns(FEATURE_COLUMNS, self.emotions.codes, self.emotions.dictionary,
+                                               self.features)
+
+    def _build_emotion_index(self, names, order, bounds):
+        """Duygu adı -> satır indeksleri haritasını yedek gruplarla birlikte oluştur"""
+        exact = {}
+        for code in range(len(names)):
+            label = str(names[code]).lower()
+            rows = order[bounds[code]:bounds[code + 1]]
+            exact[label] = np.sort(np.concatenate([exact[label], rows])) if label in exact else rows
+        self._exact = exact
+        self._resolve_fallbacks()
+
+    def _resolve_fallbacks(self):
+        """Yedek grupları önceden çöz: tam eşleşme -> benzer duygular -> tüm katalog"""
+        exact = self._exact
+        emotion_index = dict(exact)
+        for emotion, similar in EMOTION_MAPPING.items():
+            if emotion in exact:
+                continue
+            groups = [exact[e] for e in similar if e in exact]
+            if groups:
+                emotion_index[emotion] = np.sort(np.concatenate(groups))
+        self.emotion_index = emotion_index
+
+    def _column_buffer(self, name, view, needed):
+        """Sütunun yazılabilir, büyüyebilen tamponunu döndür"""
+        buffer = _grow(self._buffers.get(name, view), self.size, needed)
+        self._buffers[name] = buffer
+        return buffer
+
+    def _group_append(self, label, rows):
+        """Duygu grubunun sonuna (sıralı kalacak şekilde daha büyük) satırları ekle"""
+        group = self._exact.get(label, np.empty(0, dtype=np.int64))
+        key = ('group', label)
+        buffer = _grow(self._buffers.get(key, group), len(group), len(group) + len(rows))
+        buffer[len(group):len(group) + len(rows)] = rows
+        self._buffers[key] = buffer
+        self._exact[label] = buffer[:len(group) + len(rows)]
+
+    def _group_move(self, row, old_label, new_label):
+        """Güncellenen satırı eski duygu grubundan yenisine taşı"""
+        old = self._exact[old_label]
+        self._exact[old_label] = old[old != row]
+        self._buffers.pop(('group', old_label), None)
+        group = self._exact.get(new_label, np.empty(0, dtype=np.int64))
+        self._exact[new_label] = np.insert(group, np.searchsorted(group, row), row)
+        self._buffers.pop(('group', new_label), None)
+
+    def append(self, tracks):
+        """Şarkıları kataloğun sonuna ekle; yeni satır indekslerini döndür"""
+        columns = tracks_to_columns(tracks)
+        with self._write_lock:
+            return self._append_columns(columns)
+
+    def upsert(self, tracks):
+        """(title, artist) anahtarı varsa satırı güncelle, yoksa ekle; (eklenen, güncellenen) indeksler"""
+        columns = tracks_to_columns(tracks)
+        with self._write_lock:
+            if self._key_index is None:
+                self._key_index = {
+                    key: i for i, key in enumerate(zip(self.titles.codes.tolist(), self.artists.codes.tolist()))
+                }
+            title_codes = self.titles.encode(columns['title'])
+            artist_codes = self.artists.encode(columns['artist'])
+
+            # Aynı partide tekrar eden anahtarlarda son kayıt geçerli
+            latest = {}
+            for i, key in enumerate(zip(title_codes.tolist(), artist_codes.tolist())):
+                latest[key] = i
+            updates = [(self._key_index[key], i) for key, i in latest.items() if key in self._key_index]
+            inserts = np.array([i for key, i in latest.items() if key not in self._key_index], dtype=np.int64)
+
+            # İstatistiklerde güncellenen satırların eski değerleri çıkarılıp yenileri eklenir
+            rows = np.array([row for row, _ in updates], dtype=np.int64)
+            old = self._row_columns(rows)
+            for row, i in updates:
+                self._update_row(row, {name: values[i] for name, values in columns.items()})
+            if len(rows):
+                self.stats.remove(*old)
+                self.stats.add(*self._row_columns(rows))
+            appended = self._append_columns({name: np.asarray(values, dtype=object)[inserts] if name in ('title', 'artist', 'emotion')
+                                             else values[inserts] for name, values in columns.items()})
+            return appended, rows
+
+    def _row_columns(self, rows):
+        """İstatistik güncellemesi için satırların (duygu kodları, sözlük, özellik sütunları)"""
+        return (self.emotions.codes[rows], self.emotions.dictionary_array(),
+                {col: self.features[col][rows] for col in FEATURE_COLUMNS})
+
+    def _update_row(self, row, track):
+        """Var olan satırın duygu ve özelliklerini yerinde güncelle"""
+        for col in FEATURE_COLUMNS:
+            self._column_buffer(col, self.features[col], self.size)[row] = track[col]
+            self.features[col] = self._buffers[col][:self.size]
+        old_label = str(self.emotions[row]).lower()
+        code = self.emotions.encode([track['emotion']])[0]
+        self._column_buffer('emotion', self.emotions.codes, self.size)[row] = code
+        self.emotions.codes = self._buffers['emotion'][:self.size]
+        new_label = track['emotion'].lower()
+        if new_label != old_label:
+            self._group_move(row, old_label, new_label)
+            self._resolve_fallbacks()
+
+    def _append_columns(self, columns):
+        """Sütun verisini tamponlara yaz, görünümleri ve duygu indeksini güncelle"""
+        n = len(columns['title'])
+        start, end = self.size, self.size + n
+        if n == 0:
+            return np.empty(0, dtype=np.int64)
+        if self.size == 0 and not self.features:
+            # Boş katalog: sütun tiplerini ilk partiden başlat
+            self.features = {col: np.empty(0, dtype=FEATURE_DTYPE) for col in FEATURE_COLUMNS}
+            self.titles, self.artists, self.emotions = (
+                EncodedColumn(np.empty(0, dtype=CODE_DTYPES[name]), np.empty(0, dtype=object))
+                for name in ('title', 'artist', 'emotion')
+            )
+
+        # Önce sözlükler ve tamponlar; okuyucular yalnızca görünümler güncellenince yeni satırları görür
+        encoded = {
+            'title': self.titles.encode(columns['title']),
+            'artist': self.artists.encode(columns['artist']),
+            'emotion': self.emotions.encode(columns['emotion'])
+        }
+        for col in FEATURE_COLUMNS:
+            self._column_buffer(col, self.features[col], end)[start:end] = columns[col]
+        for name, column in [('title', self.titles), ('artist', self.artists), ('emotion', self.emotions)]:
+            self._column_buffer(name, column.codes, end)[start:end] = encoded[name]
+        indices = self._column_buffer('all', self.all_indices, end)
+        indices[start:end] = np.arange(start, end)
+
+        for col in FEATURE_COLUMNS:
+            self.features[col] = self._buffers[col][:end]
+        self.titles.codes = self._buffers['title'][:end]
+        self.artists.codes = self._buffers['artist'][:end]
+        self.emotions.codes = self._buffers['emotion'][:end]
+        self.all_indices = indices[:end]
+        self.size = end
+
+        # Yeni satırları duygu gruplarına ve istatistiklere ekle
+        new_rows = np.arange(start, end, dtype=np.int64)
+        self.stats.add(encoded['emotion'], self.emotions.dictionary_array(), columns)
+        labels = np.array([str(self.emotions.dictionary[c]).lower() for c in encoded['emotion']])
+        for label in np.unique(labels):
+            self._group_append(label, new_rows[labels == label])
+        self._resolve_fallbacks()
+
+        if self._key_index is not None:
+            for i, key in enumerate(zip(encoded['title'].tolist(), encoded['artist'].tolist())):
+                self._key_index[key] = start + i
+        return new_rows
+
+    def column_chunks(self, chunk_size=1_000_000):
+        """Kataloğu CatalogWriter'a uygun sütun sözlüğü parçaları olarak üret"""
+        columns = {'title': self.titles, 'artist': self.artists, 'emotion': self.emotions}
+        dictionaries = {name: column.dictionary_array() for name, column in columns.items()}
+        for start in range(0, self.size, chunk_size):
+            end = min(start + chunk_size, self.size)
+            chunk = {name: dictionaries[name][columns[name].codes[start:end]] for name in columns}
+            for col in FEATURE_COLUMNS:
+                chunk[col] = self.features[col][start:end]
+            yield chunk
+
+    def track(self, row):
+        """Satırın hafif şarkı görünümü"""
+        return TrackView(self, row)
+
+    def lookup(self, emotion):
+        """Duyguya ait satır indekslerini döndür (yedekler dahil)"""
+        return self.emotion_index.get(str(emotion).lower(), self.all_indices)
+
+    def reseed(self, seed=None):
+        """Rastgele üreteci yenile (fork edilen işçiler aynı diziyi üretmesin)"""
+        self._rng = np.random.default_rng(seed)
+
+    def sample(self, emotion, n=5, rng=None):
+        """Duygu havuzundan tekrarsız n satır indeksi seç"""
+        pool = self.lookup(emotion)
+        k = min(n, len(pool))
+        if k == 0:
+            return pool[:0]
+        rng = rng or self._rng
+        return pool[rng.choice(len(pool), size=k, replace=False)]
+
+    def records(self, indices, return_stats=False):
+        """Seçilen satırları API yanıt formatına dönüştür (sütun dilimleri + vektörize yuvarlama)
+
+        return_stats=True ise aynı dilimlerden hesaplanan ortalamalar da döndürülür
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        columns = {
+            col: np.round(self.features[col][indices].astype(np.float64), digits)
+            for col, digits in RESPONSE_FEATURES.items()
+        }
+        recommendations = [
+            {
+                'title': title,
+                'artist': artist,
+                'emotion': emotion,
+                'features': {'danceability': danceability, 'energy': energy, 'valence': valence, 'tempo': tempo}
+            }
+            for title, artist, emotion, danceability, energy, valence, tempo in zip(
+                self.titles.take(indices), self.artists.take(indices), self.emotions.take(indices),
+                *(columns[col].tolist() for col in RESPONSE_FEATURES)
+            )
+        ]
+        if not return_stats:
+            return recommendations
+        stats = {
+            f'avg_{col}': round(float(columns[col].mean()), 3) if len(indices) else 0.0
+            for col in STATS_FEATURES
+        }
+        return recommendations, stats
+
+    def to_dataframe(self):
+        """Eğitim gibi pandas gerektiren yollar için DataFrame'e dönüştür"""
+        import pandas as pd
+
+        chunks = [pd.DataFrame(chunk) for chunk in self.column_chunks()]
+        if not chunks:
+            return pd.DataFrame(columns=['title', 'artist', 'emotion'] + FEATURE_COLUMNS)
+        return pd.concat(chunks, ignore_index=True)
+
+    def __len__(self):
+        return self.size
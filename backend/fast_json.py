@@ -0,0 +1,45 @@
+"""
+Hızlı JSON - orjson kuruluysa Flask yanıtlarını orjson ile kodlar (yoksa standart json)
+"""
+
+import os
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# FAST_JSON=0 ile standart kodlayıcıya dönülür
+FAST_JSON = orjson is not None and os.environ.get('FAST_JSON', '1') == '1'
+
+if orjson is not None:
+    # Flask varsayılanlarıyla aynı çıktı: sıralı anahtarlar, tarih/dataclass Flask'ın default'una bırakılır
+    ORJSON_OPTIONS = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                      | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """jsonify/dumps için orjson; desteklenmeyen değerlerde standart kodlayıcıya düşer"""
+
+    def _encode(self, obj):
+        try:
+            return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS)
+        except TypeError:
+            return None
+
+    def dumps(self, obj, **kwargs):
+        if FAST_JSON and not kwargs:
+            body = self._encode(obj)
+            if body is not None:
+                return body.decode()
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        if not FAST_JSON:
+            return super().response(*args, **kwargs)
+        body = self._encode(self._prepare_response_obj(args, kwargs))
+        if body is None:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -3,96 +3,433 @@
 React Frontend ile entegre API
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g, Response, stream_with_context
 from flask_cors import CORS
-import pandas as pd
 import numpy as np
-from pathlib import Path
 import json
-from music_recommender import MusicRecommender
-from ml_emotion_classifier import EmotionClassifier
+import time
+import os
+import threading
+import traceback
+from catalog_store import EMOTION_MAPPING, FEATURE_COLUMNS
+from response_cache import TTLCache, SampledPool
+from metrics import metrics, SamplingProfiler, STAGE_HELP
+from session_history import SessionHistory
+from micro_batch import MicroBatcher
+from pagination import encode_cursor, decode_cursor, new_seed, permuted_page
+from fast_json import FastJSONProvider
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)  # orjson varsa hızlı kodlama
 CORS(app)  # CORS desteği
 
 # Global değişkenler
 recommender = None
 classifier = None
+model_reloader = None
 
-def init_models():
-    """Modelleri başlat"""
-    global recommender, classifier
+# Toplu tahmin isteği başına en fazla satır
+MAX_BATCH_ROWS = 10000
+
+# Tek yanıttaki en fazla öneri (sıralamalı) ve imleçli sayfalamada en büyük sayfa
+MAX_RECOMMENDATIONS = 50
+MAX_PAGE_SIZE = int(os.environ.get('MAX_PAGE_SIZE', 500))
+
+# Duygu profili + MMR çeşitlilik sıralaması (DIVERSE_RANKING=0 ile düz rastgele örnekleme)
+DIVERSE_RANKING = os.environ.get('DIVERSE_RANKING', '1') == '1'
+
+# Özelliklerden karışım (blend) üretirken bu olasılığın altındaki duygular yok sayılır
+MIX_MIN_PROBABILITY = 0.05
+
+# Kullanıcı/oturum başına "tekrar etme" geçmişi (SESSION_HISTORY=0 ile kapatılır)
+session_history = SessionHistory(
+    max_users=int(os.environ.get('SESSION_MAX_USERS', 1_000_000)),
+    ttl=float(os.environ.get('SESSION_TTL', 86400))
+) if os.environ.get('SESSION_HISTORY', '1') == '1' else None
+
+# Eşzamanlı tek satırlık duygu tespitlerini tek tahmin çağrısında topla (MICRO_BATCH=1);
+# parti en fazla MICRO_BATCH_MAX_SIZE satır, ilk istekten sonra en fazla MICRO_BATCH_MAX_WAIT_MS bekler
+MICRO_BATCH = os.environ.get('MICRO_BATCH') == '1'
+MICRO_BATCH_MAX_SIZE = int(os.environ.get('MICRO_BATCH_MAX_SIZE', 64))
+MICRO_BATCH_MAX_WAIT_MS = float(os.environ.get('MICRO_BATCH_MAX_WAIT_MS', 1.0))
+
+# NDJSON toplu yüklemede günlüğe tek partide yazılan şarkı sayısı
+INGEST_BATCH_ROWS = 10000
+
+# Duygu açıklamaları
+EMOTION_DESCRIPTIONS = {
+    'happy': 'Neşeli ve enerjik müzik önerileri',
+    'sad': 'Hüzünlü ve duygusal müzik önerileri',
+    'angry': 'Sert ve enerjik müzik önerileri',
+    'calm': 'Sakin ve rahatlatıcı müzik önerileri',
+    'energetic': 'Hareketli ve motive edici müzik önerileri',
+    'romantic': 'Romantik ve duygusal müzik önerileri',
+    'neutral': 'Dengeli ve orta tempolu müzik önerileri'
+}
+
+# Duyguya bağlı yanıt parçaları ve model bilgisi için önbellek
+response_cache = TTLCache(
+    maxsize=int(os.environ.get('RESPONSE_CACHE_SIZE', 256)),
+    ttl=float(os.environ.get('RESPONSE_CACHE_TTL', 300))
+)
+
+# Önceden örneklenmiş öneri havuzları (PRESAMPLED_POOLS=1 ile açılır)
+USE_PRESAMPLED_POOLS = os.environ.get('PRESAMPLED_POOLS') == '1'
+sampled_pool = None
+
+# Örneklemeli profilleyici uç noktası (ENABLE_PROFILER=1 ile açılır)
+ENABLE_PROFILER = os.environ.get('ENABLE_PROFILER') == '1'
+
+# Eski model servis edilirken yeniden eğitimi arka planda yap (BACKGROUND_TRAINING=1)
+BACKGROUND_TRAINING = os.environ.get('BACKGROUND_TRAINING') == '1'
+
+# Model artifact'ı değişince otomatik yeniden yükle (MODEL_WATCH=1)
+MODEL_WATCH = os.environ.get('MODEL_WATCH') == '1'
+# Diğer işçilerin yayınladığı sürüm işaretçisi de bu aralıkla izlenir
+MODEL_WATCH_INTERVAL = float(os.environ.get('MODEL_WATCH_INTERVAL', 10))
+
+# Yönetim uç noktaları için belirteç (tanımlı değilse uç noktalar kapalı)
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+# Modelleri arka planda ısıt: sunucu hemen istek kabul eder, /api/ready hazır olunca 200 (BACKGROUND_WARMUP=1)
+BACKGROUND_WARMUP = os.environ.get('BACKGROUND_WARMUP') == '1'
+
+# Isınma sürerken de yanıt veren uç noktalar (model gerektirmez)
+WARMUP_ENDPOINTS = {'health', 'ready', 'prometheus_metrics', 'cache_stats'}
+
+# Model yükleme durumu: idle -> warming -> ready | failed (aşama süreleri /api/ready'de)
+readiness = {'status': 'idle', 'timings': {}, 'error': None}
+_warmup_lock = threading.Lock()
+
+def _cache_metrics():
+    """Önbellek sayaçlarını Prometheus örneklerine dönüştür"""
+    families = []
+    caches = {'response_cache': response_cache.stats()}
+    if sampled_pool:
+        caches['sampled_pool'] = sampled_pool.stats()
+    if session_history is not None:
+        history = session_history.stats()
+        families.append(('session_history_users', 'gauge', 'Geçmişi tutulan kullanıcı sayısı',
+                         [({}, history['users'])]))
+        families.append(('session_history_bytes', 'gauge', 'Oturum geçmişi filtre belleği',
+                         [({}, history['array_bytes'])]))
+    for field, help_text in [('hits', 'Önbellek isabet sayısı'), ('misses', 'Önbellek ıska sayısı')]:
+        families.append((f'cache_{field}_total', 'counter', help_text,
+                         [({'cache': name}, stats[field]) for name, stats in caches.items()]))
+    if micro_batcher is not None:
+        batching = micro_batcher.stats()
+        families.append(('micro_batches_total', 'counter', 'Mikro toplama ile yapılan tahmin çağrıları',
+                         [({}, batching['batches'])]))
+        families.append(('micro_batch_items_total', 'counter', 'Mikro toplamayla sınıflandırılan satırlar',
+                         [({}, batching['items'])]))
+    families.append(('cache_evictions_total', 'counter', 'Önbellek tahliye sayısı',
+                     [({'cache': 'response_cache'}, caches['response_cache']['evictions'])]))
+    families.append(('cache_size', 'gauge', 'Önbellekteki kayıt sayısı',
+                     [({'cache': 'response_cache'}, caches['response_cache']['size'])]))
+    return families
+
+metrics.add_collector(_cache_metrics)
+
+def record_error(error):
+    """Hata sayacını artır ve yığın izini yazdır"""
+    metrics.inc('errors_total', help_text='İşlenmeyen hata sayısı',
+                endpoint=request.endpoint or 'unknown', exception=type(error).__name__)
+    traceback.print_exc()
+
+@app.before_request
+def _start_timer():
+    g.request_start = time.perf_counter()
+
+@app.before_request
+def _require_ready():
+    """Isınma modunda ilk istek yüklemeyi başlatır; bitene kadar model gerektiren isteklere 503"""
+    if BACKGROUND_WARMUP and readiness['status'] == 'idle':
+        start_warmup()
+    if readiness['status'] == 'warming' and request.endpoint not in WARMUP_ENDPOINTS:
+        return jsonify({'error': 'Modeller yükleniyor', 'status': 'warming'}), 503, {'Retry-After': '1'}
+
+@app.after_request
+def _record_request(response):
+    endpoint = request.endpoint or 'unknown'
+    start = g.get('request_start')
+    if start is not None:
+        metrics.observe('request_duration_seconds', time.perf_counter() - start,
+                        'İstek süresi', endpoint=endpoint)
+    metrics.inc('requests_total', help_text='İstek sayısı', endpoint=endpoint,
+                method=request.method, status=response.status_code)
+    return response
+
+def init_models(background_training=BACKGROUND_TRAINING, start_threads=True):
+    """Modelleri başlat (start_threads=False: preload'da arka plan iş parçacıkları fork sonrası after_fork'ta başlar)"""
+    global recommender, classifier, model_reloader
     try:
+        start = time.perf_counter()
+        timings = {}
+        # pandas/scikit-learn içe aktarımı modül yüklemesinden buraya ertelendi (soğuk başlangıç)
+        from music_recommender import MusicRecommender
+        from ml_emotion_classifier import EmotionClassifier
+        from model_reloader import ModelReloader
+        timings['imports'] = time.perf_counter() - start
+
+        stage_start = time.perf_counter()
         recommender = MusicRecommender()
+        timings['catalog'] = time.perf_counter() - stage_start
+        stage_start = time.perf_counter()
         classifier = EmotionClassifier()
-        classifier.prepare_data()
-        # Gelişmiş model eğitimi dene, olmazsa basit olanı kullan
-        try:
-            classifier.train_advanced_model()
-        except Exception as e:
-            print(f"Gelişmiş model eğitimi başarısız, basit model kullanılıyor: {e}")
-            classifier.train_random_forest()
-        print("✅ Modeller başarıyla yüklendi")
+        if background_training and classifier.needs_training() and classifier.load_model(allow_stale=True):
+            # Eski model hemen servis edilir; yenisi hazır olunca değiştirilir
+            EmotionClassifier().train_in_background(on_done=swap_classifier)
+            print("⚠️ Eski model servis ediliyor, yeniden eğitim arka planda")
+        else:
+            # Veri/ayar özeti eşleşirse kayıtlı model yüklenir, yoksa yeniden eğitilir
+            classifier.load_or_train()
+        timings['classifier'] = time.perf_counter() - stage_start
+        response_cache.invalidate()
+        model_reloader = ModelReloader(
+            lambda: classifier, set_classifier,
+            model_path=classifier.model_path,
+            interval=MODEL_WATCH_INTERVAL,
+            watch_artifact=MODEL_WATCH
+        )
+        if start_threads:
+            start_background_threads()
+        release_free_heap()
+        timings['total'] = time.perf_counter() - start
+        readiness.update(status='ready', error=None, timings={k: round(v, 3) for k, v in timings.items()})
+        print(f"✅ Modeller başarıyla yüklendi ({timings['total']:.3f} sn: içe aktarma {timings['imports']:.3f}, "
+              f"katalog {timings['catalog']:.3f}, sınıflandırıcı {timings['classifier']:.3f})")
         return True
     except Exception as e:
+        readiness.update(status='failed', error=str(e))
         print(f"❌ Model yükleme hatası: {e}")
         return False
 
+def release_free_heap():
+    """Yükleme/eğitim tepesinde ayrılıp serbest kalan C yığınını işletim sistemine geri ver (glibc dışında etkisiz)"""
+    try:
+        import ctypes
+        ctypes.CDLL('libc.so.6').malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+def start_warmup():
+    """Modelleri arka plan iş parçacığında yükle; sunucu bu sırada sağlık/hazırlık yoklamalarına yanıt verir"""
+    with _warmup_lock:
+        if readiness['status'] in ('warming', 'ready'):
+            return False
+        readiness['status'] = 'warming'
+    threading.Thread(target=init_models, name='model-warmup', daemon=True).start()
+    return True
+
+def set_classifier(new_classifier):
+    """Servisteki sınıflandırıcıyı tek atamayla değiştir"""
+    global classifier
+    classifier = new_classifier
+    response_cache.invalidate()
+
+def swap_classifier(trained):
+    """Arka planda eğitilen sınıflandırıcıyı servise al (önceki geri alma için saklanır)"""
+    if model_reloader:
+        model_reloader.swap(trained, model_reloader.evaluate(trained))
+    else:
+        set_classifier(trained)
+    print("✅ Yeniden eğitilen model servise alındı")
+
+def after_fork():
+    """Çok işçili sunucuda fork sonrası işçiye özel durumu yenile"""
+    if BACKGROUND_WARMUP and readiness['status'] != 'ready':
+        # Isınma modunda her işçi modelleri kendisi yükler (iş parçacıkları fork'tan sağ çıkmaz)
+        readiness['status'] = 'idle'
+        start_warmup()
+        return
+    # Her işçi farklı rastgele örnek üretmeli; arka plan iş parçacıkları fork'tan sağ çıkmaz
+    if recommender and recommender.catalog is not None:
+        recommender.catalog.reseed()
+    start_background_threads()
+
+def start_background_threads():
+    """Model izleyici, katalog günlüğü eşitleme ve öneri havuzu iş parçacıklarını bu süreçte başlat"""
+    # Preload'da ana süreçte çağrılmaz: fork anında kilit (günlük kilidi/flock, izleyici kilidi) tutan
+    # bir iş parçacığı işçiyi kilitler, ana süreç de boşuna eşitleme/yeniden yükleme yapar
+    if model_reloader:
+        # Yönetim uç noktalarıyla yapılan değişim/geri alma diğer işçilere işaretçiyle ulaşır
+        model_reloader.start()
+    if recommender:
+        recommender.start_log_sync()
+        if USE_PRESAMPLED_POOLS:
+            start_sampled_pool()
+
+def start_sampled_pool():
+    """Bilinen duygular için arka planda doldurulan öneri havuzlarını başlat"""
+    global sampled_pool
+    if sampled_pool is not None:
+        sampled_pool.stop()
+    sampled_pool = SampledPool(lambda emotion: select_recommendations(emotion, 5), EMOTION_MAPPING).start()
+
+def select_recommendations(emotion, n, user=None, mix=None, mix_mode='pools'):
+    """Duygu havuzundan (veya duygu karışımından) n satır indeksi seç"""
+    ranker = recommender.ranker
+    # Kullanıcıya daha önce sunulan şarkılar adaylardan elenir
+    exclude = (lambda ids: session_history.contains(user, ids)) if user is not None else None
+    if mix is not None:
+        indices = ranker.blend(mix, n, exclude=exclude, mode=mix_mode)
+    elif user is not None:
+        indices = ranker.select(emotion, n, exclude=exclude)
+    elif DIVERSE_RANKING:
+        return ranker.select(emotion, n)
+    else:
+        return recommender.catalog.sample(emotion, n)
+    if user is not None:
+        session_history.add(user, indices)
+    return indices
+
+def parse_mix(mix):
+    """{duygu: ağırlık} karışımını doğrula ve ağırlıkları toplamı 1 olacak şekilde normalize et"""
+    if not isinstance(mix, dict) or not mix:
+        raise ValueError('mix boş olmayan bir {duygu: ağırlık} nesnesi olmalı')
+    weights = {}
+    for emotion, weight in mix.items():
+        key = str(emotion).lower()
+        if key not in EMOTION_MAPPING:
+            raise ValueError(f'Bilinmeyen duygu: {emotion}')
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)) or not weight >= 0:
+            raise ValueError(f'Geçersiz ağırlık: {emotion}')
+        weights[key] = weights.get(key, 0.0) + float(weight)
+    total = sum(weights.values())
+    if not 0 < total < float('inf'):
+        raise ValueError('Ağırlıkların toplamı pozitif olmalı')
+    return {emotion: weight / total for emotion, weight in weights.items() if weight > 0}
+
+def emotion_fragment(emotion):
+    """Yanıtın yalnızca duyguya bağlı parçaları (önbellekli)"""
+    key = ('fragment', emotion.lower())
+
+    def build():
+        return {
+            'description': EMOTION_DESCRIPTIONS.get(emotion.lower(), 'Müzik önerileri'),
+            'mood_description': EMOTION_DESCRIPTIONS.get(emotion.lower(), '')
+        }
+
+    return response_cache.get_or_set(key, build)
+
+def cached_model_info():
+    """Önceden hesaplanmış model bilgisi (önbellekli)"""
+    if not classifier:
+        return {}
+    return response_cache.get_or_set(('model_info',), classifier.get_model_info)
+
+def classify_rows(matrix):
+    """Toplanan satırları tek çağrıda sınıflandır: satır başına (duygu, olasılıklar, sınıflar)"""
+    emotions, proba, classes = classifier.predict_emotions(matrix, return_proba=True)
+    return [(emotion, row, classes) for emotion, row in zip(emotions, proba)]
+
+micro_batcher = MicroBatcher(classify_rows, MICRO_BATCH_MAX_SIZE, MICRO_BATCH_MAX_WAIT_MS) if MICRO_BATCH else None
+
+def detect_emotion(features):
+    """Tek satır özellikten duygu, predict_proba güveni ve sınıf olasılıklarını hesapla"""
+    if isinstance(features, dict):
+        features = [features[col] for col in FEATURE_COLUMNS]
+    row = np.asarray(features, dtype=np.float64).ravel()
+    # Hatalı satır, toplandığı partideki diğer istekleri de düşürmesin
+    if row.shape != (len(FEATURE_COLUMNS),) or not np.isfinite(row).all():
+        raise ValueError(f'{len(FEATURE_COLUMNS)} sonlu özellik gerekli')
+    if micro_batcher is not None:
+        emotion, proba, classes = micro_batcher.submit(row)
+    else:
+        emotion, proba, classes = classify_rows(row.reshape(1, -1))[0]
+    probability = float(proba.max())
+    level = 'high' if probability >= 0.75 else 'medium' if probability >= 0.5 else 'low'
+    probabilities = dict(zip(classes, proba.tolist()))
+    return emotion, {'confidence': level, 'probability': round(probability, 4)}, probabilities
+
 @app.route('/api/recommendations', methods=['POST'])
 def get_recommendations():
     """Gelişmiş duygu durumuna göre müzik önerileri"""
     try:
         data = request.get_json()
         emotion = data.get('emotion', 'neutral')
+        # İmleç verildiyse veya paginate istendiyse tekrarsız sayfalı mod
+        cursor = data.get('cursor')
+        paginate = bool(cursor) or bool(data.get('paginate'))
+        try:
+            limit = MAX_PAGE_SIZE if paginate else MAX_RECOMMENDATIONS
+            n = max(1, min(int(data.get('page_size', data.get('n', 5))), limit))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'n bir tamsayı olmalı'}), 400
+        if cursor:
+            try:
+                emotion, seed, offset, size = decode_cursor(str(cursor))
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+        # Çoklu duygu karışımı: {"mix": {"calm": 0.7, "romantic": 0.3}} veya özelliklerden {"blend": true}
+        mix = data.get('mix')
+        blend = bool(data.get('blend')) and data.get('features') is not None
+        mix_mode = data.get('mix_mode', 'pools')
+        if mix is not None or blend:
+            if paginate:
+                return jsonify({'error': 'mix sayfalama ile birlikte kullanılamaz'}), 400
+            if mix_mode not in ('pools', 'blend'):
+                return jsonify({'error': "mix_mode 'pools' veya 'blend' olmalı"}), 400
+        if mix is not None:
+            try:
+                mix = parse_mix(mix)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            emotion = max(mix, key=mix.get)
+        user = data.get('user_id') or data.get('session_id')
+        user = str(user) if user is not None and session_history is not None else None
 
         if not recommender:
             return jsonify({'error': 'Model not loaded'}), 500
 
-        # Dataset'ten öneriler al
+        # Ses özellikleri gönderildiyse duygu modelden tespit edilir (imleçte duygu sabittir)
+        analysis = {'confidence': 'high'}  # Basitleştirilmiş
+        if not cursor and mix is None and data.get('features') is not None and classifier:
+            try:
+                emotion, analysis, probabilities = detect_emotion(data['features'])
+            except (KeyError, ValueError, TypeError) as e:
+                return jsonify({'error': f'Geçersiz özellikler: {e}'}), 400
+            if blend:
+                # Sınıf olasılıkları karışım ağırlıkları olur
+                mix = parse_mix({e: p for e, p in probabilities.items() if p >= MIX_MIN_PROBABILITY})
+
+        # Önceden indekslenmiş katalogdan öneriler al
         recommendations = []
+        stats = None
+        page = None
 
         try:
-            df = pd.read_csv('../data/music_emotion.csv')
-            # Duygu durumuna göre filtrele
-            filtered_df = df[df['emotion'].str.lower() == emotion.lower()]
-
-            if len(filtered_df) == 0:
-                # Benzer duygular için genişlet
-                emotion_mapping = {
-                    'happy': ['happy', 'energetic'],
-                    'sad': ['sad', 'calm'],
-                    'angry': ['angry', 'energetic'],
-                    'calm': ['calm', 'sad'],
-                    'energetic': ['energetic', 'happy'],
-                    'romantic': ['romantic', 'calm'],
-                    'neutral': ['neutral', 'calm']
-                }
-                similar_emotions = emotion_mapping.get(emotion.lower(), [emotion])
-                filtered_df = df[df['emotion'].str.lower().isin(similar_emotions)]
-
-            if len(filtered_df) == 0:
-                filtered_df = df
-
-            # Rastgele 5 öneri seç
-            sample = filtered_df.sample(min(5, len(filtered_df)))
-
-            recommendations = []
-            for _, row in sample.iterrows():
-                rec = {
-                    'title': row['title'],
-                    'artist': row['artist'],
-                    'emotion': row['emotion'],
-                    'features': {
-                        'danceability': round(row['danceability'], 3),
-                        'energy': round(row['energy'], 3),
-                        'valence': round(row['valence'], 3),
-                        'tempo': round(row['tempo'], 1)
+            catalog = recommender.catalog
+            if catalog is None or len(catalog) == 0:
+                raise ValueError('Katalog boş')
+
+            with metrics.timer('stage_duration_seconds', STAGE_HELP, stage='catalog_sample'):
+                if paginate:
+                    pool = catalog.lookup(emotion)
+                    if not cursor:
+                        seed, offset, size = new_seed(), 0, len(pool)
+                    indices = permuted_page(pool, seed, offset, n, size)
+                    offset += len(indices)
+                    page = {
+                        'next_cursor': encode_cursor(emotion, seed, offset, size) if offset < min(size, len(pool)) else None,
+                        'offset': offset - len(indices),
+                        'total': size
                     }
-                }
-                recommendations.append(rec)
+                    if user is not None:
+                        # Filtre kapasitesini (max_items) aşan sayfalar geçmişe yazılmaz
+                        session_history.add(user, indices)
+                else:
+                    # Rastgele n öneri seç (yedek duygu grupları önceden çözüldü)
+                    use_pool = sampled_pool and n == 5 and user is None and mix is None
+                    indices = sampled_pool.take(emotion) if use_pool else None
+                    if indices is None:
+                        indices = select_recommendations(emotion, n, user, mix, mix_mode)
+            with metrics.timer('stage_duration_seconds', STAGE_HELP, stage='serialization'):
+                recommendations, stats = catalog.records(indices, return_stats=True)
 
         except Exception as e:
-            print(f"Dataset okuma hatası: {e}")
+            print(f"Katalog okuma hatası: {e}")
+            record_error(e)
             recommendations = [
                 {
                     'title': 'Happy Song',
@@ -102,53 +439,302 @@ def get_recommendations():
                 }
             ]
 
-        # İstatistikler
+        # İstatistikler (ortalamalar katalog dilimlerinden tek geçişte hesaplandı)
+        if stats is None:
+            stats = {
+                'avg_danceability': round(sum(r['features']['danceability'] for r in recommendations) / len(recommendations), 3),
+                'avg_energy': round(sum(r['features']['energy'] for r in recommendations) / len(recommendations), 3)
+            }
         stats = {
             'total_recommendations': len(recommendations),
             'emotion': emotion,
-            'avg_danceability': round(sum(r['features']['danceability'] for r in recommendations) / len(recommendations), 3),
-            'avg_energy': round(sum(r['features']['energy'] for r in recommendations) / len(recommendations), 3),
-            'model_info': classifier.get_model_info() if classifier else {}
+            **stats,
+            'model_info': cached_model_info()
         }
 
         # Duygu açıklaması
-        emotion_descriptions = {
-            'happy': 'Neşeli ve enerjik müzik önerileri',
-            'sad': 'Hüzünlü ve duygusal müzik önerileri',
-            'angry': 'Sert ve enerjik müzik önerileri',
-            'calm': 'Sakin ve rahatlatıcı müzik önerileri',
-            'energetic': 'Hareketli ve motive edici müzik önerileri',
-            'romantic': 'Romantik ve duygusal müzik önerileri',
-            'neutral': 'Dengeli ve orta tempolu müzik önerileri'
-        }
+        fragment = emotion_fragment(emotion)
 
         response = {
             'recommendations': recommendations,
             'stats': stats,
-            'description': emotion_descriptions.get(emotion.lower(), 'Müzik önerileri'),
+            'description': fragment['description'],
             'emotion_analysis': {
                 'detected_emotion': emotion,
-                'confidence': 'high',  # Basitleştirilmiş
-                'mood_description': emotion_descriptions.get(emotion.lower(), '')
+                **analysis,
+                'mood_description': fragment['mood_description']
             }
         }
+        if page is not None:
+            response['page'] = page
+        if mix is not None:
+            response['mix'] = {'weights': {e: round(w, 4) for e, w in mix.items()}, 'mode': mix_mode}
+
+        with metrics.timer('stage_duration_seconds', STAGE_HELP, stage='json_encode'):
+            return jsonify(response)
+
+    except Exception as e:
+        record_error(e)
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/recommendations/similar', methods=['POST'])
+def get_similar_recommendations():
+    """Ses özelliklerine veya bir şarkıya benzer müzik önerileri"""
+    try:
+        data = request.get_json() or {}
+
+        if not recommender:
+            return jsonify({'error': 'Model not loaded'}), 500
+
+        k = min(int(data.get('k', 5)), 100)
+        try:
+            recommendations = recommender.recommend_similar(
+                features=data.get('features'),
+                song_id=data.get('song_id'),
+                k=k
+            )
+        except (KeyError, ValueError, TypeError) as e:
+            return jsonify({'error': f'Geçersiz sorgu: {e}'}), 400
+
+        return jsonify({'recommendations': recommendations, 'k': k})
+
+    except Exception as e:
+        record_error(e)
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/predict/batch', methods=['POST'])
+def predict_batch():
+    """Toplu duygu tahmini (satır listesi veya özellik sözlükleri)"""
+    try:
+        data = request.get_json() or {}
+
+        if not classifier:
+            return jsonify({'error': 'Model not loaded'}), 500
+
+        rows = data.get('features') or []
+        if len(rows) > MAX_BATCH_ROWS:
+            return jsonify({'error': f'En fazla {MAX_BATCH_ROWS} satır gönderilebilir'}), 400
+
+        try:
+            if rows and isinstance(rows[0], dict):
+                rows = [[row[col] for col in FEATURE_COLUMNS] for row in rows]
+            matrix = np.asarray(rows, dtype=np.float64).reshape(len(rows), -1)
+        except (KeyError, ValueError, TypeError) as e:
+            return jsonify({'error': f'Geçersiz özellikler: {e}'}), 400
+
+        if len(matrix) == 0:
+            return jsonify({'emotions': [], 'confidence': [], 'count': 0})
+        finite = np.isfinite(matrix).all(axis=1)
+        if not finite.all():
+            return jsonify({'error': f'Satır {int(finite.argmin())}: özellikler sonlu olmalı'}), 400
+
+        try:
+            emotions, proba, classes = classifier.predict_emotions(matrix, return_proba=True)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        response = {
+            'emotions': emotions,
+            'confidence': np.round(proba.max(axis=1), 4).tolist(),
+            'count': len(emotions)
+        }
+        if data.get('probabilities'):
+            response['probabilities'] = {
+                emotion: np.round(proba[:, i], 4).tolist() for i, emotion in enumerate(classes)
+            }
 
         return jsonify(response)
 
     except Exception as e:
+        record_error(e)
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/predict/stream', methods=['POST'])
+def predict_stream():
+    """CSV veya NDJSON yüklemeyi partiler halinde sınıflandır, sonuçları NDJSON olarak akıt"""
+    current = classifier
+    if not current:
+        return jsonify({'error': 'Model not loaded'}), 500
+
+    fmt = request.args.get('format') or ('csv' if 'csv' in (request.content_type or '') else 'ndjson')
+    if fmt not in ('csv', 'ndjson'):
+        return jsonify({'error': "format 'csv' veya 'ndjson' olmalı"}), 400
+
+    from upload_classifier import classify_stream
+
+    # Gövde okunurken yanıt üretilir: bellek kullanımı parti boyutuyla sınırlı
+    return Response(stream_with_context(classify_stream(current, request.stream, fmt)),
+                    mimetype='application/x-ndjson')
+
+@app.route('/api/cache/stats')
+def cache_stats():
+    """Önbellek ve öneri havuzu isabet/ıska sayaçları"""
+    return jsonify({
+        'response_cache': response_cache.stats(),
+        'sampled_pool': sampled_pool.stats() if sampled_pool else None,
+        'session_history': session_history.stats() if session_history is not None else None,
+        'micro_batch': micro_batcher.stats() if micro_batcher is not None else None
+    })
+
+@app.route('/api/stats')
+def catalog_stats():
+    """Duygu başına sayı, özellik ortalaması/varyansı ve kantiller (yüklemede hesaplanır, artımlı güncellenir)"""
+    if not recommender or recommender.catalog is None:
+        return jsonify({'error': 'Model not loaded'}), 500
+    snapshot = recommender.catalog.stats.snapshot()
+    emotion = request.args.get('emotion')
+    if emotion is None:
+        return jsonify(snapshot)
+    entry = snapshot['emotions'].get(emotion.lower())
+    if entry is None:
+        return jsonify({'error': f'Bilinmeyen duygu: {emotion}'}), 404
+    return jsonify({'emotion': emotion.lower(), 'version': snapshot['version'], **entry})
+
+@app.route('/api/metrics')
+def prometheus_metrics():
+    """Prometheus metin formatında metrikler"""
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/profile')
+def sampling_profile():
+    """Örneklemeli profil (flamegraph collapsed formatı); ENABLE_PROFILER=1 gerekir"""
+    if not ENABLE_PROFILER:
+        return jsonify({'error': 'Profiler kapalı (ENABLE_PROFILER=1)'}), 404
+    seconds = min(float(request.args.get('seconds', 10)), 60)
+    interval = max(float(request.args.get('interval', 0.005)), 0.001)
+    return Response(SamplingProfiler(interval).profile(seconds), mimetype='text/plain')
+
+def admin_error():
+    """Yönetim uç noktası erişim kontrolü; izin yoksa hata yanıtı döndürür"""
+    if not ADMIN_TOKEN:
+        return jsonify({'error': 'Yönetim uç noktaları kapalı (ADMIN_TOKEN)'}), 404
+    if request.headers.get('X-Admin-Token') != ADMIN_TOKEN:
+        return jsonify({'error': 'Yetkisiz'}), 403
+    if not model_reloader or not recommender:
+        return jsonify({'error': 'Model not loaded'}), 500
+    return None
+
+@app.route('/api/catalog/tracks', methods=['POST'])
+def ingest_tracks():
+    """Kataloğa şarkı ekle/güncelle (tek nesne veya {'tracks': [...]}, ?mode=upsert|append)"""
+    error = admin_error()
+    if error:
+        return error
+    try:
+        data = request.get_json(silent=True)
+        tracks = data.get('tracks', [data]) if isinstance(data, dict) else data
+        if not isinstance(tracks, list) or not tracks:
+            return jsonify({'error': 'Şarkı listesi gerekli'}), 400
+        if len(tracks) > MAX_BATCH_ROWS:
+            return jsonify({'error': f'En fazla {MAX_BATCH_ROWS} şarkı gönderilebilir, NDJSON yüklemeyi kullanın'}), 400
+        try:
+            result = recommender.ingest(tracks, mode=request.args.get('mode', 'upsert'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return jsonify(result)
+
+    except Exception as e:
+        record_error(e)
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/catalog/tracks/bulk', methods=['POST'])
+def ingest_tracks_bulk():
+    """NDJSON toplu yükleme: gövde akış olarak okunur, partiler halinde günlüğe yazılır"""
+    error = admin_error()
+    if error:
+        return error
+    mode = request.args.get('mode', 'upsert')
+    totals = {'appended': 0, 'updated': 0, 'batches': 0}
+
+    def flush(batch):
+        result = recommender.ingest(batch, mode=mode)
+        totals['appended'] += result['appended']
+        totals['updated'] += result['updated']
+        totals['batches'] += 1
+        totals['seq'] = result['seq']
+
+    try:
+        batch = []
+        for line_no, line in enumerate(request.stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                batch.append(json.loads(line))
+            except ValueError as e:
+                return jsonify({'error': f'Satır {line_no}: geçersiz JSON ({e})', **totals}), 400
+            if len(batch) >= INGEST_BATCH_ROWS:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+    except ValueError as e:
+        # Önceki partiler işlendi; hata yanıtı ilerlemeyi de bildirir
+        return jsonify({'error': str(e), **totals}), 400
+    except Exception as e:
+        record_error(e)
+        return jsonify({'error': str(e), **totals}), 500
+
+    return jsonify({**totals, 'size': len(recommender.catalog)})
+
+@app.route('/api/admin/catalog/compact', methods=['POST'])
+def admin_catalog_compact():
+    """Katalog günlüğünü ikili kataloğa sıkıştır"""
+    error = admin_error()
+    if error:
+        return error
+    compacted = recommender.compact(force=True)
+    return jsonify({'compacted': compacted, 'size': len(recommender.catalog),
+                    'pending_tracks': recommender.log.pending_tracks})
+
+@app.route('/api/admin/model')
+def admin_model_status():
+    """Servisteki ve önceki model sürümü, son yeniden yükleme sonucu"""
+    error = admin_error()
+    if error:
+        return error
+    return jsonify(model_reloader.stats())
+
+@app.route('/api/admin/model/reload', methods=['POST'])
+def admin_model_reload():
+    """Artifact'ı yeniden yükle, doğrula ve servise al"""
+    error = admin_error()
+    if error:
+        return error
+    data = request.get_json(silent=True) or {}
+    result = model_reloader.reload(force=bool(data.get('force')))
+    return jsonify(result), 409 if result['status'] in ('failed', 'rejected') else 200
+
+@app.route('/api/admin/model/rollback', methods=['POST'])
+def admin_model_rollback():
+    """Önceki modele geri dön"""
+    error = admin_error()
+    if error:
+        return error
+    result = model_reloader.rollback()
+    return jsonify(result), 409 if result['status'] == 'failed' else 200
+
 @app.route('/api/health')
 def health():
     """Sağlık kontrolü"""
     return jsonify({'status': 'ok'})
 
+@app.route('/api/ready')
+def ready():
+    """Hazırlık yoklaması: modeller yüklendiyse 200, ısınma sürüyorsa veya başarısızsa 503"""
+    body = {'status': readiness['status'], 'timings': readiness['timings']}
+    if readiness['error']:
+        body['error'] = readiness['error']
+    return jsonify(body), 200 if readiness['status'] == 'ready' else 503
+
 if __name__ == '__main__':
-    # Modelleri başlat
-    if init_models():
+    # Modelleri başlat (BACKGROUND_WARMUP=1 ise arka planda)
+    if BACKGROUND_WARMUP:
+        start_warmup()
+        print("🚀 Flask API sunucusu başlatılıyor (modeller arka planda yükleniyor, durum: /api/ready)...")
+    elif init_models():
         print("🚀 Flask API sunucusu başlatılıyor...")
-        print("📱 API: http://localhost:5000")
-        app.run(debug=True, host='0.0.0.0', port=5000)
     else:
         print("❌ Modeller yüklenemedi, çıkış yapılıyor...")
-        exit(1)
\ No newline at end of file
+        exit(1)
+    print("📱 API: http://localhost:5000")
+    app.run(debug=True, host='0.0.0.0', port=5000)
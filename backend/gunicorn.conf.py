@@ -0,0 +1,21 @@
+"""
+Gunicorn ayarları - çok işçili, önceden yüklemeli üretim sunucusu
+"""
+
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('WEB_WORKERS', os.cpu_count() or 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('WEB_THREADS', 8))
+preload_app = True
+timeout = 60
+keepalive = 5
+accesslog = os.environ.get('ACCESS_LOG')
+
+
+def post_fork(server, worker):
+    """Fork sonrası süreç başına durumu yenile"""
+    import flask_app
+
+    flask_app.after_fork()
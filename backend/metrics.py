@@ -0,0 +1,195 @@
+"""
+Metrikler - Düşük maliyetli histogramlar, sayaçlar ve Prometheus metin formatı
+"""
+
+import sys
+import time
+import bisect
+import threading
+from collections import Counter as _StackCounter
+
+# Saniye cinsinden gecikme kovaları (50 µs .. 10 sn)
+DEFAULT_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=None):
+    items = list(labels) + (list(extra) if extra else [])
+    if not items:
+        return ''
+    body = ','.join(f'{k}="{_escape(v)}"' for k, v in items)
+    return '{' + body + '}'
+
+
+class Histogram:
+    """Sabit kovalı histogram; observe() tek bisect + kilit"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def render(self, name, labels):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'{name}_bucket{_format_labels(labels, [("le", le)])} {cumulative}')
+        lines.append(f'{name}_sum{_format_labels(labels)} {self.sum}')
+        lines.append(f'{name}_count{_format_labels(labels)} {self.count}')
+        return lines
+
+
+class MetricsRegistry:
+    """Etiketli sayaç, gösterge ve histogramların kaydı"""
+
+    def __init__(self, prefix='music'):
+        self.prefix = prefix
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+        self._help = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _name(self, name, help_text, kind):
+        full = f'{self.prefix}_{name}'
+        if full not in self._help:
+            self._help[full] = (help_text or name, kind)
+        return full
+
+    def inc(self, name, value=1, help_text=None, **labels):
+        key = (self._name(name, help_text, 'counter'), tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name, value, help_text=None, **labels):
+        key = (self._name(name, help_text, 'gauge'), tuple(sorted(labels.items())))
+        self._gauges[key] = value
+
+    def observe(self, name, value, help_text=None, **labels):
+        key = (self._name(name, help_text, 'histogram'), tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram())
+        histogram.observe(value)
+
+    def timer(self, name, help_text=None, **labels):
+        """with metrics.timer('stage_duration_seconds', stage='x'): ..."""
+        return _Timer(self, name, help_text, labels)
+
+    def add_collector(self, collector):
+        """Render sırasında çağrılır; (ad, tür, yardım, [(etiketler, değer)]) listesi döndürür"""
+        self._collectors.append(collector)
+
+    def render_prometheus(self):
+        """Tüm metrikleri Prometheus metin formatında döndür"""
+        families = {}
+        for (name, labels), value in list(self._counters.items()) + list(self._gauges.items()):
+            families.setdefault(name, []).append(f'{name}{_format_labels(labels)} {value}')
+        for (name, labels), histogram in list(self._histograms.items()):
+            families.setdefault(name, []).extend(histogram.render(name, labels))
+
+        for collector in self._collectors:
+            for name, kind, help_text, samples in collector():
+                full = self._name(name, help_text, kind)
+                families.setdefault(full, []).extend(
+                    f'{full}{_format_labels(sorted(labels.items()))} {value}' for labels, value in samples
+                )
+
+        lines = []
+        for name in sorted(families):
+            help_text, kind = self._help[name]
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            lines.extend(families[name])
+        return '\n'.join(lines) + '\n'
+
+
+class _Timer:
+    __slots__ = ('registry', 'name', 'help_text', 'labels', 'start')
+
+    def __init__(self, registry, name, help_text, labels):
+        self.registry = registry
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.observe(self.name, time.perf_counter() - self.start, self.help_text, **self.labels)
+        return False
+
+
+class SamplingProfiler:
+    """İş parçacığı yığınlarını periyodik örnekleyen profilleyici; çıktı flamegraph 'collapsed' formatı"""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.stacks = _StackCounter()
+        self.samples = 0
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f'{code.co_name} ({code.co_filename.rsplit("/", 1)[-1]}:{code.co_firstlineno})')
+                    frame = frame.f_back
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self):
+        """flamegraph.pl / speedscope ile açılabilen 'yığın sayı' satırları"""
+        return '\n'.join(f'{stack} {count}' for stack, count in self.stacks.most_common()) + '\n'
+
+    def profile(self, seconds):
+        """Verilen süre boyunca örnekle ve collapsed çıktıyı döndür"""
+        self.start()
+        time.sleep(seconds)
+        self.stop()
+        return self.collapsed()
+
+
+# Süreç genelinde paylaşılan kayıt
+metrics = MetricsRegistry()
+
+# stage_duration_seconds histogramının açıklaması (tüm modüller aynı metni kullanır)
+STAGE_HELP = 'Sıcak yol aşama süreleri'
@@ -0,0 +1,131 @@
+"""
+Mikro Toplama (micro-batching) - Eşzamanlı tek satırlık tahmin isteklerini tek vektörize çağrıda birleştirir
+
+İstekler kuyruğa girer; arka plan iş parçacığı ilk istekten sonra en fazla max_wait_ms
+bekleyerek en fazla max_batch satır toplar, tahmin fonksiyonunu bir kez çağırır ve
+sonuçları bekleyen isteklere dağıtır. Önceki parti çalışırken gelen istekler de bir
+sonraki partide birikir; max_wait_ms=0 yalnızca bu fırsatçı toplamayı kullanır.
+"""
+
+import os
+import time
+import threading
+from collections import deque
+
+import numpy as np
+
+# Bir isteğin partisini bekleme üst sınırı (sn); aşılırsa satır doğrudan tahmin edilir
+SUBMIT_TIMEOUT = 5.0
+
+
+class _Pending:
+    """Kuyruktaki tek istek: satır, sonuç veya hata"""
+
+    __slots__ = ('row', 'done', 'result', 'error')
+
+    def __init__(self, row):
+        self.row = row
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatcher:
+    """predict((n, d) matris) -> n sonuçluk liste fonksiyonunun önünde toplama katmanı"""
+
+    def __init__(self, predict, max_batch=64, max_wait_ms=1.0, timeout=SUBMIT_TIMEOUT):
+        self.predict = predict
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000
+        self.timeout = timeout
+        self.batches = 0
+        self.items = 0
+        self.errors = 0
+        self.timeouts = 0
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._start()
+
+    def _start(self):
+        """Kuyruk ve iş parçacığını (fork sonrası yeniden) oluştur"""
+        self._queue = deque()
+        self._ready = threading.Condition()
+        self._thread = threading.Thread(target=self._run, args=(self._queue, self._ready),
+                                        name='micro-batch', daemon=True)
+        self._thread.start()
+        self._pid = os.getpid()
+
+    def _ensure_started(self):
+        """İş parçacıkları fork'tan sağ çıkmaz: süreçte ilk istek kuyruğu bir kez yeniden kurar"""
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid != os.getpid():
+                self._start()
+
+    def submit(self, row):
+        """Tek satırı kuyruğa ekle ve partisi işlenince sonucunu döndür (hata partideki tüm isteklere yayılır)
+
+        Sonuç timeout saniye içinde gelmezse satır doğrudan (toplamadan) tahmin edilir.
+        """
+        self._ensure_started()
+        pending = _Pending(row)
+        queue, ready = self._queue, self._ready
+        with ready:
+            queue.append(pending)
+            ready.notify()
+        if not pending.done.wait(self.timeout):
+            # Kuyrukta kaldıysa boşaltan iş parçacığı yok/takılı: doğrudan tahmin edilir
+            with ready:
+                try:
+                    queue.remove(pending)
+                    queued = True
+                except ValueError:
+                    queued = False
+            if queued or not pending.done.wait(self.timeout):
+                self.timeouts += 1
+                return self.predict(np.asarray(row).reshape(1, -1))[0]
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def _collect(self, queue, ready):
+        """İlk isteği bekle; parti dolana veya süre bitene kadar topla"""
+        with ready:
+            while not queue:
+                ready.wait()
+            deadline = time.perf_counter() + self.max_wait
+            while len(queue) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                ready.wait(remaining)
+            return [queue.popleft() for _ in range(min(self.max_batch, len(queue)))]
+
+    def _run(self, queue, ready):
+        while True:
+            batch = self._collect(queue, ready)
+            try:
+                results = self.predict(np.vstack([p.row for p in batch]))
+                for pending, result in zip(batch, results):
+                    pending.result = result
+            except Exception as e:
+                self.errors += 1
+                for pending in batch:
+                    pending.error = e
+            self.batches += 1
+            self.items += len(batch)
+            for pending in batch:
+                pending.done.set()
+
+    def stats(self):
+        return {
+            'max_batch': self.max_batch,
+            'max_wait_ms': self.max_wait * 1000,
+            'batches': self.batches,
+            'items': self.items,
+            'errors': self.errors,
+            'timeouts': self.timeouts,
+            'mean_batch_size': round(self.items / self.batches, 2) if self.batches else 0.0,
+            'queued': len(self._queue)
+        }
@@ -4,43 +4,281 @@ Gelişmiş Duygu Sınıflandırma Modeli
 
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split, cross_val_score
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+from sklearn.model_selection import train_test_split, StratifiedKFold
+from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier, HistGradientBoostingClassifier
+from sklearn.neural_network import MLPClassifier
+from sklearn.base import clone
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 from sklearn.pipeline import Pipeline
 import joblib
+import hashlib
+import json
+import time
 import os
+import resource
+import threading
+import tracemalloc
+import contextlib
+from contextlib import contextmanager
+from tree_engine import CompiledTreeEnsemble
+from catalog_format import MappedCatalog, resolve_catalog_path
+from catalog_log import CatalogLog, apply_entry, log_path_for
+from catalog_store import CatalogStore
+from metrics import metrics, STAGE_HELP
+from streaming_training import train_streaming
+
+# Model artifact formatı değiştiğinde artırılır
+MODEL_VERSION = 2
+
+BASE_FEATURES = [
+    'danceability', 'energy', 'valence', 'tempo', 'acousticness',
+    'instrumentalness', 'liveness', 'speechiness'
+]
+
+ADVANCED_FEATURES = BASE_FEATURES + [
+    'energy_valence_ratio', 'tempo_energy', 'acoustic_dance'
+]
+
+EMOTION_MAPPING = {
+    'happy': 0,
+    'sad': 1,
+    'angry': 2,
+    'calm': 3,
+    'energetic': 4,
+    'romantic': 5,
+    'neutral': 6
+}
+
+EMOTION_MAPPING_REVERSE = {code: emotion for emotion, code in EMOTION_MAPPING.items()}
+
+# Bu satır sayısına kadar derlenmiş motor, üstünde scikit-learn'ün Cython yolu daha hızlı
+ENGINE_MAX_ROWS = 64
+
+# Gelişmiş model eğitim ayarları (değişirse model yeniden eğitilir)
+TRAINING_CONFIG = {
+    # 'auto': küçük veride GradientBoosting, büyük veride histogram tabanlı boosting
+    'estimator': os.environ.get('TRAINING_ESTIMATOR', 'auto'),
+    'hist_min_rows': 100_000,
+    'n_estimators': 200,
+    'learning_rate': 0.1,
+    'max_depth': 6,
+    'random_state': 42,
+    'test_size': 0.2,
+    # Erken durdurma: doğrulama skoru bu kadar iterasyon iyileşmezse dur
+    'n_iter_no_change': 10,
+    'validation_fraction': 0.1,
+    'cv_folds': 5,
+    'features': ADVANCED_FEATURES
+}
+
+# Akışlı (out-of-core) eğitim ayarları: belleğe sığmayan kataloglar için
+STREAMING_CONFIG = {
+    # '1': her zaman, '0': hiçbir zaman, 'auto': katalog dosyası stream_min_bytes'tan büyükse
+    'mode': os.environ.get('TRAINING_STREAMING', 'auto'),
+    'stream_min_bytes': int(os.environ.get('TRAINING_STREAMING_BYTES', 1 << 30)),
+    'stream_chunk_rows': int(os.environ.get('TRAINING_CHUNK_ROWS', 250_000)),
+    'stream_holdout_rows': 50_000,
+    'stream_holdout_fraction': 0.05,
+    'stream_epochs': 5,
+    'stream_tol': 1e-3,
+    'stream_hidden_layers': (64,),
+    'stream_batch_size': 512,
+    'random_state': TRAINING_CONFIG['random_state']
+}
+
+# Artifact'ta saklanan test bölümü satır sayısı (model değişiminde doğrulama seti)
+HOLDOUT_ROWS = 2000
+
+# Paralel CV süreç sayısı (-1: tüm çekirdekler)
+CV_JOBS = int(os.environ.get('TRAINING_JOBS', -1))
+
+# Eğitim aşamalarında Python tahsis tepesini tracemalloc ile de ölç (TRAINING_TRACE_MEMORY=1).
+# İzleme tüm süreci yavaşlatır (arka plan eğitiminde servis iş parçacıkları dahil); varsayılan kapalı
+TRACE_MEMORY = os.environ.get('TRAINING_TRACE_MEMORY') == '1'
+
+# Bu sürecin yazdığı artifact'lar (mutlak yol -> mtime): izleyici kendi yazdığını yeniden yüklemez
+_own_artifacts = {}
+
+
+def written_by_this_process(path, mtime):
+    """Artifact'ın bu mtime'lı hali bu süreçte save_model ile mi yazıldı"""
+    return mtime is not None and _own_artifacts.get(os.path.abspath(path)) == mtime
+
+
+def meta_path_for(model_path):
+    """Artifact'ın özet yan dosyası (sürüm/veri/ayar özetleri; modeli açmadan okunur)"""
+    return os.path.splitext(model_path)[0] + '.meta.json'
+
+
+# Aynı anda açık aşamalar izlemeyi birbirinin elinden kapatmasın
+_trace_lock = threading.Lock()
+_trace_users = 0
+
+
+def _peak_rss_bytes():
+    """Sürecin şimdiye kadarki tepe RSS'i (Linux'ta ru_maxrss KB cinsindendir)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+@contextmanager
+def _traced_memory():
+    """tracemalloc'u başvuru sayımıyla aç/kapat; tepe değeri çıkışta verilen sözlüğe yazılır"""
+    global _trace_users
+    with _trace_lock:
+        if _trace_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _trace_users += 1
+        tracemalloc.reset_peak()
+    peak = {}
+    try:
+        yield peak
+    finally:
+        with _trace_lock:
+            peak['bytes'] = tracemalloc.get_traced_memory()[1]
+            _trace_users -= 1
+            if _trace_users == 0:
+                tracemalloc.stop()
+
+
+def build_pipeline(n_rows):
+    """Eğitim ayarlarına göre scaler + boosting pipeline'ı oluştur"""
+    config = TRAINING_CONFIG
+    estimator = config['estimator']
+    if estimator == 'auto':
+        estimator = 'hist_gradient_boosting' if n_rows >= config['hist_min_rows'] else 'gradient_boosting'
+
+    if estimator == 'hist_gradient_boosting':
+        classifier = HistGradientBoostingClassifier(
+            max_iter=config['n_estimators'],
+            learning_rate=config['learning_rate'],
+            max_depth=config['max_depth'],
+            early_stopping=True,
+            n_iter_no_change=config['n_iter_no_change'],
+            validation_fraction=config['validation_fraction'],
+            random_state=config['random_state']
+        )
+    else:
+        classifier = GradientBoostingClassifier(
+            n_estimators=config['n_estimators'],
+            learning_rate=config['learning_rate'],
+            max_depth=config['max_depth'],
+            n_iter_no_change=config['n_iter_no_change'],
+            validation_fraction=config['validation_fraction'],
+            random_state=config['random_state']
+        )
+
+    return Pipeline([
+        ('scaler', StandardScaler()),
+        ('classifier', classifier)
+    ])
+
+
+def _fit_and_score(model, X, y, train_idx, test_idx, return_model=False):
+    """Süreç havuzunda çalışır: bir katmanı eğit, doğruluğu ve işçinin tepe belleğini döndür"""
+    start = time.perf_counter()
+    model.fit(X.iloc[train_idx], y.iloc[train_idx])
+    y_pred = model.predict(X.iloc[test_idx])
+    return {
+        'accuracy': accuracy_score(y.iloc[test_idx], y_pred),
+        'y_pred': y_pred if return_model else None,
+        'model': model if return_model else None,
+        'seconds': time.perf_counter() - start,
+        # Linux'ta ru_maxrss KB cinsindendir
+        'peak_rss_bytes': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    }
+
+
+def sample_holdout(matrix, labels, n_rows=HOLDOUT_ROWS, seed=0):
+    """Eğitimde kullanılmayan satırlardan sabit tohumlu örnek: ((n, 8) ham özellik matrisi, duygu etiketleri)"""
+    if len(labels) == 0:
+        return None
+    indices = np.sort(np.random.default_rng(seed).choice(len(labels), min(n_rows, len(labels)), replace=False))
+    return np.asarray(matrix, dtype=np.float64)[indices], np.asarray(labels, dtype=str)[indices]
+
+
+def extend_features(matrix, dtype=np.float64):
+    """Ham özellik matrisine (n, 8) türetilmiş sütunları vektörize olarak ekle"""
+    matrix = np.asarray(matrix, dtype=dtype)
+    if matrix.ndim != 2 or matrix.shape[1] != len(BASE_FEATURES):
+        raise ValueError(f"Özellik matrisi (n, {len(BASE_FEATURES)}) boyutunda olmalı")
+
+    danceability, energy, valence, tempo, acousticness = matrix[:, :5].T
+    derived = np.column_stack([
+        energy / (valence + dtype(0.001)),  # energy_valence_ratio
+        tempo * energy,  # tempo_energy
+        acousticness * danceability  # acoustic_dance
+    ])
+    return np.hstack([matrix, derived])
+
 
 class EmotionClassifier:
     def __init__(self):
         self.model = None
+        self.engine = None
         self.scaler = None
         self.df = None
+        self.features = ADVANCED_FEATURES
+        self.data_info = {}
+        self._df_info = None
+        self._data_info_key = None
+        self.training_report = []
+        self.model_version = None
+        self.holdout = None
+        self.data_path = '../data/music_emotion.csv'
         self.model_path = 'models/emotion_classifier.pkl'
         self.scaler_path = 'models/scaler.pkl'
 
+    def data_hash(self):
+        """Eğitim verisinin SHA-256 özeti"""
+        digest = hashlib.sha256()
+        with open(resolve_catalog_path(self.data_path), 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def config_hash(self):
+        """Eğitim ayarlarının özeti (akışlı eğitim ayarları ve seçilen eğitim yolu dahil)"""
+        payload = json.dumps({
+            'version': MODEL_VERSION, **TRAINING_CONFIG,
+            'streaming': self.use_streaming(), 'streaming_config': STREAMING_CONFIG
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
     def prepare_data(self):
         """Veriyi hazırla ve ön işleme yap"""
         try:
-            self.df = pd.read_csv('../data/music_emotion.csv')
+            path = resolve_catalog_path(self.data_path)
+            base_seq = 0
+            if path != self.data_path:
+                # İkili katalog: metin ayrıştırması yok
+                mapped = MappedCatalog(path)
+                base_seq = mapped.metadata.get('log_seq', 0)
+                self.df = mapped.to_dataframe()
+            else:
+                self.df = pd.read_csv(path)
+
+            # Henüz sıkıştırılmamış artımlı eklemeler de eğitime girer
+            entries = CatalogLog(log_path_for(self.data_path), applied_seq=base_seq).sync()
+            if entries:
+                store = CatalogStore(self.df)
+                for entry in entries:
+                    apply_entry(store, entry)
+                self.df = store.to_dataframe()
 
             # Ek özellikler hesapla
             self.df['energy_valence_ratio'] = self.df['energy'] / (self.df['valence'] + 0.001)
             self.df['tempo_energy'] = self.df['tempo'] * self.df['energy']
             self.df['acoustic_dance'] = self.df['acousticness'] * self.df['danceability']
 
-            # Duygu mapping'i genişlet
-            emotion_mapping = {
-                'happy': 0,
-                'sad': 1,
-                'angry': 2,
-                'calm': 3,
-                'energetic': 4,
-                'romantic': 5,
-                'neutral': 6
-            }
-            self.df['emotion_encoded'] = self.df['emotion'].map(emotion_mapping)
+            # Duygu mapping'i genişlet; bilinmeyen etiketli satırlar (ör. eski günlük kayıtları) atılır
+            self.df['emotion'] = self.df['emotion'].astype(str).str.lower()
+            self.df['emotion_encoded'] = self.df['emotion'].map(EMOTION_MAPPING)
+            unknown = self.df['emotion_encoded'].isna()
+            if unknown.any():
+                print(f"⚠️ Bilinmeyen duygu etiketli {int(unknown.sum())} satır eğitimden çıkarıldı")
+                self.df = self.df[~unknown].reset_index(drop=True)
+            self.df['emotion_encoded'] = self.df['emotion_encoded'].astype(np.int64)
 
             print(f"✅ Veri hazırlandı: {len(self.df)} şarkı, {len(self.df.columns)} özellik")
             print(f"   Duygu dağılımı: {self.df['emotion'].value_counts().to_dict()}")
@@ -49,57 +287,137 @@ class EmotionClassifier:
             print(f"❌ Veri hazırlama hatası: {e}")
             self.df = pd.DataFrame()
 
+    @contextmanager
+    def training_stage(self, name):
+        """Eğitim aşamasının süresini ve ana süreçteki tepe RSS artışını kaydet (TRACE_MEMORY ile Python tepesi de)"""
+        rss_before = _peak_rss_bytes()
+        start = time.perf_counter()
+        entry = {'stage': name}
+        with contextlib.ExitStack() as stack:
+            traced = stack.enter_context(_traced_memory()) if TRACE_MEMORY else None
+            try:
+                yield entry
+            finally:
+                entry['seconds'] = round(time.perf_counter() - start, 3)
+                stack.close()
+                peak_rss = _peak_rss_bytes()
+                entry['peak_rss_bytes'] = peak_rss
+                entry['rss_growth_bytes'] = peak_rss - rss_before
+                if traced is not None:
+                    entry['peak_bytes'] = traced['bytes']
+                    metrics.set_gauge('training_stage_peak_bytes', entry['peak_bytes'],
+                                      'Eğitim aşaması Python tahsis tepesi (tracemalloc)', stage=name)
+                self.training_report.append(entry)
+                metrics.set_gauge('training_stage_seconds', entry['seconds'], 'Eğitim aşaması süresi', stage=name)
+                metrics.set_gauge('training_stage_rss_growth_bytes', entry['rss_growth_bytes'],
+                                  'Eğitim aşamasında ana sürecin tepe RSS artışı', stage=name)
+
+    def print_training_report(self):
+        """Aşama başına süre ve tepe bellek tablosunu yazdır"""
+        print("⏱️ Eğitim aşamaları:")
+        for entry in self.training_report:
+            line = (f"   {entry['stage']:<16} {entry['seconds']:>8.3f} sn  "
+                    f"tepe RSS +{entry['rss_growth_bytes'] / 1e6:>7.1f} MB")
+            if 'peak_bytes' in entry:
+                line += f"  (Python tepe {entry['peak_bytes'] / 1e6:.1f} MB)"
+            if 'worker_peak_rss_bytes' in entry:
+                line += f"  (işçi tepe RSS {entry['worker_peak_rss_bytes'] / 1e6:.1f} MB)"
+            print(line)
+
     def train_advanced_model(self):
-        """Gelişmiş model eğitimi"""
+        """Gelişmiş model eğitimi: ana model ve CV katmanları süreç havuzunda paralel"""
         if self.df is None or len(self.df) == 0:
             print("❌ Veri yok, model eğitilemiyor")
             return
 
         # Özellikler
-        features = [
-            'danceability', 'energy', 'valence', 'tempo', 'acousticness',
-            'instrumentalness', 'liveness', 'speechiness',
-            'energy_valence_ratio', 'tempo_energy', 'acoustic_dance'
-        ]
+        features = TRAINING_CONFIG['features']
 
         X = self.df[features]
         y = self.df['emotion_encoded']
 
         # Eğitim/test böl
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.2, random_state=42, stratify=y
+        train_idx, test_idx = train_test_split(
+            np.arange(len(X)), test_size=TRAINING_CONFIG['test_size'],
+            random_state=TRAINING_CONFIG['random_state'], stratify=y
         )
 
         # Pipeline oluştur
-        self.model = Pipeline([
-            ('scaler', StandardScaler()),
-            ('classifier', GradientBoostingClassifier(
-                n_estimators=200,
-                learning_rate=0.1,
-                max_depth=6,
-                random_state=42
-            ))
-        ])
-
-        # Model eğitimi
-        self.model.fit(X_train, y_train)
-
-        # Tahmin ve değerlendirme
-        y_pred = self.model.predict(X_test)
-        accuracy = accuracy_score(y_test, y_pred)
-
-        # Cross-validation
-        cv_scores = cross_val_score(self.model, X, y, cv=5)
-
-        print(f"✅ Gelişmiş model eğitildi!")
+        base_model = build_pipeline(len(X))
+        self.features = features
+
+        # Ana model + 5 CV katmanı aynı süreç havuzunda (joblib/loky) eğitilir
+        folds = StratifiedKFold(n_splits=TRAINING_CONFIG['cv_folds']).split(X, y)
+        with self.training_stage('fit_and_cv') as stage:
+            results = joblib.Parallel(n_jobs=CV_JOBS)(
+                [joblib.delayed(_fit_and_score)(clone(base_model), X, y, train_idx, test_idx, True)]
+                + [joblib.delayed(_fit_and_score)(clone(base_model), X, y, tr, te) for tr, te in folds]
+            )
+            stage['worker_peak_rss_bytes'] = max(r['peak_rss_bytes'] for r in results)
+
+        main, cv_results = results[0], results[1:]
+        self.model = main['model']
+        self.holdout = sample_holdout(self.df[BASE_FEATURES].to_numpy()[test_idx],
+                                      self.df['emotion'].to_numpy()[test_idx])
+        accuracy = main['accuracy']
+        y_test, y_pred = y.iloc[test_idx], main['y_pred']
+        cv_scores = np.array([r['accuracy'] for r in cv_results])
+
+        print(f"✅ Gelişmiş model eğitildi! ({type(self.model.steps[-1][1]).__name__})")
         print(f"   Test Doğruluğu: {accuracy:.3f}")
         print(f"   CV Ortalama: {cv_scores.mean():.3f} (+/- {cv_scores.std() * 2:.3f})")
+        print(f"   Ağaç/iterasyon sayısı: {self._n_iterations()} / {TRAINING_CONFIG['n_estimators']} (erken durdurma)")
         print(f"\nSınıflandırma Raporu:\n{classification_report(y_test, y_pred)}")
 
-        # Modeli kaydet
-        os.makedirs('models', exist_ok=True)
-        joblib.dump(self.model, self.model_path)
-        print(f"✅ Model kaydedildi: {self.model_path}")
+        # Hızlı çıkarım motorunu derle ve modeli kaydet
+        with self.training_stage('export_engine'):
+            self.export_engine()
+        with self.training_stage('save_model'):
+            self.save_model()
+
+    def use_streaming(self):
+        """Akışlı eğitim kullanılacak mı (TRAINING_STREAMING veya katalog dosya boyutu)"""
+        mode = STREAMING_CONFIG['mode']
+        if mode in ('0', '1'):
+            return mode == '1'
+        try:
+            return os.path.getsize(resolve_catalog_path(self.data_path)) >= STREAMING_CONFIG['stream_min_bytes']
+        except OSError:
+            return False
+
+    def train_streaming_model(self):
+        """Out-of-core eğitim: katalog parça parça okunur, tepe bellek parça boyutuyla sınırlı"""
+        print(f"⏱️ Akışlı eğitim: {STREAMING_CONFIG['stream_chunk_rows']:,} satırlık parçalar")
+        with self.training_stage('stream_train') as stage:
+            self.model, report = train_streaming(
+                self.data_path, ADVANCED_FEATURES, lambda raw: extend_features(raw, np.float32),
+                STREAMING_CONFIG, EMOTION_MAPPING
+            )
+            stage['holdout_accuracy'] = report['holdout_accuracy']
+        self.features = ADVANCED_FEATURES
+        X_holdout, y_holdout = report['holdout']
+        self.holdout = sample_holdout(X_holdout, [EMOTION_MAPPING_REVERSE[code] for code in y_holdout])
+        self.df = None
+        self.data_info = {
+            'total_songs': report['rows'],
+            'emotion_distribution': {
+                EMOTION_MAPPING_REVERSE[code]: int(count) for code, count in enumerate(report['class_counts']) if count
+            },
+            # Bellek içi yoldaki DataFrame sütun sayısıyla aynı (8 temel + 3 türetilmiş + title/artist)
+            'features_count': len(ADVANCED_FEATURES) + 2
+        }
+        print(f"✅ Akışlı model eğitildi! (MLP, {report['epochs']} epoch)")
+        print(f"   Holdout Doğruluğu: {report['holdout_accuracy']:.3f} ({report['holdout_rows']:,} satır, sınıf başına rezervuar)")
+
+        # MLP için ağaç motoru yok; scikit-learn yolu kullanılır
+        self.engine = None
+        with self.training_stage('save_model'):
+            self.save_model()
+
+    def _n_iterations(self):
+        """Erken durdurma sonrası eğitilen boosting iterasyonu sayısı"""
+        estimator = self.model.steps[-1][1] if hasattr(self.model, 'named_steps') else self.model
+        return getattr(estimator, 'n_estimators_', getattr(estimator, 'n_iter_', None))
 
     def train_random_forest(self):
         """Basit Random Forest modeli (fallback)"""
@@ -108,7 +426,7 @@ class EmotionClassifier:
             return
 
         # Özellikler
-        features = ['danceability', 'energy', 'valence', 'tempo', 'acousticness', 'instrumentalness', 'liveness', 'speechiness']
+        features = BASE_FEATURES
         X = self.df[features]
         y = self.df['emotion_encoded']
 
@@ -118,6 +436,8 @@ class EmotionClassifier:
         # Model oluştur
         self.model = RandomForestClassifier(n_estimators=100, random_state=42)
         self.model.fit(X_train, y_train)
+        self.features = features
+        self.holdout = sample_holdout(X_test.to_numpy(), self.df['emotion'].to_numpy()[X_test.index])
 
         # Tahmin
         y_pred = self.model.predict(X_test)
@@ -125,17 +445,199 @@ class EmotionClassifier:
 
         print(f"✅ Temel model eğitildi. Doğruluk: {accuracy:.3f}")
 
-    def load_model(self):
-        """Kaydedilmiş modeli yükle"""
+        # Yedek model de aynı veri/ayar özetleriyle kaydedilir: sonraki açılışlar yeniden eğitmez
+        self.export_engine()
+        self.save_model()
+
+    def save_model(self):
+        """Modeli sürümlü artifact olarak kaydet"""
+        artifact = {
+            'version': MODEL_VERSION,
+            'pipeline': self.model,
+            'features': list(self.features),
+            'label_mapping': dict(EMOTION_MAPPING),
+            'data_hash': self.data_hash(),
+            'config_hash': self.config_hash(),
+            'data_info': self._compute_data_info(),
+            # Eğitime girmeyen test bölümünden örnek: model değişiminde doğrulama bununla yapılır
+            'holdout': self.holdout,
+            'trained_at': time.time()
+        }
+        os.makedirs(os.path.dirname(self.model_path) or '.', exist_ok=True)
+        # Yarım yazılmış dosya izleyiciler tarafından okunmasın diye atomik değiştir
+        tmp_path = self.model_path + '.tmp'
+        joblib.dump(artifact, tmp_path)
+        os.replace(tmp_path, self.model_path)
+        stat = os.stat(self.model_path)
+        _own_artifacts[os.path.abspath(self.model_path)] = stat.st_mtime
+        # Yan dosya artifact'ın boyut/mtime'ını taşır: elle değiştirilen artifact'la eşleşmez
+        meta = {key: artifact[key] for key in ('version', 'data_hash', 'config_hash')}
+        meta.update(size=stat.st_size, mtime=stat.st_mtime)
+        meta_path = meta_path_for(self.model_path)
+        with open(meta_path + '.tmp', 'w') as f:
+            json.dump(meta, f)
+        os.replace(meta_path + '.tmp', meta_path)
+        self.model_version = self._artifact_version(artifact)
+        print(f"✅ Model kaydedildi: {self.model_path} ({self.model_version})")
+
+    @staticmethod
+    def _artifact_version(artifact):
+        """Artifact'ı tanımlayan kısa sürüm dizesi"""
+        if not isinstance(artifact, dict):
+            return 'legacy'
+        parts = [f"v{artifact.get('version')}"]
+        if 'trained_at' in artifact:
+            parts.append(time.strftime('%Y%m%d%H%M%S', time.gmtime(artifact['trained_at'])))
+        parts.append(str(artifact.get('data_hash'))[:8])
+        return '-'.join(parts)
+
+    def load_model(self, data_hash=None, allow_stale=False):
+        """Kaydedilmiş modeli yükle (data_hash verilirse eşleşme kontrol edilir; allow_stale ile eski model de kabul edilir)"""
         try:
             if os.path.exists(self.model_path):
-                self.model = joblib.load(self.model_path)
+                artifact = joblib.load(self.model_path)
+                if not isinstance(artifact, dict):
+                    # Eski format: sadece pipeline
+                    if data_hash is not None and not allow_stale:
+                        print("⚠️ Eski model formatı, yeniden eğitim gerekli")
+                        return False
+                    self.model = artifact
+                    self.model_version = self._artifact_version(artifact)
+                    self.export_engine()
+                    print("✅ Model yüklendi")
+                    return True
+
+                if artifact.get('version') != MODEL_VERSION or artifact.get('config_hash') != self.config_hash():
+                    if not allow_stale:
+                        print("⚠️ Model sürümü/ayarları değişmiş, yeniden eğitim gerekli")
+                        return False
+                    print("⚠️ Eski model ayarlarıyla servis ediliyor")
+                if data_hash is not None and artifact.get('data_hash') != data_hash:
+                    if not allow_stale:
+                        print("⚠️ Eğitim verisi değişmiş, yeniden eğitim gerekli")
+                        return False
+                    print("⚠️ Eski veriyle eğitilmiş model servis ediliyor")
+
+                self.model = artifact['pipeline']
+                self.features = artifact['features']
+                self.data_info = artifact.get('data_info', {})
+                self.holdout = artifact.get('holdout')
+                self.model_version = self._artifact_version(artifact)
+                self.export_engine()
                 print("✅ Model yüklendi")
                 return True
         except Exception as e:
             print(f"❌ Model yükleme hatası: {e}")
         return False
 
+    def export_engine(self, X_check=None):
+        """Eğitilmiş ağaçları düz NumPy dizilerine derle ve orijinal modelle doğrula (ayrı dosyaya yazılmaz; her yüklemede derlenir)"""
+        self.engine = None
+        try:
+            engine = CompiledTreeEnsemble.from_model(self.model)
+        except Exception as e:
+            print(f"⚠️ Çıkarım motoru derlenemedi, scikit-learn kullanılacak: {e}")
+            return None
+
+        if X_check is None:
+            # Doğrulama için rastgele ham özellik satırları
+            rng = np.random.default_rng(0)
+            raw = rng.random((512, len(BASE_FEATURES)))
+            raw[:, 3] = rng.uniform(40, 200, len(raw))  # tempo
+            X_check = extend_features(raw)[:, :len(self.features)]
+
+        expected = self.model.predict_proba(pd.DataFrame(X_check, columns=self.features))
+        if not np.array_equal(engine.predict_proba(X_check), expected):
+            print("⚠️ Çıkarım motoru modelle eşleşmiyor, scikit-learn kullanılacak")
+            return None
+
+        self.engine = engine
+        return engine
+
+    def load_or_train(self):
+        """Veri ve ayarlar değişmediyse modeli yükle, aksi halde yeniden eğit"""
+        start = time.perf_counter()
+        try:
+            current_hash = self.data_hash()
+        except OSError as e:
+            print(f"❌ Veri okunamadı: {e}")
+            current_hash = None
+
+        if current_hash is not None and self.load_model(data_hash=current_hash):
+            elapsed = time.perf_counter() - start
+            metrics.set_gauge('model_load_seconds', elapsed, "Model artifact'ından yükleme süresi")
+            print(f"⏱️ Model artifact'tan yüklendi: {elapsed:.3f} sn")
+            return 'loaded'
+
+        self.training_report = []
+        if self.use_streaming():
+            # Belleğe sığmayan katalog: DataFrame oluşturulmadan parça parça eğitim
+            self.train_streaming_model()
+            elapsed = time.perf_counter() - start
+            metrics.set_gauge('model_train_seconds', elapsed, 'Veri hazırlama + model eğitimi süresi')
+            self.print_training_report()
+            print(f"⏱️ Model akışlı eğitildi: {elapsed:.3f} sn")
+            return 'trained'
+
+        with self.training_stage('prepare_data'):
+            self.prepare_data()
+        # Gelişmiş model eğitimi dene, olmazsa basit olanı kullan
+        try:
+            self.train_advanced_model()
+        except Exception as e:
+            print(f"Gelişmiş model eğitimi başarısız, basit model kullanılıyor: {e}")
+            with self.training_stage('random_forest'):
+                self.train_random_forest()
+        # Eğitim DataFrame'i servis sırasında gerekmez: özeti saklanıp katalog kopyası bırakılır
+        self.data_info = self._compute_data_info()
+        self.df = None
+        elapsed = time.perf_counter() - start
+        metrics.set_gauge('model_train_seconds', elapsed, 'Veri hazırlama + model eğitimi süresi')
+        self.print_training_report()
+        print(f"⏱️ Model yeniden eğitildi: {elapsed:.3f} sn")
+        return 'trained'
+
+    def read_artifact_meta(self):
+        """Artifact'ın sürüm ve özetleri: yan dosya artifact'la eşleşiyorsa ondan, değilse artifact açılarak"""
+        stat = os.stat(self.model_path)
+        try:
+            with open(meta_path_for(self.model_path)) as f:
+                meta = json.load(f)
+            if meta.get('size') == stat.st_size and meta.get('mtime') == stat.st_mtime:
+                return meta
+        except (OSError, ValueError):
+            pass
+        # Yan dosyası olmayan (eski) veya elle değiştirilmiş artifact
+        return joblib.load(self.model_path)
+
+    def needs_training(self):
+        """Kayıtlı artifact güncel veri ve ayarlarla eşleşmiyorsa True (model yüklenmez)"""
+        try:
+            artifact = self.read_artifact_meta()
+            return not (
+                isinstance(artifact, dict)
+                and artifact.get('version') == MODEL_VERSION
+                and artifact.get('config_hash') == self.config_hash()
+                and artifact.get('data_hash') == self.data_hash()
+            )
+        except Exception:
+            return True
+
+    def train_in_background(self, on_done=None):
+        """Eğitimi arka plan iş parçacığında çalıştır; bitince on_done(self) çağrılır"""
+        def run():
+            try:
+                self.load_or_train()
+            except Exception as e:
+                print(f"❌ Arka plan eğitimi başarısız: {e}")
+                return
+            if on_done is not None:
+                on_done(self)
+
+        thread = threading.Thread(target=run, name='background-training', daemon=True)
+        thread.start()
+        return thread
+
     def predict_emotion(self, features):
         """Gelişmiş duygu tahmin et"""
         if self.model is None:
@@ -144,43 +646,83 @@ class EmotionClassifier:
 
         try:
             # Özellikleri genişlet
-            features_extended = features.copy()
-            features_extended.extend([
-                features[1] / (features[2] + 0.001),  # energy_valence_ratio
-                features[3] * features[1],  # tempo_energy
-                features[4] * features[0]   # acoustic_dance
-            ])
-
-            prediction = self.model.predict([features_extended])
-
-            # Ters mapping
-            emotion_mapping_reverse = {
-                0: 'happy',
-                1: 'sad',
-                2: 'angry',
-                3: 'calm',
-                4: 'energetic',
-                5: 'romantic',
-                6: 'neutral'
-            }
-
-            return emotion_mapping_reverse.get(prediction[0], 'neutral')
+            features_extended = list(features[:8])
+            if len(self.features) > 8:
+                features_extended.extend([
+                    features[1] / (features[2] + 0.001),  # energy_valence_ratio
+                    features[3] * features[1],  # tempo_energy
+                    features[4] * features[0]   # acoustic_dance
+                ])
+
+            with metrics.timer('stage_duration_seconds', STAGE_HELP, stage='classifier_predict'):
+                if self.engine is not None:
+                    prediction = self.engine.predict(np.array([features_extended], dtype=np.float64))
+                else:
+                    prediction = self.model.predict(pd.DataFrame([features_extended], columns=self.features))
+
+            return EMOTION_MAPPING_REVERSE.get(prediction[0], 'neutral')
 
         except Exception as e:
             print(f"❌ Tahmin hatası: {e}")
             return 'neutral'
 
+    def predict_emotions(self, matrix, return_proba=False):
+        """Toplu duygu tahmini: (n, 8) ham özellik matrisi için tek predict çağrısı"""
+        if self.model is None and not self.load_model():
+            raise RuntimeError("Model yüklenmedi")
+
+        X = extend_features(matrix)[:, :len(self.features)]
+        # Derlenmiş motor ve scikit-learn NaN/inf'e farklı davranır: sonuç parti boyutuna bağlı kalmasın
+        if not np.isfinite(X).all():
+            raise ValueError("Özellikler sonlu olmalı")
+        model = self.engine
+        if model is None or len(X) > ENGINE_MAX_ROWS:
+            model = self.model
+            X = pd.DataFrame(X, columns=self.features)
+
+        if not return_proba:
+            with metrics.timer('stage_duration_seconds', STAGE_HELP, stage='classifier_predict_batch'):
+                codes = model.predict(X)
+            return [EMOTION_MAPPING_REVERSE.get(c, 'neutral') for c in codes]
+
+        # Olasılıklardan etiket türet (tek model çağrısı)
+        with metrics.timer('stage_duration_seconds', STAGE_HELP, stage='classifier_predict_batch'):
+            proba = model.predict_proba(X)
+        classes = [EMOTION_MAPPING_REVERSE.get(c, 'neutral') for c in self.model.classes_]
+        emotions = [classes[i] for i in proba.argmax(axis=1)]
+        return emotions, proba, classes
+
+    def _compute_data_info(self):
+        """Veri seti özetini hesapla"""
+        if self.df is None or len(self.df) == 0:
+            return dict(self.data_info)
+
+        # Aynı DataFrame için bir kez hesaplanır (value_counts tüm satırları tarar)
+        key = (id(self.df), len(self.df), len(self.df.columns))
+        if self._data_info_key != key:
+            self._df_info = {
+                'total_songs': len(self.df),
+                'emotion_distribution': self.df['emotion'].value_counts().to_dict(),
+                'features_count': len(self.df.columns) - 2  # emotion ve encoded hariç
+            }
+            self._data_info_key = key
+        return dict(self._df_info)
+
     def get_model_info(self):
         """Model bilgilerini döndür"""
-        if self.df is None:
+        if self.df is None and not self.data_info:
             return {}
 
-        emotion_counts = self.df['emotion'].value_counts().to_dict()
-        total_songs = len(self.df)
-
-        return {
-            'total_songs': total_songs,
-            'emotion_distribution': emotion_counts,
-            'features_count': len(self.df.columns) - 2,  # emotion ve encoded hariç
-            'model_type': 'GradientBoosting' if hasattr(self.model, 'named_steps') else 'RandomForest'
-        }
\ No newline at end of file
+        info = self._compute_data_info()
+        if hasattr(self.model, 'named_steps'):
+            estimator = self.model.steps[-1][1]
+            if isinstance(estimator, MLPClassifier):
+                info['model_type'] = 'MLP'
+            elif isinstance(estimator, HistGradientBoostingClassifier):
+                info['model_type'] = 'HistGradientBoosting'
+            else:
+                info['model_type'] = 'GradientBoosting'
+        else:
+            info['model_type'] = 'RandomForest'
+        info['model_version'] = self.model_version
+        return info
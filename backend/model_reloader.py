@@ -0,0 +1,261 @@
+"""
+Model Yeniden Yükleyici - Sunucuyu yeniden başlatmadan model artifact'ını değiştirme
+
+Çok işçili sunucuda servisteki sürüm paylaşılan bir işaretçi dosyasıyla (active_model.json)
+yayınlanır: değişimi yapan işçi sınıflandırıcıyı versions/<sürüm>.pkl olarak arşivler ve
+işaretçiyi günceller, diğer işçilerin izleyicileri işaretçiyi izleyip aynı sürüme geçer.
+"""
+
+import os
+import json
+import glob
+import threading
+
+import joblib
+import numpy as np
+
+from ml_emotion_classifier import EmotionClassifier, written_by_this_process
+from metrics import metrics
+
+# Arşivde tutulan en fazla sürüm (servisteki ve önceki sürüm hiç silinmez)
+ARCHIVE_KEEP = 5
+
+
+class ModelReloader:
+    """Artifact değişimini izler; yeni modeli doğrulayıp atomik olarak servise alır, öncekini saklar"""
+
+    def __init__(self, get_current, set_current, model_path=None,
+                 min_accuracy=0.5, max_regression=0.05, interval=10.0, watch_artifact=True):
+        self.get_current = get_current
+        self.set_current = set_current
+        self.model_path = model_path or EmotionClassifier().model_path
+        models_dir = os.path.dirname(self.model_path) or '.'
+        self.pointer_path = os.path.join(models_dir, 'active_model.json')
+        self.archive_dir = os.path.join(models_dir, 'versions')
+        self.watch_artifact = watch_artifact
+        self.min_accuracy = min_accuracy
+        self.max_regression = max_regression
+        self.interval = interval
+        self.previous = None
+        self.last_result = None
+        self.reloads = 0
+        self.rejections = 0
+        self._mtime = self._artifact_mtime()
+        # Açılıştan önce yazılmış (önceki çalıştırmadan kalan) işaretçi izlenmez
+        self._pointer_mtime = self._mtime_of(self.pointer_path)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def _artifact_mtime(self):
+        return self._mtime_of(self.model_path)
+
+    @staticmethod
+    def _mtime_of(path):
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return None
+
+    def _archive_path(self, version):
+        return os.path.join(self.archive_dir, f'{version}.pkl')
+
+    def read_pointer(self):
+        """Paylaşılan işaretçi: {'version', 'previous'} (yoksa None)"""
+        try:
+            with open(self.pointer_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _archive(self, classifier):
+        """Sınıflandırıcıyı versions/<sürüm>.pkl olarak (yoksa) atomik yaz"""
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = self._archive_path(classifier.model_version)
+        if not os.path.exists(path):
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            joblib.dump(classifier, tmp_path)
+            os.replace(tmp_path, path)
+
+    def publish(self, classifier, previous=None):
+        """Sınıflandırıcıyı (ve başka işçide geri alma için öncekini) arşivle, işaretçiyi ona çevir"""
+        version = classifier.model_version
+        self._archive(classifier)
+        if previous is not None:
+            self._archive(previous)
+        pointer = {'version': version, 'previous': getattr(previous, 'model_version', None)}
+        tmp_path = f'{self.pointer_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(pointer, f)
+        os.replace(tmp_path, self.pointer_path)
+        self._pointer_mtime = self._mtime_of(self.pointer_path)
+        self._prune_archive(keep={version, pointer['previous']})
+
+    def _prune_archive(self, keep):
+        """En eski arşiv sürümlerini sil (ARCHIVE_KEEP'ten fazlası)"""
+        paths = sorted(glob.glob(os.path.join(self.archive_dir, '*.pkl')), key=self._mtime_of, reverse=True)
+        for path in paths[ARCHIVE_KEEP:]:
+            if os.path.basename(path)[:-len('.pkl')] not in keep:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _load_archived(self, version):
+        """Arşivlenmiş sınıflandırıcıyı yükle (yoksa None)"""
+        try:
+            return joblib.load(self._archive_path(version))
+        except Exception as e:
+            print(f"❌ Arşivlenmiş model yüklenemedi ({version}): {e}")
+            return None
+
+    @staticmethod
+    def holdout_for(candidate, current=None):
+        """Adayın eğitimde görmediği test bölümü (eski artifact'ta yoksa servisteki modelinki)"""
+        return getattr(candidate, 'holdout', None) or getattr(current, 'holdout', None)
+
+    @staticmethod
+    def evaluate(classifier, holdout=None):
+        """Doğrulama setinde doğruluk (holdout verilmezse sınıflandırıcının kendi test bölümü; set yoksa None)"""
+        if holdout is None:
+            holdout = getattr(classifier, 'holdout', None)
+        if holdout is None or classifier is None:
+            return None
+        matrix, labels = holdout
+        predictions = np.asarray(classifier.predict_emotions(matrix))
+        return float(np.mean(predictions == labels))
+
+    def reload(self, force=False):
+        """Artifact'ı yeni bir sınıflandırıcıya yükle, doğrula ve servise al"""
+        with self._lock:
+            self._mtime = self._artifact_mtime()
+            candidate = EmotionClassifier()
+            candidate.model_path = self.model_path
+            if not candidate.load_model():
+                return self._finish({'status': 'failed', 'reason': 'Artifact yüklenemedi'})
+
+            current = self.get_current()
+            if not force and current is not None and candidate.model_version == current.model_version:
+                return self._finish({'status': 'unchanged', 'model_version': current.model_version})
+
+            # İki model de adayın eğitimde görmediği aynı satırlarla ölçülür
+            holdout = self.holdout_for(candidate, current)
+            accuracy = self.evaluate(candidate, holdout)
+            current_accuracy = self.evaluate(current, holdout)
+            result = {
+                'model_version': candidate.model_version,
+                'accuracy': accuracy,
+                'previous_accuracy': current_accuracy
+            }
+            if not force and accuracy is not None:
+                if accuracy < self.min_accuracy:
+                    self.rejections += 1
+                    return self._finish({**result, 'status': 'rejected',
+                                         'reason': f'Doğruluk {accuracy:.3f} < {self.min_accuracy}'})
+                if current_accuracy is not None and current_accuracy - accuracy > self.max_regression:
+                    self.rejections += 1
+                    return self._finish({**result, 'status': 'rejected',
+                                         'reason': f'Doğruluk {current_accuracy:.3f} -> {accuracy:.3f} düştü'})
+
+            self.swap(candidate, accuracy)
+            return self._finish({**result, 'status': 'swapped'})
+
+    def swap(self, candidate, accuracy=None, publish=True):
+        """Yeni modeli servise al; mevcut olan geri alma için saklanır, diğer işçilere yayınlanır"""
+        current = self.get_current()
+        # Aynı sürüm yeniden servise alınırsa (force) geri alınacak gerçek önceki sürüm korunur
+        if getattr(current, 'model_version', None) != candidate.model_version:
+            self.previous = current
+        self.set_current(candidate)
+        self.reloads += 1
+        if accuracy is not None:
+            metrics.set_gauge('model_holdout_accuracy', accuracy, 'Servisteki modelin doğrulama doğruluğu')
+        if publish:
+            try:
+                self.publish(candidate, previous=self.previous)
+            except OSError as e:
+                print(f"⚠️ Model sürümü diğer işçilere yayınlanamadı: {e}")
+        print(f"✅ Model değiştirildi: {getattr(current, 'model_version', None)} -> {candidate.model_version}")
+
+    def rollback(self):
+        """Önceki modele geri dön (tüm işçiler işaretçi üzerinden izler)"""
+        with self._lock:
+            current_version = getattr(self.get_current(), 'model_version', None)
+            previous = self.previous
+            if getattr(previous, 'model_version', None) == current_version:
+                previous = None
+            if previous is None:
+                # Değişimi başka bir işçi yaptıysa önceki sürüm arşivden okunur
+                pointer = self.read_pointer() or {}
+                if pointer.get('previous') and pointer['previous'] != current_version:
+                    previous = self._load_archived(pointer['previous'])
+            if previous is None:
+                # Servisteki sürüme "geri dönmek" başarı sayılmaz (uç nokta 409 döner)
+                return self._finish({'status': 'failed', 'reason': 'Geri alınacak önceki sürüm yok',
+                                     'model_version': current_version})
+            self.swap(previous)
+            print(f"↩️ Model geri alındı: {previous.model_version}")
+            return self._finish({'status': 'rolled_back', 'model_version': previous.model_version})
+
+    def follow(self):
+        """Başka bir işçinin yayınladığı sürüme geç (işaretçi değişmediyse bir şey yapmaz)"""
+        mtime = self._mtime_of(self.pointer_path)
+        if mtime is None or mtime == self._pointer_mtime:
+            return False
+        with self._lock:
+            self._pointer_mtime = mtime
+            pointer = self.read_pointer() or {}
+            version = pointer.get('version')
+            current = self.get_current()
+            if not version or version == getattr(current, 'model_version', None):
+                return False
+            candidate = self._load_archived(version)
+            if candidate is None:
+                return False
+            # Yayınlayan işçi doğrulamayı yaptı; burada yalnızca değiştirilir
+            self.swap(candidate, publish=False)
+            self._finish({'status': 'followed', 'model_version': version})
+            return True
+
+    def _finish(self, result):
+        self.last_result = result
+        metrics.inc('model_reloads_total', help_text='Model yeniden yükleme denemeleri', status=result['status'])
+        if result['status'] in ('failed', 'rejected'):
+            print(f"⚠️ Model yeniden yüklenmedi: {result.get('reason')}")
+        return result
+
+    def start(self):
+        """İşaretçiyi (ve watch_artifact ise artifact dosyasını) periyodik izleyen iş parçacığını başlat"""
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='model-reloader', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.follow()
+                if self.watch_artifact:
+                    mtime = self._artifact_mtime()
+                    if written_by_this_process(self.model_path, mtime):
+                        # Bu süreç eğitip kaydetti; swap_classifier zaten servise aldı
+                        self._mtime = mtime
+                    elif mtime is not None and mtime != self._mtime:
+                        self.reload()
+            except Exception as e:
+                print(f"❌ Model izleyici hatası: {e}")
+
+    def stats(self):
+        current = self.get_current()
+        return {
+            'model_version': getattr(current, 'model_version', None),
+            'previous_version': getattr(self.previous, 'model_version', None),
+            'published_version': (self.read_pointer() or {}).get('version'),
+            'watching': self._thread is not None and self._thread.is_alive(),
+            'reloads': self.reloads,
+            'rejections': self.rejections,
+            'last_result': self.last_result
+        }
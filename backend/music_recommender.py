@@ -4,35 +4,213 @@ Müzik Öneri Sistemi
 
 import pandas as pd
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+from catalog_store import CatalogStore, EMOTION_MAPPING, FEATURE_COLUMNS, FEATURE_DTYPE
+from catalog_format import CatalogWriter, MappedCatalog, binary_path_for, resolve_catalog_path
+from catalog_log import CatalogLog, apply_entry, log_path_for
+from similarity_index import SimilarityIndex
+from ranking import DiverseRanker
+from metrics import metrics, STAGE_HELP
+import threading
+import time
+import os
+
+# Günlükte bu kadar şarkı birikince ikili kataloğa sıkıştırılır
+COMPACT_MIN_TRACKS = int(os.environ.get('CATALOG_COMPACT_TRACKS', 50_000))
+# Diğer işçilerin günlüğe yazdıklarını okuma aralığı (sn)
+LOG_SYNC_INTERVAL = float(os.environ.get('CATALOG_SYNC_INTERVAL', 5))
 
 class MusicRecommender:
     def __init__(self):
-        self.df = None
+        self.data_path = '../data/music_emotion.csv'
+        self.catalog = None
+        self.similarity_index = None
+        self.ranker = None
+        self.log = None
+        self._sync_stopped = threading.Event()
+        self._compacting = threading.Lock()
         self.load_data()
 
     def load_data(self):
-        """Veriyi yükle"""
+        """Veriyi yükle (ikili katalog varsa bellek eşlemeli, yoksa CSV)"""
+        self.similarity_index = None
+        start = time.perf_counter()
+        path = resolve_catalog_path(self.data_path)
+        base_seq = 0
         try:
-            self.df = pd.read_csv('../data/music_emotion.csv')
-            print(f"✅ Veri yüklendi: {len(self.df)} şarkı")
+            if path != self.data_path:
+                # İşçiler aynı sayfa önbelleğini paylaşır, ayrıştırma yapılmaz
+                mapped = MappedCatalog(path)
+                base_seq = mapped.metadata.get('log_seq', 0)
+                self.catalog = CatalogStore.from_mapped(mapped)
+                print(f"✅ İkili katalog eşlendi: {len(self.catalog)} şarkı")
+            else:
+                # Sütunsal katalog ve duygu indeksi bir kez oluşturulur; DataFrame saklanmaz
+                # Dize sütunları ayrıştırılırken kategoriye çevrilir: satır başına str nesnesi tutulmaz
+                dtypes = {**dict.fromkeys(['title', 'artist', 'emotion'], 'category'),
+                          **dict.fromkeys(FEATURE_COLUMNS, FEATURE_DTYPE)}
+                df = pd.read_csv(path, dtype=dtypes)
+                self.catalog = CatalogStore(df)
+                del df
+                print(f"✅ Veri yüklendi: {len(self.catalog)} şarkı")
         except Exception as e:
             print(f"❌ Veri yükleme hatası: {e}")
-            self.df = pd.DataFrame()
+            self.catalog = CatalogStore(None)
+
+        # Son sıkıştırmadan sonra günlüğe yazılan partileri uygula
+        self.log = CatalogLog(log_path_for(self.data_path), applied_seq=base_seq)
+        replayed = self.log.sync(self._apply_entry)
+        if replayed:
+            print(f"✅ Katalog günlüğünden {len(replayed)} parti uygulandı: {len(self.catalog)} şarkı")
+        self.log.behind = False
+        self.ranker = DiverseRanker(self.catalog)
+        # Duygu merkezleri yüklemede bir kez hesaplanır (karışım sorguları için)
+        self.ranker.precompute_profiles()
+        metrics.set_gauge('catalog_load_seconds', time.perf_counter() - start, 'Katalog yükleme süresi')
+
+    def _apply_entry(self, entry):
+        """Günlük partisini kataloğa ve (oluşturulduysa) benzerlik indeksine uygula"""
+        appended, updated = apply_entry(self.catalog, entry)
+        index = self.similarity_index
+        if index is not None:
+            features = self.catalog.features
+            if len(appended):
+                index.add(np.column_stack([features[col][appended] for col in FEATURE_COLUMNS]))
+            if len(updated):
+                index.update(updated, np.column_stack([features[col][updated] for col in FEATURE_COLUMNS]))
+        return appended, updated
+
+    def ingest(self, tracks, mode='upsert'):
+        """Şarkıları günlüğe yaz ve kataloğa artımlı uygula"""
+        # Geçersiz partiler günlüğe hiç yazılmaz
+        if self.catalog is None:
+            raise ValueError('Katalog yüklenmedi')
+        tracks = [self._validate_track(t) for t in tracks]
+        seq, (appended, updated) = self.log.append(mode, tracks, self._apply_entry)
+        metrics.inc('catalog_ingested_tracks_total', len(tracks), 'Artımlı eklenen/güncellenen şarkılar', mode=mode)
+        if self.log.pending_tracks >= COMPACT_MIN_TRACKS:
+            self.compact_in_background()
+        return {
+            'seq': seq,
+            'appended': len(appended),
+            'updated': len(updated),
+            'song_ids': appended.tolist(),
+            'updated_ids': updated.tolist(),
+            'size': len(self.catalog)
+        }
+
+    @staticmethod
+    def _validate_track(track):
+        """Şarkıyı günlüğe yazılacak sade sözlüğe çevir"""
+        if not isinstance(track, dict):
+            raise ValueError('Şarkı bir JSON nesnesi olmalı')
+        try:
+            clean = {name: str(track[name]) for name in ('title', 'artist', 'emotion')}
+            for col in FEATURE_COLUMNS:
+                value = float(track[col])
+                if not np.isfinite(value):
+                    raise ValueError(f"{col} sonlu olmalı")
+                clean[col] = value
+        except KeyError as e:
+            raise ValueError(f"Eksik alan: {e.args[0]}") from None
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Geçersiz değer: {e}") from None
+        # Bilinmeyen etiketler eğitimde NaN hedefe dönüşür: yalnızca bilinen duygular kabul edilir
+        clean['emotion'] = clean['emotion'].lower()
+        if clean['emotion'] not in EMOTION_MAPPING:
+            raise ValueError(f"Bilinmeyen duygu: {track['emotion']}")
+        return clean
+
+    def sync_log(self):
+        """Diğer işçilerin günlüğe yazdığı partileri uygula"""
+        if self.log is None:
+            return 0
+        entries = self.log.sync(self._apply_entry)
+        if self.log.behind:
+            # Görülmeden sıkıştırılan partiler var: kataloğu yeni ikili dosyadan yükle
+            print("⚠️ Katalog günlüğü sıkıştırılmış, katalog yeniden yükleniyor")
+            self.load_data()
+        return len(entries)
+
+    def start_log_sync(self):
+        """Günlüğü periyodik okuyan iş parçacığını başlat (fork sonrası işçi başına)"""
+        self._sync_stopped = threading.Event()
+
+        def run(stopped):
+            while not stopped.wait(LOG_SYNC_INTERVAL):
+                try:
+                    self.sync_log()
+                    if self.log.pending_tracks >= COMPACT_MIN_TRACKS:
+                        self.compact()
+                except Exception as e:
+                    print(f"❌ Katalog günlüğü eşitleme hatası: {e}")
+
+        threading.Thread(target=run, args=(self._sync_stopped,), name='catalog-log-sync', daemon=True).start()
+
+    def stop_log_sync(self):
+        self._sync_stopped.set()
+
+    def compact(self, force=False):
+        """Kataloğun anlık görüntüsünü ikili dosyaya yaz ve günlüğü boşalt"""
+        if not self._compacting.acquire(blocking=False):
+            return False
+        try:
+            start = time.perf_counter()
+
+            def write_snapshot(seq):
+                with CatalogWriter(binary_path_for(self.data_path), metadata={'log_seq': seq}) as writer:
+                    for chunk in self.catalog.column_chunks():
+                        writer.append(chunk)
+
+            done = self.log.compact(self._apply_entry, write_snapshot,
+                                    min_tracks=1 if force else COMPACT_MIN_TRACKS)
+            if done:
+                elapsed = time.perf_counter() - start
+                metrics.set_gauge('catalog_compact_seconds', elapsed, 'Son günlük sıkıştırma süresi')
+                print(f"✅ Katalog günlüğü sıkıştırıldı: {len(self.catalog)} şarkı ({elapsed:.3f} sn)")
+            return done
+        finally:
+            self._compacting.release()
+
+    def compact_in_background(self):
+        threading.Thread(target=self.compact, name='catalog-compact', daemon=True).start()
 
     def recommend_by_emotion(self, emotion, n=5):
         """Duygu durumuna göre öneri"""
-        if self.df is None or len(self.df) == 0:
+        if self.catalog is None or len(self.catalog) == 0:
             return []
 
-        # Duygu durumuna göre filtrele
-        filtered = self.df[self.df['emotion'].str.lower() == emotion.lower()]
+        # Önceden indekslenmiş havuzdan adaylar, profil skoru + çeşitlilikle n şarkı
+        with metrics.timer('stage_duration_seconds', STAGE_HELP, stage='recommender_sample'):
+            indices = self.ranker.select(emotion, n)
+
+        return [self.catalog.track(i).to_dict() for i in indices]
+
+    def get_similarity_index(self):
+        """Benzerlik indeksini ilk kullanımda oluştur"""
+        if self.similarity_index is None and self.catalog is not None and len(self.catalog) > 0:
+            self.similarity_index = SimilarityIndex(self.catalog)
+        return self.similarity_index
+
+    def recommend_similar(self, features=None, song_id=None, k=5):
+        """Ses özelliklerine veya bir şarkıya (satır numarası) en benzer k şarkıyı öner"""
+        index = self.get_similarity_index()
+        if index is None:
+            return []
 
-        if len(filtered) == 0:
-            # Eğer yoksa rastgele öner
-            filtered = self.df
+        if song_id is not None:
+            song_id = int(song_id)
+            if not 0 <= song_id < len(index):
+                raise ValueError(f"Geçersiz song_id: {song_id}")
+            query = index.vectors[song_id]
+        elif features is not None:
+            query = index.query_vector(features)
+        else:
+            raise ValueError("features veya song_id gerekli")
 
-        # Rastgele n şarkı seç
-        recommendations = filtered.sample(min(n, len(filtered)))
+        with metrics.timer('stage_duration_seconds', STAGE_HELP, stage='similarity_search'):
+            ids, scores = index.search(query, k, exclude=song_id)
 
-        return recommendations[['title', 'artist', 'emotion']].to_dict('records')
\ No newline at end of file
+        return [
+            {'song_id': int(i), **self.catalog.track(i).to_dict(similarity=round(float(score), 4))}
+            for i, score in zip(ids, scores)
+        ]
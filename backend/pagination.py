@@ -0,0 +1,57 @@
+"""
+Sayfalama - Duygu havuzları üzerinde durumsuz imleç (cursor) ile tekrarsız sayfalar
+"""
+
+import json
+import math
+import base64
+
+import numpy as np
+
+CURSOR_VERSION = 1
+
+
+def encode_cursor(emotion, seed, offset, size):
+    """Sayfa durumunu URL güvenli, opak bir dizeye çevir"""
+    state = {'v': CURSOR_VERSION, 'e': emotion, 's': seed, 'o': offset, 'n': size}
+    return base64.urlsafe_b64encode(json.dumps(state, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """İmleci çöz: (emotion, seed, offset, size); bozuk imleçte ValueError"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if state.get('v') != CURSOR_VERSION:
+            raise ValueError('sürüm')
+        emotion, seed, offset, size = str(state['e']), int(state['s']), int(state['o']), int(state['n'])
+    except (TypeError, KeyError, ValueError, AttributeError, UnicodeError) as e:
+        raise ValueError(f'Geçersiz imleç ({e})') from None
+    if not 0 <= offset <= size or seed < 0:
+        raise ValueError('Geçersiz imleç (aralık dışı)')
+    return emotion, seed, offset, size
+
+
+def new_seed(rng=None):
+    """Yeni sayfalama oturumu için tohum"""
+    return int((rng or np.random.default_rng()).integers(0, 2**31 - 1))
+
+
+def permuted_page(pool, seed, offset, n, size):
+    """Havuzun tohuma bağlı karışık sırasından [offset, offset+n) dilimini döndür
+
+    Sıra i -> (a*i + b) mod N afin permütasyonuyla üretilir (gcd(a, N) = 1); havuz
+    kopyalanmaz ve karıştırılmaz, sayfa maliyeti yalnızca n ile orantılıdır.
+    size: ilk sayfadaki havuz boyutu (sonradan eklenen şarkılar bu oturuma girmez)
+    """
+    size = min(size, len(pool))
+    end = min(offset + n, size)
+    if offset >= end:
+        return pool[:0]
+    rng = np.random.default_rng(seed)
+    a = int(rng.integers(1, size)) if size > 1 else 1
+    while math.gcd(a, size) != 1:
+        a += 1
+    b = int(rng.integers(0, size))
+    positions = (np.arange(offset, end, dtype=np.int64) * a + b) % size
+    return pool[positions]
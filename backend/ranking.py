@@ -0,0 +1,188 @@
+"""
+Çeşitlilik Sıralaması - Duygu profiline göre skorlama + MMR ve sanatçı sınırı ile top-k seçim
+
+Çoklu duygu karışımları ({"calm": 0.7, "romantic": 0.3}) alias yöntemiyle havuzlardan
+orantılı aday çeker; maliyet katalog boyutundan bağımsızdır.
+"""
+
+import os
+
+import numpy as np
+
+from catalog_store import FEATURE_COLUMNS
+
+# Her istekte skorlanan aday sayısı (n'nin katı); havuz boyutundan bağımsız maliyet
+CANDIDATES_PER_RESULT = 12
+MIN_CANDIDATES = 64
+
+# MMR dengesi: 1.0 yalnızca profile yakınlık, 0.0 yalnızca çeşitlilik
+MMR_LAMBDA = float(os.environ.get('RANKING_LAMBDA', 0.7))
+
+# Bir yanıtta aynı sanatçıdan en fazla şarkı
+ARTIST_CAP = int(os.environ.get('RANKING_ARTIST_CAP', 1))
+
+# Profil ortalaması için havuzdan alınan en fazla satır
+PROFILE_SAMPLE_ROWS = 100_000
+
+
+class AliasTable:
+    """Walker alias yöntemi: k ağırlıklı kategoriden çekiliş başına O(1) örnekleme (kurulum O(k))"""
+
+    def __init__(self, weights):
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.ndim != 1 or len(weights) == 0 or not np.isfinite(weights).all() \
+                or (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError("Ağırlıklar negatif olmayan sayılar ve toplamı pozitif olmalı")
+        k = len(weights)
+        scaled = weights / weights.sum() * k
+        self.prob = np.ones(k)
+        self.alias = np.arange(k)
+        small = [i for i in range(k) if scaled[i] < 1.0]
+        large = [i for i in range(k) if scaled[i] >= 1.0]
+        while small and large:
+            low, high = small.pop(), large.pop()
+            self.prob[low] = scaled[low]
+            self.alias[low] = high
+            scaled[high] -= 1.0 - scaled[low]
+            (small if scaled[high] < 1.0 else large).append(high)
+
+    def sample(self, n, rng):
+        """n kategori indeksi çek"""
+        columns = rng.integers(0, len(self.prob), n)
+        return np.where(rng.random(n) < self.prob[columns], columns, self.alias[columns])
+
+
+def quotas(weights, n):
+    """n sonucu ağırlıklara en büyük kalan yöntemiyle paylaştır"""
+    weights = np.asarray(weights, dtype=np.float64)
+    exact = weights / weights.sum() * n
+    counts = np.floor(exact).astype(np.int64)
+    counts[np.argsort(counts - exact)[:n - counts.sum()]] += 1
+    return counts
+
+
+class DiverseRanker:
+    """Önceden indekslenmiş duygu havuzlarından çeşitlilik gözeten top-k seçici"""
+
+    def __init__(self, catalog, mmr_lambda=MMR_LAMBDA, artist_cap=ARTIST_CAP):
+        self.catalog = catalog
+        self.mmr_lambda = mmr_lambda
+        self.artist_cap = artist_cap
+        self.mean = None
+        self.std = None
+        self._profiles = {}
+
+    def _standardize(self, rows):
+        """Seçilen satırların özelliklerini (len(rows), 8) standart ölçekte döndür"""
+        if self.mean is None:
+            matrix = np.column_stack([self.catalog.features[col] for col in FEATURE_COLUMNS])
+            self.mean = matrix.mean(axis=0)
+            self.std = matrix.std(axis=0)
+            self.std[self.std == 0] = 1.0
+        features = self.catalog.features
+        matrix = np.column_stack([features[col][rows] for col in FEATURE_COLUMNS])
+        return (matrix - self.mean) / self.std
+
+    def profile(self, emotion):
+        """Duygu havuzunun ortalama (standart) özellik vektörü; ilk kullanımda hesaplanır"""
+        key = str(emotion).lower()
+        profile = self._profiles.get(key)
+        if profile is None:
+            pool = self.catalog.lookup(key)
+            if len(pool) > PROFILE_SAMPLE_ROWS:
+                pool = pool[np.random.default_rng(0).choice(len(pool), PROFILE_SAMPLE_ROWS, replace=False)]
+            profile = self._standardize(pool).mean(axis=0)
+            self._profiles[key] = profile
+        return profile
+
+    def precompute_profiles(self):
+        """Tüm duygu havuzlarının profillerini (merkezlerini) önceden hesapla"""
+        for emotion in self.catalog.emotion_index:
+            self.profile(emotion)
+
+    def select(self, emotion, n=5, rng=None, exclude=None):
+        """Aday örnekle, profile yakınlığa göre skorla, MMR + sanatçı/başlık sınırıyla n satır seç
+
+        exclude: adaylar için 'elenecek' maskesi döndüren fonksiyon (ör. daha önce sunulanlar)
+        """
+        candidates = self.catalog.sample(emotion, max(MIN_CANDIDATES, CANDIDATES_PER_RESULT * n), rng)
+        if len(candidates) <= 1:
+            return candidates
+        return self._rank(candidates, self.profile(emotion), n, exclude)
+
+    def blend(self, mix, n=5, rng=None, exclude=None, mode='pools'):
+        """Duygu karışımından n satır seç
+
+        mix: {duygu: ağırlık}. Adaylar havuzlardan alias yöntemiyle ağırlık oranında çekilir.
+        mode='pools': her aday kendi duygu merkezine göre skorlanır, sonuçlar ağırlık kotalarıyla paylaştırılır
+        mode='blend': tüm adaylar merkezlerin ağırlıklı ortalamasına (özellik uzayında karışım) göre skorlanır
+        """
+        if mode not in ('pools', 'blend'):
+            raise ValueError(f"Bilinmeyen karışım modu: {mode}")
+        emotions = list(mix)
+        weights = np.array([mix[e] for e in emotions], dtype=np.float64)
+        table = AliasTable(weights)
+        weights = weights / weights.sum()
+        rng = rng or self.catalog._rng
+
+        counts = np.bincount(table.sample(max(MIN_CANDIDATES, CANDIDATES_PER_RESULT * n), rng),
+                             minlength=len(emotions))
+        parts = [self.catalog.sample(emotion, int(count), rng) for emotion, count in zip(emotions, counts)]
+        candidates = np.concatenate(parts)
+        groups = np.repeat(np.arange(len(emotions)), [len(part) for part in parts])
+        if len(candidates) <= 1:
+            return candidates
+
+        centroids = np.stack([self.profile(emotion) for emotion in emotions])
+        if mode == 'blend':
+            return self._rank(candidates, weights @ centroids, n, exclude)
+        return self._rank(candidates, centroids[groups], n, exclude, groups, quotas(weights, n))
+
+    def _rank(self, candidates, targets, n, exclude=None, groups=None, group_quotas=None):
+        """Adayları hedef(ler)e yakınlık + MMR ile sırala; groups/group_quotas verilirse grup başına kota uygulanır"""
+        catalog = self.catalog
+        excluded = exclude(candidates) if exclude is not None else np.zeros(len(candidates), dtype=bool)
+
+        X = self._standardize(candidates)
+        relevance = 1.0 / (1.0 + np.linalg.norm(X - targets, axis=1))
+        norms = np.linalg.norm(X, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        unit = X / norms
+
+        titles = np.asarray(catalog.titles.codes[candidates])
+        artists = np.asarray(catalog.artists.codes[candidates])
+        available = ~excluded
+        max_similarity = np.zeros(len(candidates))
+        artist_counts = {}
+        taken = np.zeros(len(group_quotas), dtype=np.int64) if group_quotas is not None else None
+        if taken is not None:
+            available &= group_quotas[groups] > 0
+        selected = []
+
+        for _ in range(min(n, len(candidates))):
+            scores = self.mmr_lambda * relevance - (1.0 - self.mmr_lambda) * max_similarity
+            scores[~available] = -np.inf
+            best = int(np.argmax(scores))
+            if not available[best]:
+                break
+            selected.append(best)
+            available[best] = False
+            # Aynı başlık bir daha gelmez; sanatçı sınırı dolunca o sanatçı elenir
+            available &= titles != titles[best]
+            artist = artists[best]
+            artist_counts[artist] = artist_counts.get(artist, 0) + 1
+            if artist_counts[artist] >= self.artist_cap:
+                available &= artists != artist
+            if taken is not None:
+                group = groups[best]
+                taken[group] += 1
+                if taken[group] >= group_quotas[group]:
+                    available &= groups != group
+            np.maximum(max_similarity, unit @ unit[best], out=max_similarity)
+
+        if len(selected) < n:
+            # Küçük havuzlarda kısıtlar yetmezse kalan adaylarla tamamla (elenmeyenler önce)
+            rest = np.setdiff1d(np.arange(len(candidates)), selected)
+            rest = rest[np.lexsort((-relevance[rest], excluded[rest]))]
+            selected.extend(rest[:n - len(selected)].tolist())
+        return candidates[np.asarray(selected, dtype=np.int64)]
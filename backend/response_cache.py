@@ -0,0 +1,148 @@
+"""
+Yanıt Önbelleği - TTL'li LRU önbellek ve önceden örneklenmiş öneri havuzları
+"""
+
+import time
+import threading
+from collections import OrderedDict, deque
+
+
+class TTLCache:
+    """Boyut sınırlı, süre aşımlı (TTL) ve LRU tahliyeli iş parçacığı güvenli önbellek"""
+
+    def __init__(self, maxsize=128, ttl=300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        """Anahtarı döndür; yoksa veya süresi dolduysa default"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                expires_at, value = item
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+                self.expirations += 1
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        """Değeri kaydet; kapasite aşılırsa en eski kullanılanı çıkar"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_set(self, key, factory, ttl=None):
+        """Önbellekte yoksa factory() ile hesapla ve kaydet"""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = factory()
+            self.set(key, value, ttl)
+        return value
+
+    def invalidate(self, key=None):
+        """Tek anahtarı veya tüm önbelleği temizle"""
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def stats(self):
+        """İsabet/ıska sayaçları"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+class SampledPool:
+    """Duygu başına önceden örneklenmiş öneri listeleri; arka planda yeniden doldurulur"""
+
+    def __init__(self, sampler, emotions, capacity=256, low_watermark=64):
+        self.sampler = sampler
+        self.emotions = list(emotions)
+        self.capacity = capacity
+        self.low_watermark = low_watermark
+        self._pools = {emotion: deque() for emotion in self.emotions}
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self.hits = 0
+        self.misses = 0
+        self.refills = 0
+
+    def start(self):
+        """Havuzları doldur ve arka plan iş parçacığını başlat"""
+        self._fill()
+        self._thread = threading.Thread(target=self._run, name='sampled-pool-refill', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+
+    def take(self, emotion):
+        """Havuzdan bir liste al; havuz boşsa None (çağıran doğrudan örnekler)"""
+        pool = self._pools.get(str(emotion).lower())
+        if pool is None:
+            self.misses += 1
+            return None
+        try:
+            item = pool.popleft()
+        except IndexError:
+            self.misses += 1
+            self._wakeup.set()
+            return None
+        self.hits += 1
+        if len(pool) < self.low_watermark:
+            self._wakeup.set()
+        return item
+
+    def _fill(self):
+        for emotion, pool in self._pools.items():
+            missing = self.capacity - len(pool)
+            if missing > 0:
+                pool.extend(self.sampler(emotion) for _ in range(missing))
+                self.refills += 1
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if not self._stopped.is_set():
+                self._fill()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'capacity': self.capacity,
+            'sizes': {emotion: len(pool) for emotion, pool in self._pools.items()},
+            'hits': self.hits,
+            'misses': self.misses,
+            'refills': self.refills,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
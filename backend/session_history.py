@@ -0,0 +1,159 @@
+"""
+Oturum Geçmişi - Kullanıcı başına sunulan şarkılar için sabit boyutlu Bloom filtreleri (TTL + LRU tahliye)
+
+Tüm filtreler tek bir (kullanıcı, bayt) NumPy diliminde tutulur; kullanıcı başına
+nesne oluşturulmaz. Varsayılan 1024 bit / 5 özet ile ~140 şarkıya kadar yanlış
+pozitif oranı ~%3; bu sayı aşılınca filtre sıfırlanır (eski geçmiş unutulur). Tek başına
+kapasiteyi aşan toplu eklemeler (ör. 500 şarkılık sayfa) hiç kaydedilmez: filtreyi
+doldurup sonraki sorguların çoğunu yanlış pozitif yapmaktansa o parti unutulur.
+
+Bellek: 1 milyon aktif kullanıcı ≈ 311 MB (140 MB filtre dizileri + kullanıcı sözlüğü
+ve anahtarlar), bkz. scripts/benchmark_session_history.py
+"""
+
+import math
+import time
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Çarpma-kaydırma özetleri için sabit tek sayılar (64 bit)
+_MULTIPLIERS = np.array([
+    0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9,
+    0xD6E8FEB86659FD93, 0xFF51AFD7ED558CCD, 0xC4CEB9FE1A85EC53,
+    0x94D049BB133111EB, 0xBF58476D1CE4E5B9
+], dtype=np.uint64)
+
+
+class SessionHistory:
+    """Kullanıcı/oturum -> Bloom filtresi; contains/add toplu (vektörize) çalışır"""
+
+    def __init__(self, max_users=1_000_000, ttl=86400.0, bits=1024, hashes=5, initial_capacity=1024):
+        if bits & (bits - 1) or bits < 64:
+            raise ValueError("bits 64 veya üzeri bir 2 kuvveti olmalı")
+        if not 1 <= hashes <= len(_MULTIPLIERS):
+            raise ValueError(f"hashes 1..{len(_MULTIPLIERS)} aralığında olmalı")
+        self.max_users = max_users
+        self.ttl = ttl
+        self.bits = bits
+        self.hashes = hashes
+        # Bloom filtresinin optimum doluluğu: n = m ln2 / k
+        self.max_items = int(bits * math.log(2) / hashes)
+        self._shift = np.uint64(64 - int(math.log2(bits)))
+        self._multipliers = _MULTIPLIERS[:hashes]
+
+        capacity = min(initial_capacity, max_users)
+        self._filters = np.zeros((capacity, bits // 8), dtype=np.uint8)
+        self._counts = np.zeros(capacity, dtype=np.int32)
+        self._expires = np.zeros(capacity, dtype=np.float64)
+        self._slots = OrderedDict()
+        self._free = list(range(capacity - 1, -1, -1))
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.resets = 0
+        self.skipped = 0
+
+    def _positions(self, ids):
+        """Her kimlik için k bit konumu: (len(ids), k) bayt indeksleri ve bit maskeleri"""
+        ids = np.asarray(ids, dtype=np.uint64).reshape(-1, 1)
+        positions = (ids * self._multipliers) >> self._shift
+        return (positions >> np.uint64(3)).astype(np.intp), np.left_shift(1, positions & np.uint64(7)).astype(np.uint8)
+
+    def _slot(self, user, now):
+        """Kullanıcının geçerli filtre satırı (yoksa veya süresi dolduysa None)"""
+        slot = self._slots.get(user)
+        if slot is not None and self._expires[slot] < now:
+            self._release(user)
+            return None
+        return slot
+
+    def _release(self, user):
+        slot = self._slots.pop(user)
+        self._filters[slot] = 0
+        self._counts[slot] = 0
+        self._free.append(slot)
+
+    def _allocate(self, user, now):
+        """Yeni kullanıcıya satır ayır: önce süresi dolanlar, sonra en eski kullanılan tahliye edilir"""
+        while self._slots:
+            oldest, slot = next(iter(self._slots.items()))
+            if self._expires[slot] >= now and len(self._slots) < self.max_users:
+                break
+            self._release(oldest)
+            self.evictions += 1
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+        self._slots[user] = slot
+        return slot
+
+    def _grow(self):
+        old = len(self._filters)
+        capacity = min(self.max_users, max(1, old * 2))
+        self._filters = np.concatenate([self._filters, np.zeros((capacity - old, self._filters.shape[1]), np.uint8)])
+        self._counts = np.concatenate([self._counts, np.zeros(capacity - old, np.int32)])
+        self._expires = np.concatenate([self._expires, np.zeros(capacity - old)])
+        self._free.extend(range(capacity - 1, old - 1, -1))
+
+    def contains(self, user, ids):
+        """Her kimlik için 'daha önce sunuldu mu' maskesi (yanlış pozitif olabilir, yanlış negatif olmaz)"""
+        ids = np.asarray(ids)
+        with self._lock:
+            slot = self._slot(user, time.time())
+            if slot is None or len(ids) == 0:
+                return np.zeros(len(ids), dtype=bool)
+            byte_idx, masks = self._positions(ids)
+            return np.all(self._filters[slot][byte_idx] & masks, axis=1)
+
+    def add(self, user, ids):
+        """Sunulan kimlikleri kullanıcının filtresine ekle ve TTL'i yenile (parti max_items'tan büyükse False)"""
+        ids = np.asarray(ids)
+        now = time.time()
+        with self._lock:
+            if len(ids) > self.max_items:
+                # Tek parti filtreyi aşırı doldururdu (1024 bit'e 500 kimlik ≈ %60 yanlış pozitif)
+                self.skipped += 1
+                return False
+            slot = self._slot(user, now)
+            if slot is None:
+                slot = self._allocate(user, now)
+            else:
+                self._slots.move_to_end(user)
+            if self._counts[slot] + len(ids) > self.max_items:
+                # Filtre doydu: yanlış pozitifler artmasın diye geçmişi sıfırla
+                self._filters[slot] = 0
+                self._counts[slot] = 0
+                self.resets += 1
+            byte_idx, masks = self._positions(ids)
+            np.bitwise_or.at(self._filters[slot], byte_idx.ravel(), masks.ravel())
+            self._counts[slot] += len(ids)
+            self._expires[slot] = now + self.ttl
+            return True
+
+    def forget(self, user):
+        """Kullanıcının geçmişini sil"""
+        with self._lock:
+            if user in self._slots:
+                self._release(user)
+
+    def memory_bytes(self):
+        """Filtre dilimi ve yardımcı dizilerin bayt cinsinden boyutu (sözlük hariç)"""
+        return self._filters.nbytes + self._counts.nbytes + self._expires.nbytes
+
+    def stats(self):
+        with self._lock:
+            return {
+                'users': len(self._slots),
+                'max_users': self.max_users,
+                'capacity': len(self._filters),
+                'bits_per_user': self.bits,
+                'max_items_per_user': self.max_items,
+                'array_bytes': self.memory_bytes(),
+                'evictions': self.evictions,
+                'resets': self.resets,
+                'skipped': self.skipped
+            }
+
+    def __len__(self):
+        return len(self._slots)
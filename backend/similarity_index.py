@@ -0,0 +1,174 @@
+"""
+Benzerlik İndeksi - Standartlaştırılmış ses özellikleri üzerinde en yakın komşu arama
+"""
+
+import numpy as np
+
+from catalog_store import FEATURE_COLUMNS
+
+# Bu boyutun altındaki kataloglarda tam (brute-force) arama yapılır
+EXACT_SEARCH_LIMIT = 50_000
+
+
+def _normalize_rows(matrix):
+    """Satırları birim uzunluğa getir (kosinüs benzerliği için)"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _top_k(scores, k):
+    """Skorlardan en büyük k tanesinin indekslerini sıralı döndür"""
+    k = min(k, len(scores))
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+    part = np.argpartition(-scores, k - 1)[:k]
+    return part[np.argsort(-scores[part], kind='stable')]
+
+
+class FeatureScaler:
+    """Özellik sütunlarını ortalama/standart sapma ile ölçekler"""
+
+    def __init__(self, matrix):
+        self.mean = matrix.mean(axis=0)
+        self.std = matrix.std(axis=0)
+        self.std[self.std == 0] = 1.0
+
+    def transform(self, matrix):
+        return ((matrix - self.mean) / self.std).astype(np.float32)
+
+
+class ExactIndex:
+    """Vektörize tam kosinüs araması"""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def search(self, query, k, exclude=None):
+        scores = self.vectors @ query
+        if exclude is not None:
+            scores[exclude] = -np.inf
+        ids = _top_k(scores, k)
+        return ids, scores[ids]
+
+
+class IVFIndex:
+    """Saf NumPy ters dosya (IVF) indeksi - küresel k-means kümeleri üzerinde arama"""
+
+    def __init__(self, vectors, n_lists=None, n_probe=8, n_iter=10, train_size=100_000, seed=42):
+        self.vectors = vectors
+        self.n_probe = n_probe
+        n = len(vectors)
+        self.n_lists = n_lists or max(1, int(np.sqrt(n)))
+        rng = np.random.default_rng(seed)
+
+        # Küme merkezlerini örneklem üzerinde eğit
+        sample = vectors[rng.choice(n, size=min(n, train_size), replace=False)]
+        self.centroids = sample[rng.choice(len(sample), size=self.n_lists, replace=False)].copy()
+        for _ in range(n_iter):
+            assign = self._assign(sample)
+            sums = np.zeros_like(self.centroids)
+            np.add.at(sums, assign, sample)
+            counts = np.bincount(assign, minlength=self.n_lists)
+            filled = counts > 0
+            self.centroids[filled] = sums[filled] / counts[filled, None]
+            self.centroids = _normalize_rows(self.centroids)
+
+        # Tüm vektörleri listelere ata (liste başına ardışık indeks blokları)
+        assign = self._assign(vectors)
+        self.order = np.argsort(assign, kind='stable')
+        self.offsets = np.searchsorted(assign[self.order], np.arange(self.n_lists + 1))
+        # Sonradan eklenen/güncellenen vektörler: liste -> satır indeksleri
+        self.extra = {}
+        self._stale = False
+
+    def _assign(self, matrix, chunk_size=65_536):
+        """Her vektörü en yakın küme merkezine ata"""
+        assign = np.empty(len(matrix), dtype=np.int64)
+        for start in range(0, len(matrix), chunk_size):
+            block = matrix[start:start + chunk_size]
+            assign[start:start + chunk_size] = np.argmax(block @ self.centroids.T, axis=1)
+        return assign
+
+    def add(self, ids, vectors):
+        """Yeni veya güncellenmiş vektörleri mevcut kümelerine ekle (merkezler sabit)"""
+        assign = self._assign(vectors)
+        for c in np.unique(assign):
+            rows = ids[assign == c]
+            self.extra[c] = np.concatenate([self.extra[c], rows]) if c in self.extra else rows
+
+    def mark_updated(self):
+        """Güncellenen satırlar eski listelerinde de kalır; aramada tekilleştirilir"""
+        self._stale = True
+
+    def search(self, query, k, exclude=None):
+        lists = _top_k(self.centroids @ query, self.n_probe)
+        candidates = np.concatenate([
+            self.order[self.offsets[c]:self.offsets[c + 1]] for c in lists
+        ] + [self.extra[c] for c in lists if c in self.extra])
+        if self._stale:
+            candidates = np.unique(candidates)
+        if exclude is not None:
+            candidates = candidates[candidates != exclude]
+        scores = self.vectors[candidates] @ query
+        top = _top_k(scores, k)
+        return candidates[top], scores[top]
+
+
+class SimilarityIndex:
+    """Katalog boyutuna göre tam veya yaklaşık arama yapan benzerlik indeksi"""
+
+    def __init__(self, catalog, exact_limit=EXACT_SEARCH_LIMIT, **ivf_params):
+        matrix = np.column_stack([catalog.features[col] for col in FEATURE_COLUMNS])
+        self.scaler = FeatureScaler(matrix)
+        self.vectors = _normalize_rows(self.scaler.transform(matrix))
+        self._buffer = self.vectors
+        self.exact = ExactIndex(self.vectors)
+        self.ann = IVFIndex(self.vectors, **ivf_params) if len(matrix) > exact_limit else None
+
+    def _embed(self, matrix):
+        # Ölçekleyici yeniden eğitilmez; sıkıştırma sonrası yeniden oluşturmada güncellenir
+        return _normalize_rows(self.scaler.transform(np.asarray(matrix, dtype=np.float64)))
+
+    def _publish(self, size):
+        self.vectors = self._buffer[:size]
+        self.exact.vectors = self.vectors
+        if self.ann is not None:
+            self.ann.vectors = self.vectors
+
+    def add(self, matrix):
+        """Katalog sonuna eklenen satırların vektörlerini yerinde ekle"""
+        vectors = self._embed(matrix)
+        start = len(self.vectors)
+        end = start + len(vectors)
+        if len(self._buffer) < end:
+            grown = np.empty((max(end, 2 * len(self._buffer)), self._buffer.shape[1]), dtype=self._buffer.dtype)
+            grown[:start] = self.vectors
+            self._buffer = grown
+        self._buffer[start:end] = vectors
+        self._publish(end)
+        if self.ann is not None:
+            self.ann.add(np.arange(start, end), vectors)
+
+    def update(self, ids, matrix):
+        """Var olan satırların vektörlerini yerinde güncelle"""
+        vectors = self._embed(matrix)
+        self._buffer[ids] = vectors
+        if self.ann is not None:
+            self.ann.add(np.asarray(ids), vectors)
+            self.ann.mark_updated()
+
+    def query_vector(self, features):
+        """Ham özellik değerlerinden (sözlük veya liste) sorgu vektörü oluştur"""
+        if isinstance(features, dict):
+            features = [features[col] for col in FEATURE_COLUMNS]
+        row = np.asarray(features, dtype=np.float64).reshape(1, -1)
+        return _normalize_rows(self.scaler.transform(row))[0]
+
+    def search(self, query, k=5, exclude=None, exact=False):
+        """En benzer k şarkının satır indekslerini ve benzerlik skorlarını döndür"""
+        index = self.exact if exact or self.ann is None else self.ann
+        return index.search(query, k, exclude=exclude)
+
+    def __len__(self):
+        return len(self.vectors)
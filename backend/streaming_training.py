@@ -0,0 +1,173 @@
+"""
+Akışlı (out-of-core) Eğitim - Belleğe sığmayan kataloglarda parça parça float32 özellik + partial_fit
+
+1. geçiş: ölçekleyici momentleri (StandardScaler.partial_fit), sınıf sayıları ve sınıf başına
+   rezervuar örneklemeli holdout (satırların stream_holdout_fraction kadarı aday, en fazla
+   stream_holdout_rows satır). Sonraki geçişler (epoch): holdout dışındaki satırlarla
+   MLPClassifier.partial_fit. Tepe bellek parça boyutu + sabit boyutlu holdout ile sınırlıdır.
+"""
+
+import copy
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.neural_network import MLPClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from catalog_format import MappedCatalog, resolve_catalog_path
+from catalog_log import CatalogLog, log_path_for
+from catalog_store import FEATURE_COLUMNS
+
+
+def iter_catalog_chunks(data_path, chunk_rows, label_mapping):
+    """Kataloğu (CSV veya ikili) parça parça oku: (etiket kodları, (n, 8) float32 ham özellikler)
+
+    Henüz sıkıştırılmamış günlük kayıtları son parça olarak eklenir (upsert edilen
+    satırların eski hali de eğitimde kalır; sıkıştırmadan sonra düzelir).
+    """
+    path = resolve_catalog_path(data_path)
+    base_seq = 0
+    if path != data_path:
+        mapped = MappedCatalog(path)
+        base_seq = mapped.metadata.get('log_seq', 0)
+        # Sözlük kodu -> etiket kodu tablosu (bilinmeyen duygu -1)
+        dictionary = mapped.dictionaries['emotion']
+        lookup = np.array([label_mapping.get(str(dictionary[i]).lower(), -1) for i in range(len(dictionary))],
+                          dtype=np.int64)
+        for start in range(0, len(mapped), chunk_rows):
+            end = min(start + chunk_rows, len(mapped))
+            labels = lookup[mapped.codes['emotion'][start:end]]
+            matrix = np.column_stack([mapped.features[col][start:end] for col in FEATURE_COLUMNS]).astype(np.float32)
+            yield _drop_unknown(labels, matrix)
+    else:
+        dtypes = {col: np.float32 for col in FEATURE_COLUMNS}
+        for chunk in pd.read_csv(path, usecols=['emotion'] + FEATURE_COLUMNS, dtype=dtypes, chunksize=chunk_rows):
+            yield _frame_chunk(chunk, label_mapping)
+
+    tracks = [track for entry in CatalogLog(log_path_for(data_path), applied_seq=base_seq).sync()
+              for track in entry.get('tracks', [])]
+    if tracks:
+        yield _frame_chunk(pd.DataFrame(tracks), label_mapping)
+
+
+def _frame_chunk(frame, label_mapping):
+    labels = frame['emotion'].astype(str).str.lower().map(label_mapping).fillna(-1).to_numpy(np.int64)
+    return _drop_unknown(labels, frame[FEATURE_COLUMNS].to_numpy(np.float32))
+
+
+def _drop_unknown(labels, matrix):
+    known = labels >= 0
+    if known.all():
+        return labels, matrix
+    return labels[known], matrix[known]
+
+
+class StratifiedReservoir:
+    """Sınıf başına sabit kapasiteli rezervuar örneklemi (Algorithm R); holdout satır numaralarını da tutar"""
+
+    def __init__(self, n_classes, n_features, per_class, seed=0):
+        self.per_class = per_class
+        self.rng = np.random.default_rng(seed)
+        self.seen = np.zeros(n_classes, dtype=np.int64)
+        self.ids = np.full((n_classes, per_class), -1, dtype=np.int64)
+        self.X = np.zeros((n_classes, per_class, n_features), dtype=np.float32)
+
+    def offer(self, row_ids, labels, X):
+        """Parçadaki satırları sınıflarının rezervuarına sun"""
+        for c in np.unique(labels):
+            rows = np.flatnonzero(labels == c)
+            # Her satırın sınıf içindeki sıra numarası t: t < k ise doğrudan, değilse k/(t+1) olasılıkla girer
+            t = self.seen[c] + np.arange(len(rows))
+            slots = np.where(t < self.per_class, t, self.rng.integers(0, t + 1))
+            keep = slots < self.per_class
+            # Tekrarlanan slotlarda son atama kazanır (sıralı algoritmayla aynı sonuç)
+            self.ids[c, slots[keep]] = row_ids[rows[keep]]
+            self.X[c, slots[keep]] = X[rows[keep]]
+            self.seen[c] += len(rows)
+
+    def holdout_ids(self):
+        """Eğitimden çıkarılacak satır numaraları (sıralı)"""
+        return np.sort(self.ids[self.ids >= 0])
+
+    def data(self):
+        """Holdout matrisi ve etiketleri"""
+        filled = self.ids >= 0
+        return self.X[filled], np.nonzero(filled)[0]
+
+
+def train_streaming(data_path, features, extend, config, label_mapping, log=print):
+    """Kataloğu parça parça geçerek scaler + MLP pipeline'ı eğit; (pipeline, rapor) döndür
+
+    extend: (n, 8) ham matristen (n, len(features)) float32 eğitim matrisi üreten fonksiyon
+    """
+    n_classes = max(label_mapping.values()) + 1
+    classes = np.arange(n_classes)
+    chunk_rows = config['stream_chunk_rows']
+
+    def named(X):
+        # Ölçekleyici adlı sütunlarla eğitilir: DataFrame girdili tahminlerde özellik adları eşleşir
+        return pd.DataFrame(X, columns=features, copy=False)
+
+    def chunks():
+        offset = 0
+        for labels, raw in iter_catalog_chunks(data_path, chunk_rows, label_mapping):
+            yield np.arange(offset, offset + len(labels)), labels, extend(raw)[:, :len(features)]
+            offset += len(labels)
+
+    # 1. geçiş: ölçekleyici, sınıf sayıları, holdout rezervuarı
+    start = time.perf_counter()
+    scaler = StandardScaler()
+    reservoir = StratifiedReservoir(n_classes, len(features), config['stream_holdout_rows'] // n_classes,
+                                    seed=config['random_state'])
+    counts = np.zeros(n_classes, dtype=np.int64)
+    sampler = np.random.default_rng(config['random_state'])
+    for row_ids, labels, X in chunks():
+        scaler.partial_fit(named(X))
+        # Küçük kataloglarda holdout satırların yalnızca küçük bir kısmı olsun
+        offered = sampler.random(len(labels)) < config['stream_holdout_fraction']
+        reservoir.offer(row_ids[offered], labels[offered], X[offered])
+        counts += np.bincount(labels, minlength=n_classes)
+    if counts.sum() == 0:
+        raise ValueError("Katalogda eğitilecek satır yok")
+    holdout_ids = reservoir.holdout_ids()
+    X_holdout_raw, y_holdout = reservoir.data()
+    X_holdout = scaler.transform(named(X_holdout_raw))
+    log(f"   1. geçiş: {counts.sum():,} satır, holdout {len(holdout_ids):,} ({time.perf_counter() - start:.1f} sn)")
+
+    model = MLPClassifier(
+        hidden_layer_sizes=config['stream_hidden_layers'],
+        batch_size=config['stream_batch_size'],
+        random_state=config['random_state']
+    )
+    rng = np.random.default_rng(config['random_state'])
+    best, best_model, history = -1.0, None, []
+    for epoch in range(config['stream_epochs']):
+        start = time.perf_counter()
+        for row_ids, labels, X in chunks():
+            train = ~np.isin(row_ids, holdout_ids, assume_unique=True)
+            order = rng.permutation(np.flatnonzero(train))
+            if len(order):
+                model.partial_fit(scaler.transform(named(X[order])), labels[order], classes=classes)
+        accuracy = float((model.predict(X_holdout) == y_holdout).mean())
+        history.append(accuracy)
+        log(f"   Epoch {epoch + 1}: holdout doğruluğu {accuracy:.4f} ({time.perf_counter() - start:.1f} sn)")
+        improved = accuracy - best >= config['stream_tol']
+        if accuracy > best:
+            best, best_model = accuracy, copy.deepcopy(model)
+        # Erken durdurma: holdout iyileşmesi eşiğin altında kaldı
+        if not improved:
+            break
+
+    pipeline = Pipeline([('scaler', scaler), ('classifier', best_model)])
+    report = {
+        'rows': int(counts.sum()),
+        'class_counts': counts,
+        'holdout_rows': int(len(holdout_ids)),
+        'holdout_accuracy': best,
+        # Genişletilmiş matrisin ilk sütunları ham özelliklerdir
+        'holdout': (X_holdout_raw[:, :len(FEATURE_COLUMNS)], y_holdout),
+        'epochs': len(history)
+    }
+    return pipeline, report
@@ -0,0 +1,142 @@
+"""
+Ağaç Çıkarım Motoru - Eğitilmiş ağaç topluluklarını düz NumPy dizilerine derler
+"""
+
+import numpy as np
+
+
+class CompiledTreeEnsemble:
+    """GradientBoosting / RandomForest modellerinin scikit-learn'süz vektörize değerlendiricisi"""
+
+    # Düğüm gezinmesi önbelleğe sığan satır blokları halinde yapılır
+    CHUNK_ROWS = 256
+
+    def __init__(self, kind, feature, threshold, left, right, value, roots, classes,
+                 max_depth, learning_rate=1.0, init_raw=None, scaler_mean=None, scaler_scale=None):
+        self.kind = kind
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.classes = classes
+        self.max_depth = int(max_depth)
+        self.learning_rate = float(learning_rate)
+        self.init_raw = init_raw
+        self.scaler_mean = scaler_mean
+        self.scaler_scale = scaler_scale
+        # Çocuklar yan yana: düğüm i için sol = 2i, sağ = 2i + 1
+        self.children = np.column_stack([left, right]).astype(np.intp).ravel()
+        self.feature_idx = np.asarray(feature, dtype=np.intp)
+
+    @classmethod
+    def from_model(cls, model):
+        """Eğitilmiş Pipeline veya ağaç topluluğunu düz dizilere dönüştür"""
+        scaler_mean = scaler_scale = None
+        estimator = model
+        if hasattr(model, 'named_steps'):
+            scaler = model.named_steps.get('scaler')
+            if scaler is not None:
+                scaler_mean = np.asarray(scaler.mean_, dtype=np.float64)
+                scaler_scale = np.asarray(scaler.scale_, dtype=np.float64)
+            estimator = model.steps[-1][1]
+
+        if hasattr(estimator, 'loss') and hasattr(estimator, 'init_'):
+            # GradientBoosting: estimators_[aşama, sınıf] regresyon ağaçları
+            kind = 'gradient_boosting'
+            trees = [t.tree_ for t in estimator.estimators_.ravel()]
+            init_raw = estimator._raw_predict_init(np.zeros((1, estimator.n_features_in_)))[0]
+            learning_rate = estimator.learning_rate
+        elif hasattr(estimator, 'estimators_'):
+            # RandomForest: her ağaç sınıf oranları döndürür
+            kind = 'random_forest'
+            trees = [t.tree_ for t in estimator.estimators_]
+            init_raw = None
+            learning_rate = 1.0
+        else:
+            raise ValueError(f"Desteklenmeyen model: {type(estimator).__name__}")
+
+        sizes = np.array([t.node_count for t in trees])
+        roots = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+        feature, threshold, left, right, value = [], [], [], [], []
+        for tree, offset in zip(trees, roots):
+            is_leaf = tree.children_left == -1
+            nodes = np.arange(tree.node_count)
+            # Yapraklar kendine döner; sabit sayıda adımda tüm ağaçlar yaprağa ulaşır
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+            left.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+            right.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+            if kind == 'gradient_boosting':
+                value.append(tree.value[:, 0, 0])
+            else:
+                counts = tree.value[:, 0, :]
+                value.append(counts / counts.sum(axis=1, keepdims=True))
+
+        return cls(
+            kind=kind,
+            feature=np.concatenate(feature).astype(np.int64),
+            threshold=np.concatenate(threshold).astype(np.float64),
+            left=np.concatenate(left).astype(np.int64),
+            right=np.concatenate(right).astype(np.int64),
+            value=np.concatenate(value).astype(np.float64),
+            roots=roots,
+            classes=np.asarray(estimator.classes_),
+            max_depth=max(t.max_depth for t in trees),
+            learning_rate=learning_rate,
+            init_raw=init_raw,
+            scaler_mean=scaler_mean,
+            scaler_scale=scaler_scale
+        )
+
+    def _leaf_nodes(self, X):
+        """Her satır ve ağaç için ulaşılan yaprak düğüm indeksleri (n, ağaç)"""
+        if self.scaler_mean is not None:
+            X = (X - self.scaler_mean) / self.scaler_scale
+        # scikit-learn ağaçları eşikleri float32 girdiyle karşılaştırır
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        n_features = X.shape[1]
+        flat = X.ravel()
+        row_offsets = (np.arange(len(X), dtype=np.intp) * n_features)[:, None]
+        nodes = np.tile(self.roots.astype(np.intp), (len(X), 1))
+        for _ in range(self.max_depth):
+            columns = np.take(self.feature_idx, nodes)
+            columns += row_offsets
+            go_right = np.take(flat, columns) > np.take(self.threshold, nodes)
+            nodes *= 2
+            nodes += go_right
+            nodes = np.take(self.children, nodes)
+        return nodes
+
+    def predict_proba(self, X):
+        """Sınıf olasılıkları (sütunlar self.classes sırasında)"""
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        # NaN karşılaştırmaları sessizce sola gider; scikit-learn gibi reddedilir
+        if not np.isfinite(X).all():
+            raise ValueError("Girdi NaN veya sonsuz değer içeriyor")
+        if len(X) > self.CHUNK_ROWS:
+            return np.vstack([
+                self.predict_proba(X[start:start + self.CHUNK_ROWS])
+                for start in range(0, len(X), self.CHUNK_ROWS)
+            ])
+
+        leaves = self.value[self._leaf_nodes(X)]
+        if self.kind == 'random_forest':
+            return leaves.mean(axis=1)
+
+        # Aşamalar scikit-learn ile aynı sırada toplanır: init + lr*v0 + lr*v1 + ...
+        n_classes = len(self.init_raw)
+        stages = (self.learning_rate * leaves).reshape(len(X), -1, n_classes)
+        init = np.broadcast_to(self.init_raw, (len(X), 1, n_classes))
+        raw = np.concatenate([init, stages], axis=1).sum(axis=1)
+        if n_classes == 1:
+            positive = 1.0 / (1.0 + np.exp(-raw[:, 0]))
+            return np.column_stack([1.0 - positive, positive])
+        raw = raw - raw.max(axis=1, keepdims=True)
+        exp = np.exp(raw)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def predict(self, X):
+        """Sınıf etiketleri"""
+        return self.classes[self.predict_proba(X).argmax(axis=1)]
@@ -0,0 +1,150 @@
+"""
+Yükleme Sınıflandırıcı - CSV/NDJSON özellik yüklemelerini sabit boyutlu partilerle sınıflandırıp NDJSON akışı üretir
+"""
+
+import io
+import csv
+import json
+import codecs
+
+import numpy as np
+import pandas as pd
+
+from ml_emotion_classifier import BASE_FEATURES
+
+# Tek predict_proba çağrısındaki satır sayısı (bellek kullanımını sınırlar)
+STREAM_BATCH_ROWS = 4096
+
+# Tek satırın en fazla uzunluğu (karakter): satır sonu gelmeyen gövde belleği doldurmasın
+MAX_LINE_CHARS = 64 * 1024
+
+# Girdide varsa sonuca aynen kopyalanan alanlar
+PASSTHROUGH_FIELDS = ('id', 'title', 'artist')
+
+
+class UploadError(ValueError):
+    """Yükleme satırı ayrıştırılamadı"""
+
+    def __init__(self, row, message):
+        super().__init__(f"Satır {row}: {message}")
+        self.row = row
+
+
+def iter_lines(stream, max_line=MAX_LINE_CHARS):
+    """Bayt akışını UTF-8 metin satırlarına çevir (tamponlamadan; max_line'dan uzun satır UploadError)"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    pending = ''
+    line_no = 0
+    for chunk in stream:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split('\n')
+        for line in lines:
+            line_no += 1
+            if len(line) > max_line:
+                raise UploadError(line_no, f"satır {max_line} karakter sınırını aşıyor")
+            yield line
+        if len(pending) > max_line:
+            raise UploadError(line_no + 1, f"satır {max_line} karakter sınırını aşıyor")
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        if len(pending) > max_line:
+            raise UploadError(line_no + 1, f"satır {max_line} karakter sınırını aşıyor")
+        yield pending
+
+
+def _parse_error(row, exc):
+    return UploadError(row, f"geçersiz değer ({exc})")
+
+
+def _check_finite(first_row, matrix):
+    """NaN/inf içeren ilk satırı UploadError ile bildir (model bu satırları reddeder)"""
+    finite = np.isfinite(matrix).all(axis=1)
+    if not finite.all():
+        raise UploadError(first_row + int(finite.argmin()), "özellikler sonlu olmalı")
+    return matrix
+
+
+def iter_ndjson_batches(lines, batch_rows=STREAM_BATCH_ROWS):
+    """NDJSON satırlarını (ilk satır no, özellik matrisi, geçirilecek alanlar) partilerine topla"""
+    matrix = np.empty((batch_rows, len(BASE_FEATURES)), dtype=np.float64)
+    extras = []
+    row_no = n = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        row_no += 1
+        try:
+            record = json.loads(line)
+            matrix[n] = [float(record[col]) for col in BASE_FEATURES]
+        except KeyError as e:
+            raise UploadError(row_no, f"eksik özellik {e.args[0]}") from None
+        except (AttributeError, TypeError, ValueError) as e:
+            raise _parse_error(row_no, e) from None
+        extras.append({key: record[key] for key in PASSTHROUGH_FIELDS if key in record})
+        n += 1
+        if n == batch_rows:
+            yield row_no - n + 1, _check_finite(row_no - n + 1, matrix), extras
+            matrix = np.empty_like(matrix)
+            extras = []
+            n = 0
+    if n:
+        yield row_no - n + 1, _check_finite(row_no - n + 1, matrix[:n]), extras
+
+
+def iter_csv_batches(lines, batch_rows=STREAM_BATCH_ROWS):
+    """CSV satırlarını partiler halinde pandas C ayrıştırıcısıyla oku"""
+    try:
+        names = next(csv.reader([next(lines)]))
+    except StopIteration:
+        return
+    missing = [col for col in BASE_FEATURES if col not in names]
+    if missing:
+        raise UploadError(0, f"başlıkta eksik özellik {', '.join(missing)}")
+    passthrough = [key for key in PASSTHROUGH_FIELDS if key in names]
+
+    def parse(first_row, batch):
+        frame = pd.read_csv(io.StringIO('\n'.join(batch)), names=names, header=None, dtype=str,
+                            keep_default_na=False)
+        try:
+            matrix = frame[BASE_FEATURES].astype(np.float64).to_numpy()
+        except ValueError as e:
+            # Hatalı satırı bul
+            bad = frame[BASE_FEATURES].apply(pd.to_numeric, errors='coerce').isna().any(axis=1).to_numpy()
+            raise _parse_error(first_row + int(bad.argmax()), e) from None
+        return first_row, _check_finite(first_row, matrix), frame[passthrough].to_dict('records')
+
+    batch = []
+    row_no = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        row_no += 1
+        batch.append(line)
+        if len(batch) == batch_rows:
+            yield parse(row_no - len(batch) + 1, batch)
+            batch = []
+    if batch:
+        yield parse(row_no - len(batch) + 1, batch)
+
+
+def classify_stream(classifier, stream, fmt='ndjson', batch_rows=STREAM_BATCH_ROWS):
+    """Yüklemeyi partiler halinde sınıflandır; her satır için bir NDJSON satırı üret"""
+    batches = iter_csv_batches if fmt == 'csv' else iter_ndjson_batches
+    row = 0
+    try:
+        for first_row, matrix, extras in batches(iter_lines(stream), batch_rows):
+            emotions, proba, classes = classifier.predict_emotions(matrix, return_proba=True)
+            confidence = np.round(proba.max(axis=1), 4).tolist()
+            lines = []
+            for i, emotion in enumerate(emotions):
+                # Satır başına json.dumps yerine biçimlendirme; yalnızca geçirilen alanlar kodlanır
+                passthrough = json.dumps(extras[i], ensure_ascii=False)[1:-1] + ', ' if extras[i] else ''
+                lines.append(f'{{"row": {first_row + i}, {passthrough}"emotion": "{emotion}", '
+                             f'"confidence": {confidence[i]}}}')
+            row += len(emotions)
+            yield '\n'.join(lines) + '\n'
+    except UploadError as e:
+        # Başlıklar gönderildi; hata son satır olarak bildirilir
+        yield json.dumps({'error': str(e), 'row': e.row, 'classified': row}, ensure_ascii=False) + '\n'
+        return
+    yield json.dumps({'done': True, 'classified': row}) + '\n'
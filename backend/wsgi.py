@@ -0,0 +1,24 @@
+"""
+🎵 Üretim Sunucusu Giriş Noktası (WSGI)
+
+    cd backend && gunicorn -c gunicorn.conf.py wsgi:app
+
+Modeller ve katalog ana süreçte bir kez yüklenir (preload); işçiler fork ile
+aynı nesneleri copy-on-write olarak paylaşır. BACKGROUND_WARMUP=1 ile ana süreç
+hiçbir şey yüklemez: her işçi fork sonrası modelleri arka planda yükler, /api/health
+hemen yanıt verir, /api/ready yükleme bitince 200 döner (paylaşım yerine hızlı açılış).
+"""
+
+import gc
+
+import flask_app
+
+if not flask_app.BACKGROUND_WARMUP:
+    # Arka plan iş parçacıkları ana süreçte değil, her işçide post_fork'ta başlar
+    if not flask_app.init_models(start_threads=False):
+        raise RuntimeError("Modeller yüklenemedi")
+
+    # Yüklenen nesneleri GC taramasından çıkar: fork sonrası sayfalar gereksiz kopyalanmaz
+    gc.freeze()
+
+app = flask_app.app
@@ -0,0 +1,57 @@
+"""
+Toplu Tahmin Benchmark'ı - predict_emotions ve predict_emotion döngüsü karşılaştırması
+"""
+
+import os
+import sys
+import time
+import argparse
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+from ml_emotion_classifier import EmotionClassifier
+
+
+def random_features(n_rows, seed=42):
+    """Rastgele ham özellik matrisi (n, 8)"""
+    rng = np.random.default_rng(seed)
+    matrix = rng.random((n_rows, 8))
+    matrix[:, 3] = rng.uniform(50, 190, n_rows)  # tempo
+    return matrix
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Toplu tahmin benchmark')
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--loop-rows', type=int, default=500)
+    args = parser.parse_args()
+
+    # Sınıflandırıcı göreli yollar kullanır
+    os.chdir(BACKEND_DIR)
+    warnings.filterwarnings('ignore', category=UserWarning)
+
+    classifier = EmotionClassifier()
+    classifier.load_or_train()
+    matrix = random_features(args.rows)
+
+    start = time.perf_counter()
+    for row in matrix[:args.loop_rows]:
+        classifier.predict_emotion(row.tolist())
+    loop_rps = args.loop_rows / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    classifier.predict_emotions(matrix, return_proba=True)
+    batch_rps = args.rows / (time.perf_counter() - start)
+
+    print(f"📊 Model: {classifier.get_model_info().get('model_type')}")
+    print(f"   predict_emotion döngüsü: {loop_rps:,.0f} satır/sn ({args.loop_rows} satır)")
+    print(f"   predict_emotions toplu:  {batch_rps:,.0f} satır/sn ({args.rows} satır)")
+    print(f"   Hızlanma: {batch_rps / loop_rps:,.0f}x")
+
+
+if __name__ == '__main__':
+    main()
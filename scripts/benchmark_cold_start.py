@@ -0,0 +1,130 @@
+"""
+Soğuk Başlangıç Benchmark'ı - İçe aktarma süreleri ve ilk isteğe kadar geçen süre
+
+    python benchmark_cold_start.py
+    python benchmark_cold_start.py --runs 5 --modes eager warmup
+
+İçe aktarma süreleri her modül için ayrı, taze bir yorumlayıcıda ölçülür (ortak
+bağımlılıklar dahil). Sunucu ölçümünde backend gerçek bir HTTP sunucusu olarak
+başlatılır; süreç başlangıcından /api/health, /api/ready ve ilk öneri yanıtına kadar
+geçen süre kaydedilir. eager: modeller sunucu açılmadan yüklenir (varsayılan),
+warmup: BACKGROUND_WARMUP=1.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import subprocess
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+
+BACKEND = Path(__file__).resolve().parent.parent / 'backend'
+
+IMPORT_TARGETS = ['numpy', 'flask', 'flask_app', 'pandas', 'sklearn.pipeline', 'music_recommender',
+                  'ml_emotion_classifier']
+
+SERVER = """
+import sys
+import flask_app
+from werkzeug.serving import make_server
+if flask_app.BACKGROUND_WARMUP:
+    flask_app.start_warmup()
+elif not flask_app.init_models():
+    sys.exit(1)
+make_server('127.0.0.1', int(sys.argv[1]), flask_app.app, threaded=True).serve_forever()
+"""
+
+# İlk yanıt için en fazla bekleme (eğitim gerekirse uzun sürebilir)
+TIMEOUT = 600
+
+
+def import_seconds(module, runs):
+    """Taze yorumlayıcıda modülü içe aktarma süresi (medyan, sn)"""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    timings = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', code], cwd=BACKEND, capture_output=True, text=True,
+                             env={**os.environ, 'PYTHONWARNINGS': 'ignore'}, check=True).stdout
+        timings.append(float(out.strip().splitlines()[-1]))
+    return float(np.median(timings))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def request(url, body=None):
+    """(durum kodu, JSON gövde); bağlantı yoksa (None, None)"""
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(req, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b'{}')
+    except (urllib.error.URLError, ConnectionError, socket.timeout):
+        return None, None
+
+
+def time_to_first_request(mode):
+    """Süreç başlangıcından health / ready / ilk öneri yanıtına kadar geçen süreler (sn)"""
+    port = free_port()
+    base = f'http://127.0.0.1:{port}'
+    env = {**os.environ, 'PYTHONWARNINGS': 'ignore', 'BACKGROUND_WARMUP': '1' if mode == 'warmup' else '0'}
+    start = time.perf_counter()
+    server = subprocess.Popen([sys.executable, '-c', SERVER, str(port)], cwd=BACKEND, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    result = {}
+    try:
+        while 'recommendation' not in result and time.perf_counter() - start < TIMEOUT:
+            if server.poll() is not None:
+                raise RuntimeError(f"Sunucu çıktı (kod {server.returncode})")
+            if 'health' not in result and request(base + '/api/health')[0] == 200:
+                result['health'] = time.perf_counter() - start
+            status, body = request(base + '/api/ready')
+            if status == 200:
+                result.setdefault('ready', time.perf_counter() - start)
+                result['timings'] = body.get('timings', {})
+                if request(base + '/api/recommendations', {'emotion': 'happy'})[0] == 200:
+                    result['recommendation'] = time.perf_counter() - start
+            if status != 200:
+                time.sleep(0.005)
+    finally:
+        server.terminate()
+        server.wait()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Soğuk başlangıç benchmark')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--modes', nargs='+', default=['eager', 'warmup'], choices=['eager', 'warmup'])
+    args = parser.parse_args()
+
+    print(f"📊 İçe aktarma süreleri (taze yorumlayıcı, {args.runs} çalıştırma medyanı, bağımlılıklar dahil)")
+    for module in IMPORT_TARGETS:
+        print(f"   {module:<24} {import_seconds(module, args.runs) * 1000:>9.1f} ms")
+
+    print("\n📊 Süreç başlangıcından ilk yanıta (medyan)")
+    for mode in args.modes:
+        runs = [time_to_first_request(mode) for _ in range(args.runs)]
+        line = f"   {mode:<7}"
+        for key in ['health', 'ready', 'recommendation']:
+            values = [r[key] for r in runs if key in r]
+            line += f"  {key} {np.median(values):>6.3f} sn" if values else f"  {key} {'-':>6}   "
+        timings = runs[-1].get('timings', {})
+        if timings:
+            line += '  (' + ', '.join(f"{k} {v:.3f}" for k, v in timings.items()) + ')'
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
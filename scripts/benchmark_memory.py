@@ -0,0 +1,116 @@
+"""
+Bellek Benchmark'ı - İşçi başına yerleşik bellek (RSS) ölçümü
+
+    python benchmark_memory.py
+    python benchmark_memory.py --rows 200000 --scenarios train load binary
+
+Geçici dizinde sentetik katalog üretilir; her senaryo taze bir yorumlayıcıda
+flask_app.init_models() çalıştırır (bir işçinin açılışı) ve /proc/self/status'tan
+RSS değerlerini okur:
+    train   kayıtlı model yok, sınıflandırıcı süreç içinde eğitilir
+    load    model artifact'tan yüklenir (CSV katalog)
+    binary  model artifact'tan yüklenir, katalog bellek eşlemeli ikili dosyadan
+RssAnon işçiye özel bellektir; RssFile eşlenen dosyaların (işçiler arasında
+paylaşılan sayfa önbelleği) okunan kısmıdır.
+"""
+
+import io
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import subprocess
+import contextlib
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+WORKER = """
+import gc
+import json
+import sys
+
+def rss():
+    fields = {}
+    with open('/proc/self/status') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            if key in ('VmRSS', 'RssAnon', 'RssFile', 'VmHWM'):
+                fields[key] = int(value.split()[0]) * 1024
+    return fields
+
+import flask_app
+imported = rss()
+if not flask_app.init_models(background_training=False):
+    sys.exit(1)
+gc.collect()
+print(json.dumps({'imported': imported, 'ready': rss(), 'songs': len(flask_app.recommender.catalog)}))
+"""
+
+
+def run_worker(workdir):
+    """Taze yorumlayıcıda init_models çalıştır; RSS ölçümlerini döndür"""
+    env = {**os.environ, 'PYTHONWARNINGS': 'ignore', 'BACKGROUND_WARMUP': '0', 'PYTHONPATH': str(BACKEND)}
+    result = subprocess.run([sys.executable, '-c', WORKER], cwd=workdir / 'backend', env=env,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"İşçi başarısız:\n{result.stdout[-2000:]}\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def write_binary(workdir):
+    """CSV kataloğunu ikili formata dönüştür"""
+    os.chdir(workdir / 'backend')
+    from catalog_format import CatalogWriter, binary_path_for
+    from music_recommender import MusicRecommender
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        recommender = MusicRecommender()
+        with CatalogWriter(binary_path_for(recommender.data_path)) as writer:
+            for chunk in recommender.catalog.column_chunks():
+                writer.append(chunk)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='İşçi başına RSS benchmark')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--scenarios', nargs='+', default=['train', 'load', 'binary'],
+                        choices=['train', 'load', 'binary'])
+    args = parser.parse_args()
+
+    from data_simulation import create_large_music_emotion_dataset
+
+    # Backend göreli yolları (../data, models/) geçici dizine göre çözülür
+    workdir = Path(tempfile.mkdtemp(prefix='music-memory-'))
+    try:
+        (workdir / 'backend' / 'models').mkdir(parents=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_large_music_emotion_dataset(args.rows, output=str(workdir / 'data' / 'music_emotion.csv'),
+                                               seed=42, workers=os.cpu_count() or 1)
+
+        print(f"📊 İşçi RSS'i ({args.rows:,} şarkı, init_models sonrası)")
+        print(f"   {'senaryo':<8} {'içe aktarma':>12} {'VmRSS':>10} {'RssAnon':>10} {'RssFile':>10} {'tepe':>10}")
+        # Model yoksa ilk işçi eğitir; sonraki senaryolar kayıtlı artifact'ı yükler
+        if 'train' not in args.scenarios:
+            run_worker(workdir)
+        for scenario in ['train', 'load', 'binary']:
+            if scenario not in args.scenarios:
+                continue
+            if scenario == 'binary':
+                # Veri özeti ikili dosyadan hesaplanır: model önce bir kez yeniden eğitilir
+                write_binary(workdir)
+                run_worker(workdir)
+            result = run_worker(workdir)
+            imported, ready = result['imported'], result['ready']
+            print(f"   {scenario:<8} {imported['VmRSS'] / 1e6:>9.1f} MB {ready['VmRSS'] / 1e6:>7.1f} MB "
+                  f"{ready['RssAnon'] / 1e6:>7.1f} MB {ready['RssFile'] / 1e6:>7.1f} MB {ready['VmHWM'] / 1e6:>7.1f} MB")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
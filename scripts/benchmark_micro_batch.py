@@ -0,0 +1,134 @@
+"""
+Mikro Toplama Benchmark'ı - Eşzamanlı tek satırlık sınıflandırmada verim ve gecikme
+
+    python benchmark_micro_batch.py
+    python benchmark_micro_batch.py --concurrency 1 16 64 --max-batch 64 --max-wait-ms 0 1 2
+    python benchmark_micro_batch.py --rows 100000        # büyük katalog modeli (HistGradientBoosting)
+
+Her eşzamanlılık düzeyinde istemci iş parçacıkları süre dolana kadar tek satır
+sınıflandırır: 'direct' her istek için ayrı predict_emotions çağrısı, 'batch' ise
+MicroBatcher üzerinden (flask_app.detect_emotion ile aynı yol). Backend'in kayıtlı
+modeli kullanılır (yoksa eğitilir); --rows verilirse geçici dizinde üretilen o boyuttaki
+katalogla eğitilir. Uçtan uca HTTP ölçümü için:
+MICRO_BATCH=1 ile sunucuyu başlatıp `python load_test.py --features` çalıştırın.
+"""
+
+import io
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import warnings
+import threading
+import contextlib
+from pathlib import Path
+
+import numpy as np
+
+BACKEND = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from micro_batch import MicroBatcher
+from ml_emotion_classifier import EmotionClassifier
+from data_simulation import create_large_music_emotion_dataset
+
+
+def run_level(classify, concurrency, duration, rows):
+    """concurrency iş parçacığıyla duration saniye boyunca tek satır sınıflandır"""
+    latencies = [[] for _ in range(concurrency)]
+    deadline = time.perf_counter() + duration
+
+    def client(i):
+        j = i
+        while time.perf_counter() < deadline:
+            row = rows[j % len(rows)]
+            j += concurrency
+            start = time.perf_counter()
+            classify(row)
+            latencies[i].append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    lat = np.concatenate([np.array(l) for l in latencies])
+    return {
+        'throughput': len(lat) / elapsed,
+        'p50': float(np.percentile(lat, 50)),
+        'p99': float(np.percentile(lat, 99))
+    }
+
+
+def main():
+    warnings.simplefilter('ignore', UserWarning)
+    parser = argparse.ArgumentParser(description='Mikro toplama verim/gecikme benchmark')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 64])
+    parser.add_argument('--max-batch', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, nargs='+', default=[0.0, 1.0, 2.0])
+    parser.add_argument('--duration', type=float, default=3.0)
+    parser.add_argument('--rows', type=int, default=None, help='Bu boyutta sentetik katalogla eğit')
+    args = parser.parse_args()
+
+    workdir = None
+    if args.rows:
+        # Backend göreli yolları (../data, models/) geçici dizine göre çözülür
+        workdir = Path(tempfile.mkdtemp(prefix='music-batch-'))
+        (workdir / 'backend' / 'models').mkdir(parents=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_large_music_emotion_dataset(args.rows, output=str(workdir / 'data' / 'music_emotion.csv'),
+                                               seed=42, workers=os.cpu_count() or 1)
+        os.chdir(workdir / 'backend')
+    else:
+        os.chdir(BACKEND)
+    try:
+        classifier = EmotionClassifier()
+        with contextlib.redirect_stdout(io.StringIO()):
+            classifier.load_or_train()
+        benchmark(classifier, args)
+    finally:
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+def benchmark(classifier, args):
+    """Her yapılandırma ve eşzamanlılık düzeyi için bir satır yazdır"""
+    rng = np.random.default_rng(0)
+    rows = rng.random((1024, 8))
+    rows[:, 3] = rng.uniform(40, 200, len(rows))  # tempo
+
+    def direct(row):
+        return classifier.predict_emotions(row.reshape(1, -1), return_proba=True)
+
+    def predict_rows(matrix):
+        emotions, proba, classes = classifier.predict_emotions(matrix, return_proba=True)
+        return [(emotion, p, classes) for emotion, p in zip(emotions, proba)]
+
+    configs = [('direct', direct, None)]
+    for wait in args.max_wait_ms:
+        batcher = MicroBatcher(predict_rows, args.max_batch, wait)
+        configs.append((f'batch {args.max_batch}/{wait:g}ms', batcher.submit, batcher))
+
+    print(f"📊 Tek satır sınıflandırma ({classifier.get_model_info().get('model_type')}), "
+          f"her düzey {args.duration:g} sn")
+    print(f"   {'yapılandırma':<18} {'eşzamanlı':>9} {'istek/sn':>10} {'p50 ms':>8} {'p99 ms':>8} {'ort. parti':>10}")
+    for name, classify, batcher in configs:
+        for concurrency in args.concurrency:
+            before = batcher.stats() if batcher else None
+            result = run_level(classify, concurrency, args.duration, rows)
+            mean_batch = '-'
+            if batcher:
+                after = batcher.stats()
+                batches = after['batches'] - before['batches']
+                mean_batch = f"{(after['items'] - before['items']) / max(batches, 1):.1f}"
+            print(f"   {name:<18} {concurrency:>9} {result['throughput']:>10,.0f} {result['p50']:>8.3f} "
+                  f"{result['p99']:>8.3f} {mean_batch:>10}")
+
+
+if __name__ == '__main__':
+    main()
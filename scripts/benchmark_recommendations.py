@@ -0,0 +1,170 @@
+"""
+Öneri Benchmark'ı - CSV okuma (eski) ve bellek içi katalog (yeni) karşılaştırması
+"""
+
+import sys
+import json
+import time
+import tempfile
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+from catalog_store import CatalogStore, EMOTION_MAPPING
+from ranking import DiverseRanker
+from fast_json import orjson
+
+EMOTIONS = ['happy', 'sad', 'angry', 'calm', 'energetic', 'romantic', 'neutral']
+
+
+def make_catalog(n_rows, seed=42):
+    """Benchmark için rastgele katalog oluştur"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'title': np.char.add('Song ', rng.integers(0, 5000, n_rows).astype(str)),
+        'artist': np.char.add('Artist ', rng.integers(0, 500, n_rows).astype(str)),
+        'emotion': rng.choice(EMOTIONS, n_rows),
+        'danceability': rng.random(n_rows),
+        'energy': rng.random(n_rows),
+        'valence': rng.random(n_rows),
+        'tempo': rng.uniform(50, 190, n_rows),
+        'acousticness': rng.random(n_rows),
+        'instrumentalness': rng.random(n_rows),
+        'liveness': rng.random(n_rows),
+        'speechiness': rng.random(n_rows)
+    })
+
+
+def legacy_recommend(csv_path, emotion):
+    """Eski istek yolu: her istekte CSV okuma + tam tablo tarama"""
+    df = pd.read_csv(csv_path)
+    filtered_df = df[df['emotion'].str.lower() == emotion.lower()]
+    if len(filtered_df) == 0:
+        similar_emotions = EMOTION_MAPPING.get(emotion.lower(), [emotion])
+        filtered_df = df[df['emotion'].str.lower().isin(similar_emotions)]
+    if len(filtered_df) == 0:
+        filtered_df = df
+    sample = filtered_df.sample(min(5, len(filtered_df)))
+    return [
+        {
+            'title': row['title'],
+            'artist': row['artist'],
+            'emotion': row['emotion'],
+            'features': {
+                'danceability': round(row['danceability'], 3),
+                'energy': round(row['energy'], 3),
+                'valence': round(row['valence'], 3),
+                'tempo': round(row['tempo'], 1)
+            }
+        }
+        for _, row in sample.iterrows()
+    ]
+
+
+def store_recommend(store, emotion):
+    """Yeni istek yolu: önceden indekslenmiş havuzdan O(k) seçim"""
+    return store.records(store.sample(emotion, 5))
+
+
+def ranked_recommend(store, ranker, emotion):
+    """Çeşitlilik sıralamalı yol: aday örnekleme + profil skoru + MMR"""
+    return store.records(ranker.select(emotion, 5))
+
+
+def row_records(store, indices):
+    """Eski serileştirme: satır başına sözlük erişimi + round, ardından ikinci geçişte ortalamalar"""
+    recommendations = []
+    for i in indices:
+        recommendations.append({
+            'title': store.titles[i],
+            'artist': store.artists[i],
+            'emotion': store.emotions[i],
+            'features': {
+                'danceability': round(float(store.features['danceability'][i]), 3),
+                'energy': round(float(store.features['energy'][i]), 3),
+                'valence': round(float(store.features['valence'][i]), 3),
+                'tempo': round(float(store.features['tempo'][i]), 1)
+            }
+        })
+    stats = {
+        'avg_danceability': round(sum(r['features']['danceability'] for r in recommendations) / len(recommendations), 3),
+        'avg_energy': round(sum(r['features']['energy'] for r in recommendations) / len(recommendations), 3)
+    }
+    return recommendations, stats
+
+
+def serialization_us(store, build, encode, n, repeats):
+    """n öneri için yanıt oluşturma + JSON kodlama süresi (µs/istek)"""
+    samples = [store.sample('happy', n) for _ in range(repeats)]
+    start = time.perf_counter()
+    for indices in samples:
+        recommendations, stats = build(indices)
+        encode({'recommendations': recommendations, 'stats': stats})
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def duplicate_rate(store, select, n_requests=2000):
+    """Aynı başlık veya sanatçıyı birden fazla içeren yanıtların oranı"""
+    duplicates = 0
+    for i in range(n_requests):
+        indices = select(EMOTIONS[i % len(EMOTIONS)])
+        titles = {store.titles[j] for j in indices}
+        artists = {store.artists[j] for j in indices}
+        duplicates += len(titles) < len(indices) or len(artists) < len(indices)
+    return duplicates / n_requests
+
+
+def requests_per_sec(fn, n_requests):
+    """Verilen fonksiyonu n kez çağırıp istek/saniye döndür"""
+    start = time.perf_counter()
+    for i in range(n_requests):
+        fn(EMOTIONS[i % len(EMOTIONS)])
+    elapsed = time.perf_counter() - start
+    return n_requests / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Öneri yolu benchmark')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--legacy-requests', type=int, default=5)
+    parser.add_argument('--store-requests', type=int, default=20_000)
+    args = parser.parse_args()
+
+    df = make_catalog(args.rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / 'music_emotion.csv'
+        df.to_csv(csv_path, index=False)
+
+        legacy_rps = requests_per_sec(lambda e: legacy_recommend(csv_path, e), args.legacy_requests)
+
+    start = time.perf_counter()
+    store = CatalogStore(df)
+    build_s = time.perf_counter() - start
+    store_rps = requests_per_sec(lambda e: store_recommend(store, e), args.store_requests)
+    ranker = DiverseRanker(store)
+    ranked_rps = requests_per_sec(lambda e: ranked_recommend(store, ranker, e), args.store_requests)
+
+    print(f"📊 Katalog: {args.rows:,} şarkı")
+    print(f"   Eski yol (CSV her istekte): {legacy_rps:,.2f} istek/sn")
+    print(f"   Katalog deposu (kuruluş {build_s:.2f} sn): {store_rps:,.0f} istek/sn")
+    print(f"   Hızlanma: {store_rps / legacy_rps:,.0f}x")
+    print(f"   Çeşitlilik sıralamalı: {ranked_rps:,.0f} istek/sn")
+    print(f"   Tekrarlı yanıt oranı: rastgele %{100 * duplicate_rate(store, lambda e: store.sample(e, 5)):.1f}, "
+          f"sıralamalı %{100 * duplicate_rate(store, lambda e: ranker.select(e, 5)):.1f}")
+
+    # Serileştirme: satır başına (eski) ve sütun dilimleri + hızlı kodlayıcı (yeni)
+    std_json = lambda payload: json.dumps(payload, sort_keys=True)
+    fast_json = (lambda payload: orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)) if orjson else std_json
+    for n in (5, 50, 500):
+        repeats = max(50, 20_000 // n)
+        old_us = serialization_us(store, lambda idx: row_records(store, idx), std_json, n, repeats)
+        new_us = serialization_us(store, lambda idx: store.records(idx, return_stats=True), fast_json, n, repeats)
+        print(f"   Serileştirme n={n}: satır başına + json {old_us:,.0f} µs, "
+              f"vektörize + {'orjson' if orjson else 'json'} {new_us:,.0f} µs ({old_us / new_us:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
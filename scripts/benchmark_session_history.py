@@ -0,0 +1,67 @@
+"""
+Oturum Geçmişi Benchmark'ı - Bir milyon aktif kullanıcı için bellek, gecikme ve yanlış pozitif oranı
+"""
+
+import sys
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+from session_history import SessionHistory
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Oturum geçmişi bellek/gecikme benchmark')
+    parser.add_argument('--users', type=int, default=1_000_000)
+    parser.add_argument('--plays', type=int, default=20, help='Kullanıcı başına sunulan şarkı')
+    parser.add_argument('--bits', type=int, default=1024)
+    parser.add_argument('--catalog', type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    tracemalloc.start()
+    history = SessionHistory(max_users=args.users, bits=args.bits)
+
+    for user in range(args.users):
+        history.add(f'user-{user}', rng.integers(0, args.catalog, args.plays))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Gecikme tracemalloc kapalıyken ölçülür (izleme tahsisleri yavaşlatır)
+    plays = rng.integers(0, args.catalog, (100_000, args.plays))
+    start = time.perf_counter()
+    for i in range(len(plays)):
+        history.add(f'user-{i}', plays[i])
+    add_us = (time.perf_counter() - start) / len(plays) * 1e6
+
+    # Sorgu gecikmesi: tipik aday kümesi (64 şarkı)
+    candidates = rng.integers(0, args.catalog, 64)
+    n_queries = 20_000
+    start = time.perf_counter()
+    for i in range(n_queries):
+        history.contains(f'user-{i % args.users}', candidates)
+    contains_us = (time.perf_counter() - start) / n_queries * 1e6
+
+    # Yanlış pozitif oranı: filtrenin doluluk sınırına kadar eklenmiş kullanıcı
+    probe = SessionHistory(max_users=1, bits=args.bits)
+    probe.add('probe', np.arange(probe.max_items))
+    fp_full = probe.contains('probe', np.arange(10**6, 2 * 10**6)).mean()
+    probe = SessionHistory(max_users=1, bits=args.bits)
+    probe.add('probe', np.arange(args.plays))
+    fp_plays = probe.contains('probe', np.arange(10**6, 2 * 10**6)).mean()
+
+    stats = history.stats()
+    print(f"📊 Oturum geçmişi: {args.users:,} kullanıcı x {args.plays} şarkı, {args.bits} bit/kullanıcı")
+    print(f"   Toplam bellek (tracemalloc): {current / 1e6:,.1f} MB ({current / args.users:,.0f} B/kullanıcı)")
+    print(f"   Filtre dizileri: {stats['array_bytes'] / 1e6:,.1f} MB, geri kalanı kullanıcı sözlüğü ve anahtarlar")
+    print(f"   add: {add_us:.1f} µs/istek, contains(64 aday): {contains_us:.1f} µs/istek")
+    print(f"   Yanlış pozitif: {args.plays} şarkıda %{100 * fp_plays:.3f}, "
+          f"{probe.max_items} şarkıda (sıfırlama sınırı) %{100 * fp_full:.2f}")
+
+
+if __name__ == '__main__':
+    main()
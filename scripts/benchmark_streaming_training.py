@@ -0,0 +1,76 @@
+"""
+Akışlı Eğitim Benchmark'ı - Katalog boyutu büyürken tepe belleğin parça boyutuyla sınırlı kaldığını ölç
+
+    python benchmark_streaming_training.py --rows 1000000 4000000 --chunk-rows 250000
+"""
+
+import io
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+# Aşama raporunda Python tahsis tepesi (peak_bytes) için tracemalloc izlemesini aç
+os.environ.setdefault('TRAINING_TRACE_MEMORY', '1')
+
+from data_simulation import create_large_music_emotion_dataset
+from ml_emotion_classifier import EmotionClassifier, STREAMING_CONFIG
+
+
+def run(n_rows, chunk_rows, compare_memory):
+    workdir = Path(tempfile.mkdtemp(prefix='music-stream-'))
+    previous_cwd = os.getcwd()
+    try:
+        (workdir / 'backend' / 'models').mkdir(parents=True)
+        csv_path = workdir / 'data' / 'music_emotion.csv'
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_large_music_emotion_dataset(n_rows, output=str(csv_path), seed=42, workers=os.cpu_count() or 1)
+        os.chdir(workdir / 'backend')
+
+        STREAMING_CONFIG.update(mode='1', stream_chunk_rows=chunk_rows)
+        classifier = EmotionClassifier()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            classifier.load_or_train()
+        elapsed = time.perf_counter() - start
+        stage = next(entry for entry in classifier.training_report if entry['stage'] == 'stream_train')
+        info = classifier.get_model_info()
+
+        line = (f"   {n_rows:>11,} satır ({csv_path.stat().st_size / 1e6:,.0f} MB CSV): akışlı tepe "
+                f"{stage['peak_bytes'] / 1e6:,.1f} MB, {elapsed:,.1f} sn, {info['model_type']} "
+                f"holdout {stage['holdout_accuracy']:.3f}")
+        if compare_memory:
+            # Karşılaştırma: bellek içi prepare_data (tüm CSV + türetilmiş float64 sütunlar)
+            tracemalloc.start()
+            with contextlib.redirect_stdout(io.StringIO()):
+                EmotionClassifier().prepare_data()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            line += f" | bellek içi prepare_data tepe {peak / 1e6:,.1f} MB"
+        print(line)
+    finally:
+        os.chdir(previous_cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Akışlı eğitim bellek benchmark')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 4_000_000])
+    parser.add_argument('--chunk-rows', type=int, default=STREAMING_CONFIG['stream_chunk_rows'])
+    parser.add_argument('--no-compare', action='store_true', help='Bellek içi prepare_data ölçülmesin')
+    args = parser.parse_args()
+
+    print(f"📊 Akışlı eğitim, parça {args.chunk_rows:,} satır")
+    for n_rows in args.rows:
+        run(n_rows, args.chunk_rows, not args.no_compare)
+
+
+if __name__ == '__main__':
+    main()
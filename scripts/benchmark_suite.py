@@ -0,0 +1,272 @@
+"""
+Benchmark Paketi - Öneri, sınıflandırma, eğitim ve katalog yükleme; JSON çıktı + taban çizgisiyle karşılaştırma
+
+    python benchmark_suite.py                               # 1k, 100k, 1M satır
+    python benchmark_suite.py --sizes 1000 100000 --save-baseline
+    python benchmark_suite.py --output results.json         # taban çizgisine göre gerilemede çıkış kodu 1
+
+Kataloglar scripts/data_simulation.py ile sabit tohumla üretilir; her boyut geçici bir
+dizinde (data/ + backend/models/) çalışır, depodaki veri ve modellere dokunulmaz.
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import warnings
+import platform
+import tempfile
+import subprocess
+import contextlib
+from pathlib import Path
+from datetime import datetime, timezone
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'backend'))
+sys.path.insert(0, str(ROOT / 'scripts'))
+
+from data_simulation import create_large_music_emotion_dataset
+from music_recommender import MusicRecommender
+from ml_emotion_classifier import EmotionClassifier, BASE_FEATURES
+import flask_app
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+DEFAULT_BASELINE = ROOT / 'scripts' / 'benchmark_baseline.json'
+EMOTIONS = ['happy', 'sad', 'angry', 'calm', 'energetic', 'romantic', 'neutral']
+SEED = 42
+
+# Medyan bu oranın üzerinde yavaşlarsa gerileme sayılır
+DEFAULT_THRESHOLD = 0.25
+
+# Bu süreden (ms) küçük farklar ölçüm gürültüsü sayılır
+NOISE_FLOOR_MS = 0.05
+
+# Yükleme ölçümlerinin tekrar sayısı; daha az tekrarlı (tek ölçüm) sonuçlar karşılaştırılmaz
+LOAD_RUNS = 3
+MIN_COMPARE_RUNS = 3
+
+# Bellek eşlemeli ikili yükleme milisaniye altı sürer: medyan için daha çok tekrar
+BINARY_LOAD_RUNS = 20
+
+
+@contextlib.contextmanager
+def quiet():
+    """Backend'in ilerleme çıktılarını bastır"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def measure(fn, runs, warmup=1):
+    """fn'i runs kez çalıştır; çağrı başına süre dağılımını (ms) döndür"""
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings = np.array(timings)
+    return {
+        'median_ms': round(float(np.median(timings)), 4),
+        'p95_ms': round(float(np.percentile(timings, 95)), 4),
+        'min_ms': round(float(timings.min()), 4),
+        'runs': runs
+    }
+
+
+def cycle(items):
+    """Her çağrıda sıradaki öğeyi döndüren fonksiyon"""
+    state = {'i': 0}
+
+    def next_item():
+        state['i'] += 1
+        return items[state['i'] % len(items)]
+
+    return next_item
+
+
+def environment():
+    """Sonuçların karşılaştırılabilirliği için ortam bilgisi"""
+    import sklearn
+    import pandas as pd
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def run_size(n_rows, workdir, train_max_rows, quick):
+    """Tek katalog boyutu için tüm benchmark'lar"""
+    results = {}
+    data_dir = workdir / 'data'
+    backend_dir = workdir / 'backend'
+    (backend_dir / 'models').mkdir(parents=True)
+    csv_path = data_dir / 'music_emotion.csv'
+    load_runs = LOAD_RUNS
+    request_runs = 200 if quick else 2000
+
+    def record(name, stats):
+        results[name] = stats
+        print(f"   {name:<28} medyan {stats['median_ms']:>10.3f} ms   p95 {stats['p95_ms']:>10.3f} ms")
+
+    # Backend göreli yolları (../data, models/) geçici dizine göre çözülür
+    previous_cwd = os.getcwd()
+    os.chdir(backend_dir)
+    try:
+        with quiet():
+            start = time.perf_counter()
+            create_large_music_emotion_dataset(n_rows, output=str(csv_path), seed=SEED, workers=os.cpu_count() or 1)
+        print(f"   (katalog üretimi {time.perf_counter() - start:.1f} sn)")
+
+        # Katalog yükleme: CSV ayrıştırma + sütunsal depo ve duygu indeksi
+        with quiet():
+            stats = measure(MusicRecommender, load_runs, warmup=0)
+            recommender = MusicRecommender()
+        record('load_catalog_csv', stats)
+
+        # Eğitim verisi hazırlama
+        classifier = EmotionClassifier()
+        with quiet():
+            stats = measure(classifier.prepare_data, load_runs, warmup=0)
+        record('prepare_data', stats)
+
+        # Model eğitimi (büyük kataloglarda --train-max-rows ile atlanabilir)
+        if n_rows <= train_max_rows:
+            with quiet():
+                stats = measure(classifier.train_advanced_model, 1, warmup=0)
+            record('train_advanced_model', stats)
+        else:
+            print(f"   {'train_advanced_model':<28} atlandı (--train-max-rows {train_max_rows:,})")
+            # Tahmin ölçümleri için küçük bir örneklemle eğit
+            classifier.df = classifier.df.sample(min(len(classifier.df), 100_000), random_state=SEED)
+            with quiet():
+                classifier.train_advanced_model()
+
+        rng = np.random.default_rng(SEED)
+        rows = classifier.df[BASE_FEATURES].to_numpy()
+        singles = [rows[i].tolist() for i in rng.integers(0, len(rows), 256)]
+        batch = rows[rng.integers(0, len(rows), 10_000)]
+        record('predict_emotion', measure(lambda r=cycle(singles): classifier.predict_emotion(r()), request_runs))
+        record('predict_emotions_10k', measure(lambda: classifier.predict_emotions(batch), 5 if quick else 20))
+
+        # Öneri: doğrudan çağrı ve Flask test istemcisi üzerinden tam istek
+        record('recommend_by_emotion', measure(lambda e=cycle(EMOTIONS): recommender.recommend_by_emotion(e()),
+                                               request_runs))
+        flask_app.recommender = recommender
+        flask_app.classifier = classifier
+        flask_app.response_cache.invalidate()
+        client = flask_app.app.test_client()
+
+        def post(body):
+            response = client.post('/api/recommendations', json=body)
+            assert response.status_code == 200, response.get_data(as_text=True)
+
+        record('api_recommendations', measure(lambda e=cycle(EMOTIONS): post({'emotion': e()}), request_runs))
+        record('api_recommendations_n50', measure(lambda e=cycle(EMOTIONS): post({'emotion': e(), 'n': 50}),
+                                                  request_runs // 4))
+        feature_bodies = [{'features': dict(zip(BASE_FEATURES, row))} for row in singles]
+        record('api_recommendations_features', measure(lambda b=cycle(feature_bodies): post(b()), request_runs // 4))
+        record('api_stats', measure(lambda: client.get('/api/stats'), request_runs))
+
+        # İkili katalog: bellek eşlemeli yükleme (aynı tohumla aynı veri)
+        with quiet():
+            create_large_music_emotion_dataset(n_rows, output=str(data_dir / 'music_emotion.bin'), seed=SEED,
+                                               workers=os.cpu_count() or 1)
+            stats = measure(MusicRecommender, BINARY_LOAD_RUNS, warmup=1)
+        record('load_catalog_binary', stats)
+    finally:
+        os.chdir(previous_cwd)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Taban çizgisine göre medyan oranları; gerilemelerin listesini döndür"""
+    regressions = []
+    print(f"\n📊 Taban çizgisi karşılaştırması (eşik +%{threshold * 100:.0f})")
+    for size, benches in results.items():
+        base_benches = baseline.get('results', {}).get(size, {})
+        for name, stats in benches.items():
+            base = base_benches.get(name)
+            if base is None:
+                continue
+            if min(stats['runs'], base['runs']) < MIN_COMPARE_RUNS:
+                print(f"   ⚠️ {size:>9} {name:<28} {min(stats['runs'], base['runs'])} ölçüm, karşılaştırılmadı")
+                continue
+            ratio = stats['median_ms'] / max(base['median_ms'], 1e-9)
+            slower = ratio > 1 + threshold and stats['median_ms'] - base['median_ms'] > NOISE_FLOOR_MS
+            mark = '❌' if slower else '✅'
+            print(f"   {mark} {size:>9} {name:<28} {base['median_ms']:>10.3f} -> {stats['median_ms']:>10.3f} ms "
+                  f"({ratio:.2f}x)")
+            if slower:
+                regressions.append({'size': size, 'benchmark': name, 'baseline_ms': base['median_ms'],
+                                    'current_ms': stats['median_ms'], 'ratio': round(ratio, 3)})
+    return regressions
+
+
+def main():
+    # Tekrarlanan sklearn uyarıları çıktıyı boğmasın ve ölçümü etkilemesin
+    warnings.simplefilter('ignore', UserWarning)
+    parser = argparse.ArgumentParser(description='Performans benchmark paketi')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--output', default=None, help='Sonuç JSON dosyası (varsayılan: stdout)')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE))
+    parser.add_argument('--save-baseline', action='store_true', help='Sonuçları taban çizgisi olarak kaydet')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--train-max-rows', type=int, default=max(DEFAULT_SIZES),
+                        help='Bu boyuttan büyük kataloglarda eğitim ölçülmez')
+    parser.add_argument('--quick', action='store_true', help='Daha az tekrar (duman testi)')
+    args = parser.parse_args()
+
+    results = {}
+    for n_rows in args.sizes:
+        print(f"⏱️ Katalog {n_rows:,} şarkı")
+        workdir = Path(tempfile.mkdtemp(prefix='music-bench-'))
+        try:
+            results[str(n_rows)] = run_size(n_rows, workdir, args.train_max_rows, args.quick)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {'environment': environment(), 'threshold': args.threshold, 'results': results}
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps({'environment': report['environment'], 'results': results}, indent=2) + '\n')
+        print(f"✅ Taban çizgisi kaydedildi: {baseline_path}")
+    elif baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text())
+        report['baseline_environment'] = baseline.get('environment')
+        report['regressions'] = compare(results, baseline, args.threshold)
+    else:
+        print(f"⚠️ Taban çizgisi bulunamadı: {baseline_path} (--save-baseline ile oluşturun)")
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(payload + '\n')
+        print(f"✅ Sonuçlar yazıldı: {args.output}")
+    else:
+        print(payload)
+
+    if report.get('regressions'):
+        print(f"❌ {len(report['regressions'])} benchmark gerilemesi")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
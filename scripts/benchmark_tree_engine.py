@@ -0,0 +1,61 @@
+"""
+Çıkarım Motoru Benchmark'ı - Derlenmiş ağaçlar ve Pipeline.predict gecikme karşılaştırması
+"""
+
+import os
+import sys
+import time
+import argparse
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+from ml_emotion_classifier import EmotionClassifier, extend_features
+from benchmark_batch_prediction import random_features
+
+
+def latency_us(fn, X, repeats):
+    """Tek çağrı gecikmesi (mikrosaniye, medyan)"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(X)
+        timings.append((time.perf_counter() - start) * 1e6)
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Çıkarım motoru benchmark')
+    parser.add_argument('--batch', type=int, default=10_000)
+    parser.add_argument('--repeats', type=int, default=200)
+    args = parser.parse_args()
+
+    os.chdir(BACKEND_DIR)
+    warnings.filterwarnings('ignore', category=UserWarning)
+
+    classifier = EmotionClassifier()
+    classifier.load_or_train()
+    if classifier.engine is None:
+        print("❌ Çıkarım motoru derlenemedi")
+        return
+
+    X = extend_features(random_features(args.batch))[:, :len(classifier.features)]
+    frame = pd.DataFrame(X, columns=classifier.features)
+    row, row_frame = X[:1], frame.iloc[:1]
+
+    identical = np.array_equal(classifier.engine.predict_proba(X), classifier.model.predict_proba(frame))
+
+    print(f"📊 Model: {classifier.get_model_info().get('model_type')}, olasılıklar birebir aynı: {identical}")
+    print(f"   Tek satır  Pipeline.predict: {latency_us(classifier.model.predict, row_frame, args.repeats):,.0f} µs"
+          f"  motor: {latency_us(classifier.engine.predict, row, args.repeats):,.0f} µs")
+    repeats = max(3, args.repeats // 50)
+    print(f"   {args.batch:,} satır Pipeline.predict: {latency_us(classifier.model.predict, frame, repeats) / 1000:,.1f} ms"
+          f"  motor: {latency_us(classifier.engine.predict, X, repeats) / 1000:,.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
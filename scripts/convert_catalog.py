@@ -0,0 +1,41 @@
+"""
+Katalog Dönüştürücü - music_emotion.csv dosyasını ikili sütunsal formata çevirir
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+from catalog_format import CatalogWriter, MappedCatalog, binary_path_for
+
+
+def convert(csv_path, output_path=None, chunk_size=1_000_000):
+    """CSV'yi parça parça okuyup ikili kataloğa yaz"""
+    output_path = output_path or binary_path_for(csv_path)
+    start = time.perf_counter()
+    with CatalogWriter(output_path) as writer:
+        for chunk in pd.read_csv(csv_path, chunksize=chunk_size):
+            writer.append(chunk)
+    elapsed = time.perf_counter() - start
+
+    catalog = MappedCatalog(output_path)
+    print(f"✅ İkili katalog yazıldı: {output_path}")
+    print(f"   {len(catalog):,} şarkı, {Path(output_path).stat().st_size / 1e6:.1f} MB, {elapsed:.2f} sn")
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CSV kataloğu ikili formata dönüştür')
+    parser.add_argument('csv', nargs='?', default=str(Path(__file__).resolve().parent.parent / 'data' / 'music_emotion.csv'))
+    parser.add_argument('-o', '--output', default=None)
+    parser.add_argument('--chunk-size', type=int, default=1_000_000)
+    args = parser.parse_args()
+    convert(args.csv, args.output, args.chunk_size)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Yük Testi - /api/recommendations için eşzamanlı istemcilerle verim ve gecikme ölçümü
+
+    python load_test.py --url http://localhost:5000 --concurrency 1 16 256
+    python load_test.py --features      # ses özellikleriyle (duygu tespiti + öneri)
+"""
+
+import json
+import time
+import argparse
+import threading
+import http.client
+from urllib.parse import urlparse
+
+import numpy as np
+
+EMOTIONS = ['happy', 'sad', 'angry', 'calm', 'energetic', 'romantic', 'neutral']
+FEATURES = ['danceability', 'energy', 'valence', 'tempo', 'acousticness', 'instrumentalness', 'liveness', 'speechiness']
+
+
+def feature_bodies(n=256, seed=0):
+    """Duygu tespiti yolunu çalıştıran rastgele özellikli istek gövdeleri"""
+    rng = np.random.default_rng(seed)
+    rows = rng.random((n, len(FEATURES)))
+    rows[:, 3] = rng.uniform(40, 200, n)  # tempo
+    return [json.dumps({'features': dict(zip(FEATURES, row.tolist()))}) for row in rows]
+
+
+def client_loop(host, port, path, deadline, latencies, errors, client_id, bodies):
+    """Kalıcı bağlantı üzerinden süre dolana kadar istek gönder"""
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    i = client_id
+    while time.perf_counter() < deadline:
+        body = bodies[i % len(bodies)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            conn.request('POST', path, body=body, headers={'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+    conn.close()
+
+
+def run_level(url, concurrency, duration, bodies):
+    """Verilen eşzamanlılıkta testi çalıştır ve özet döndür"""
+    parsed = urlparse(url)
+    path = '/api/recommendations'
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=client_loop, args=(parsed.hostname, parsed.port or 80, path,
+                                                   deadline, latencies, errors, i, bodies))
+        for i in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    lat = np.array(latencies) if latencies else np.array([np.nan])
+    return {
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': len(errors),
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(float(np.percentile(lat, 50)), 2),
+        'p95_ms': round(float(np.percentile(lat, 95)), 2),
+        'p99_ms': round(float(np.percentile(lat, 99)), 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Öneri API yük testi')
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 16, 256])
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--json', action='store_true', help='Sonuçları JSON olarak yazdır')
+    parser.add_argument('--features', action='store_true', help='Duygu yerine ses özellikleri gönder')
+    args = parser.parse_args()
+
+    if args.features:
+        bodies = feature_bodies()
+    else:
+        bodies = [json.dumps({'emotion': emotion}) for emotion in EMOTIONS]
+    results = [run_level(args.url, c, args.duration, bodies) for c in args.concurrency]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"📊 Yük testi: {args.url} ({args.duration:.0f} sn / seviye)")
+    print(f"   {'istemci':>8} {'istek/sn':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'hata':>6}")
+    for r in results:
+        print(f"   {r['concurrency']:>8} {r['throughput_rps']:>10,.1f} {r['p50_ms']:>8.2f} "
+              f"{r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['errors']:>6}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+"""
+Toplu Yeniden Etiketleme - Kataloğu eğitilmiş modelle çok çekirdekli ve kaldığı yerden devam edebilen bir işle sınıflandır
+
+    python relabel_catalog.py --workers 4
+    python relabel_catalog.py --input ../data/music_emotion.bin --output /tmp/relabeled.csv
+
+Katalog parçalara (CSV: satır sınırına hizalı bayt aralıkları, ikili: satır aralıkları)
+bölünür; her işçi parçayı kendisi okur (CSV bayt aralığı / bellek eşlemeli ikili katalog),
+modeli partiler halinde çalıştırır ve sonucu özgün sütunlar + predicted_emotion,
+confidence, p_<duygu> sütunlarıyla bir parça dosyasına yazar. Biten parçalar
+<output>.parts/ altında kalır; yarıda kesilen iş aynı komutla devam eder. Tüm parçalar
+bitince çıktı dosyası tek seferde (atomik) oluşturulur.
+
+Sınırlama: CSV parçaları satır sonlarından bölündüğü için tırnak içinde satır sonu içeren
+alanlar desteklenmez (katalog üreticileri böyle alan yazmaz); böyle bir satır parçayı
+hizalama/ayrıştırma hatasıyla durdurur, sessizce yanlış etiketlenmez.
+"""
+
+import os
+
+# İşçi başına tek çekirdek (OpenMP/BLAS iş parçacıkları süreç havuzuyla yarışmasın)
+os.environ.setdefault('OMP_NUM_THREADS', '1')
+
+import io
+import csv
+import sys
+import json
+import time
+import shutil
+import argparse
+import contextlib
+from multiprocessing import Pool
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'backend'))
+
+from catalog_format import MappedCatalog, resolve_catalog_path
+from catalog_store import FEATURE_COLUMNS
+from ml_emotion_classifier import EmotionClassifier, BASE_FEATURES
+
+DEFAULT_INPUT = ROOT / 'data' / 'music_emotion.csv'
+DEFAULT_MODEL = ROOT / 'backend' / 'models' / 'emotion_classifier.pkl'
+
+# Parça boyutu: CSV için bayt, ikili katalog için satır
+DEFAULT_SHARD_BYTES = 32 << 20
+DEFAULT_SHARD_ROWS = 250_000
+
+# Tek predict_proba çağrısındaki satır sayısı
+PREDICT_BATCH_ROWS = 65_536
+
+_classifier = None
+
+
+def plan_csv_shards(path, shard_bytes):
+    """CSV'yi başlık sonrası, satır sonlarına hizalı (başlangıç, bitiş) bayt aralıklarına böl"""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        f.readline()
+        start = f.tell()
+        shards = []
+        while start < size:
+            f.seek(min(start + shard_bytes, size))
+            if f.tell() < size:
+                f.readline()
+            end = f.tell()
+            shards.append([start, end])
+            start = end
+    return shards
+
+
+def plan_binary_shards(n_rows, shard_rows):
+    return [[start, min(start + shard_rows, n_rows)] for start in range(0, n_rows, shard_rows)]
+
+
+def _init_worker(model_path):
+    """Her işçi modeli bir kez yükler"""
+    global _classifier
+    _classifier = EmotionClassifier()
+    _classifier.model_path = str(model_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        if not _classifier.load_model(allow_stale=True):
+            raise RuntimeError(f"Model yüklenemedi: {model_path}")
+
+
+def _label_suffixes(matrix):
+    """Her satır için ',duygu,güven,p_1,...,p_k' metnini üret (partiler halinde)"""
+    suffixes = []
+    for start in range(0, len(matrix), PREDICT_BATCH_ROWS):
+        emotions, proba, _ = _classifier.predict_emotions(matrix[start:start + PREDICT_BATCH_ROWS], return_proba=True)
+        confidence = proba.max(axis=1)
+        for emotion, conf, row in zip(emotions, confidence.tolist(), proba.tolist()):
+            suffixes.append(f",{emotion},{conf:.4f}," + ','.join(f'{p:.4f}' for p in row))
+    return suffixes
+
+
+def _read_csv_shard(path, start, end, columns):
+    """Bayt aralığını oku: (ham satırlar, (n, 8) özellik matrisi)"""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    # Yalnız b'\n'de böl (str.splitlines \x0b, \x85, \u2028 vb.'de de böler) ve boş satırları
+    # iki adımdan önce at: ham satırlar ile tahmin satırları aynı listeden gelir, hizalı kalır
+    raw = [line.rstrip(b'\r') for line in data.split(b'\n')]
+    raw = [line for line in raw if line.strip()]
+    frame = pd.read_csv(io.BytesIO(b'\n'.join(raw)), header=None, names=columns, lineterminator='\n',
+                        usecols=BASE_FEATURES, dtype={col: np.float64 for col in BASE_FEATURES})
+    matrix = frame[BASE_FEATURES].to_numpy()
+    if len(raw) != len(matrix):
+        # ör. tırnak içinde satır sonu içeren alan (desteklenmez, bkz. modül açıklaması)
+        raise RuntimeError(f"{path} [{start}, {end}): {len(raw)} satır, {len(matrix)} tahmin satırı")
+    return [line.decode('utf-8') for line in raw], matrix
+
+
+def _read_binary_shard(path, start, end):
+    """İkili katalogdan satır aralığını CSV satırlarına ve özellik matrisine çevir"""
+    mapped = MappedCatalog(path)
+    frame = pd.DataFrame({
+        name: mapped.dictionaries[name].to_array()[mapped.codes[name][start:end]]
+        for name in ('title', 'artist', 'emotion')
+    })
+    for col in FEATURE_COLUMNS:
+        frame[col] = np.asarray(mapped.features[col][start:end])
+    lines = frame.to_csv(index=False, header=False).splitlines()
+    return lines, frame[BASE_FEATURES].to_numpy()
+
+
+def _run_shard(task):
+    """İşçide çalışır: parçayı sınıflandır, parça dosyasını atomik yaz; (indeks, satır, süre) döndür"""
+    index, kind, path, start, end, columns, part_path = task
+    started = time.perf_counter()
+    if kind == 'csv':
+        lines, matrix = _read_csv_shard(path, start, end, columns)
+    else:
+        lines, matrix = _read_binary_shard(path, start, end)
+    suffixes = _label_suffixes(matrix)
+    tmp_path = part_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(line + suffix for line, suffix in zip(lines, suffixes)))
+        if lines:
+            f.write('\n')
+    os.replace(tmp_path, part_path)
+    return index, len(lines), time.perf_counter() - started
+
+
+def load_manifest(parts_dir, manifest, restart):
+    """Önceki çalışmanın kontrol noktasını doğrula; farklı girdi/modelse restart gerekir"""
+    path = parts_dir / 'manifest.json'
+    if restart and parts_dir.exists():
+        shutil.rmtree(parts_dir)
+    if path.exists():
+        previous = json.loads(path.read_text())
+        if previous != manifest:
+            raise SystemExit(f"❌ {parts_dir} farklı bir girdi/model/parça planına ait; --restart ile silin")
+        return
+    parts_dir.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(manifest, indent=2))
+
+
+def merge_parts(parts_dir, n_shards, header, output):
+    """Parça dosyalarını sırayla birleştirip çıktıyı atomik oluştur"""
+    tmp_path = str(output) + '.tmp'
+    with open(tmp_path, 'wb') as out:
+        out.write((header + '\n').encode('utf-8'))
+        for index in range(n_shards):
+            with open(parts_dir / f'part-{index:05d}.csv', 'rb') as part:
+                shutil.copyfileobj(part, out, 1 << 20)
+    os.replace(tmp_path, output)
+    shutil.rmtree(parts_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Kataloğu eğitilmiş modelle toplu yeniden etiketle')
+    parser.add_argument('--input', default=str(DEFAULT_INPUT), help='CSV (varsa aynı adlı .bin tercih edilir)')
+    parser.add_argument('--model', default=str(DEFAULT_MODEL))
+    parser.add_argument('--output', default=None, help='Varsayılan: <girdi>.relabeled.csv')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--shard-bytes', type=int, default=DEFAULT_SHARD_BYTES)
+    parser.add_argument('--shard-rows', type=int, default=DEFAULT_SHARD_ROWS)
+    parser.add_argument('--restart', action='store_true', help='Kontrol noktalarını silip baştan başla')
+    args = parser.parse_args()
+
+    path = resolve_catalog_path(args.input) if args.input.endswith('.csv') else args.input
+    kind = 'csv' if path.endswith('.csv') else 'binary'
+    output = Path(args.output or str(Path(args.input).with_suffix('')) + '.relabeled.csv')
+    parts_dir = Path(str(output) + '.parts')
+
+    # Sınıf sırası ve model sürümü ana süreçte bir kez okunur
+    _init_worker(args.model)
+    classes = _classifier.predict_emotions(np.zeros((1, len(BASE_FEATURES))), return_proba=True)[2]
+
+    if kind == 'csv':
+        with open(path, encoding='utf-8', newline='') as f:
+            # Başlık aynen korunur; sütun adları tırnaklı başlıklar için csv.reader ile ayrıştırılır
+            source_header = f.readline().rstrip('\r\n')
+        columns = next(csv.reader([source_header]))
+        shards = plan_csv_shards(path, args.shard_bytes)
+    else:
+        columns = ['title', 'artist', 'emotion'] + FEATURE_COLUMNS
+        source_header = ','.join(columns)
+        shards = plan_binary_shards(len(MappedCatalog(path)), args.shard_rows)
+    header = ','.join([source_header, 'predicted_emotion', 'confidence'] + [f'p_{c}' for c in classes])
+
+    stat = os.stat(path)
+    load_manifest(parts_dir, {
+        'input': os.path.abspath(path), 'size': stat.st_size, 'mtime': stat.st_mtime,
+        'model_version': _classifier.model_version, 'classes': classes, 'shards': shards
+    }, args.restart)
+
+    pending = [
+        (i, kind, path, start, end, columns, str(parts_dir / f'part-{i:05d}.csv'))
+        for i, (start, end) in enumerate(shards)
+        if not (parts_dir / f'part-{i:05d}.csv').exists()
+    ]
+    done = len(shards) - len(pending)
+    workers = max(1, min(args.workers, len(pending) or 1))
+    print(f"⏱️ {path}: {len(shards)} parça ({done} kontrol noktasından), {workers} işçi, model {_classifier.model_version}")
+
+    rows = busy = 0.0
+    start = time.perf_counter()
+    with Pool(workers, initializer=_init_worker, initargs=(args.model,)) as pool:
+        for index, n_rows, seconds in pool.imap_unordered(_run_shard, pending):
+            rows += n_rows
+            busy += seconds
+            done += 1
+            elapsed = time.perf_counter() - start
+            print(f"   parça {index:>5} bitti ({done}/{len(shards)}): {n_rows:,} satır, "
+                  f"{rows / max(elapsed, 1e-9):,.0f} satır/sn")
+    elapsed = time.perf_counter() - start
+
+    merge_parts(parts_dir, len(shards), header, output)
+    print(f"✅ Yeniden etiketlendi: {int(rows):,} satır -> {output}")
+    if rows:
+        cores = min(workers, os.cpu_count() or 1)
+        print(f"📊 {rows / elapsed:,.0f} satır/sn toplam, {rows / elapsed / cores:,.0f} satır/sn/çekirdek "
+              f"(işçi meşguliyeti: {rows / busy:,.0f} satır/sn)")
+
+
+if __name__ == '__main__':
+    main()